@@ -0,0 +1,123 @@
+"""
+Shapes, inputs and helpers shared by the benchmark modules.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from smallshapes import AABB, Circle, Circuit, ConvexPoly, Path, Poly, \
+    Rectangle, RegularPoly, RegularPolyAny, Segment, Triangle, mAABB, \
+    mCircle, mCircuit, mConvexPoly, mPath, mPoly, mRectangle, mRegularPoly, \
+    mSegment, mTriangle
+
+#: Number of vertices of variable sized shapes and point clouds.
+SIZES = [10, 100, 1000, 10000, 100000]
+
+#: Number of rounds for benchmarks that must recreate their inputs before
+#: each call.
+ROUNDS = 20
+
+#: Shapes with a fixed number of vertices and their constructor arguments.
+FIXED_SHAPES = [
+    (Circle, (1, (0, 0))),
+    (mCircle, (1, (0, 0))),
+    (AABB, (-1, 1, -1, 1)),
+    (mAABB, (-1, 1, -1, 1)),
+    (Segment, ((-1, -1), (1, 1))),
+    (mSegment, ((-1, -1), (1, 1))),
+    (Rectangle, (-1, 1, -1, 1)),
+    (mRectangle, (-1, 1, -1, 1)),
+    (Triangle, ((-1, -1), (1, -1), (0, 1))),
+    (mTriangle, ((-1, -1), (1, -1), (0, 1))),
+]
+
+#: Shapes defined by an arbitrary list of vertices. Convex classes receive
+#: the vertices of a regular polygon and the others receive a star shaped
+#: (concave) polygon.
+VERTEX_SHAPES = [
+    Path, mPath, Circuit, mCircuit, Poly, mPoly, ConvexPoly, mConvexPoly,
+    RegularPoly, mRegularPoly,
+]
+
+
+@lru_cache()
+def circle_coords(n, radius=1.0):
+    """
+    Return an (n, 2) array with the vertices of a regular polygon.
+    """
+
+    theta = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return radius * np.column_stack([np.cos(theta), np.sin(theta)])
+
+
+@lru_cache()
+def star_coords(n):
+    """
+    Return an (n, 2) array with the vertices of a simple concave polygon.
+    """
+
+    coords = circle_coords(n).copy()
+    coords[1::2] *= 0.5
+    return coords
+
+
+@lru_cache()
+def random_points(n, seed=0):
+    """
+    Return an (n, 2) array of random points in the [-1, 1] square.
+    """
+
+    return np.random.RandomState(seed).uniform(-1, 1, (n, 2))
+
+
+def vertex_coords(cls, n):
+    convex = issubclass(cls, (ConvexPoly, mConvexPoly, RegularPolyAny))
+    return circle_coords(n) if convex else star_coords(n)
+
+
+def has_cache(shape):
+    """
+    Return True if shape stores computed properties in the _cache slot.
+    """
+
+    return any('_cache' in getattr(cls, '__slots__', ())
+               for cls in type(shape).__mro__)
+
+
+def shape_factories(classes=None):
+    """
+    Return a list of pytest.param(factory) for the given shape classes.
+
+    Each factory returns a new shape, so cached properties are computed
+    again. Classes with variable size appear once for each value in SIZES.
+    """
+
+    params = []
+    for cls, args in FIXED_SHAPES:
+        if classes is None or cls in classes:
+            params.append(pytest.param(lambda cls=cls, args=args: cls(*args),
+                                       id=cls.__name__))
+    for cls in VERTEX_SHAPES:
+        if classes is None or cls in classes:
+            for n in SIZES:
+                params.append(pytest.param(
+                    lambda cls=cls, n=n: cls.from_array(vertex_coords(cls, n)),
+                    id='%s-%d' % (cls.__name__, n)))
+    return params
+
+
+def run(benchmark, factory, func):
+    """
+    Benchmark func(shape) for the shape returned by factory().
+
+    Shapes that cache their properties are recreated before each round, so
+    the benchmark never measures a cache hit.
+    """
+
+    shape = factory()
+    if has_cache(shape):
+        return benchmark.pedantic(func, setup=lambda: ((factory(),), {}),
+                                  rounds=ROUNDS, warmup_rounds=1)
+    return benchmark(func, shape)
@@ -0,0 +1,50 @@
+"""
+Kernels in smallshapes.path_utils.
+"""
+
+import pytest
+
+from benchmark_utils import SIZES, circle_coords, random_points, star_coords
+
+pytest.importorskip('pytest_benchmark')
+
+from smallshapes import center_of_mass, clip, convex_hull
+
+#: A convex clipping window that cuts through all test polygons.
+CLIP_WINDOW = [(-0.5, -2), (2, -2), (2, 2), (-0.5, 2)]
+
+#: Sutherland-Hodgman runs one pass for each edge of the clipping polygon.
+WINDOW_SIZES = [10, 100, 1000]
+
+
+@pytest.mark.benchmark(group='convex_hull')
+@pytest.mark.parametrize('n', SIZES)
+def test_convex_hull(benchmark, n):
+    points = random_points(n).tolist()
+    benchmark(convex_hull, points)
+
+
+@pytest.mark.benchmark(group='clip')
+@pytest.mark.parametrize('n', SIZES)
+def test_clip(benchmark, n):
+    subject = star_coords(n).tolist()
+    benchmark(clip, subject, CLIP_WINDOW)
+
+
+@pytest.mark.benchmark(group='clip-window')
+@pytest.mark.parametrize('n', WINDOW_SIZES)
+def test_clip_by_large_window(benchmark, n):
+    # The clipping polygon has n edges
+    subject = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    window = circle_coords(n).tolist()
+    benchmark(clip, subject, window)
+
+
+@pytest.mark.benchmark(group='center_of_mass')
+@pytest.mark.parametrize('kind', ['list', 'array'])
+@pytest.mark.parametrize('n', SIZES)
+def test_center_of_mass(benchmark, n, kind):
+    points = star_coords(n)
+    if kind == 'list':
+        points = points.tolist()
+    benchmark(center_of_mass, points)
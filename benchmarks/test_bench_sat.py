@@ -0,0 +1,117 @@
+"""
+Separating axis test for each pair of shape types.
+
+Polygons are limited to 1000 vertices: SAT projects both shapes in the normal
+of each edge and runs in O(n * m). Concave polygons are decomposed into
+convex parts by Compound and pairs of two concave polygons are limited to
+100 vertices.
+
+Segments do not define normals() and shadow() and are not supported by SAT.
+Their pairs are measured with penetration(), which uses EPA.
+"""
+
+import pytest
+
+from benchmark_utils import circle_coords, star_coords
+
+pytest.importorskip('pytest_benchmark')
+
+from smallshapes import AABB, Circle, ConvexPoly, Poly, Rectangle, Segment, \
+    Triangle
+from smallshapes.SAT import sat
+from smallshapes.decomposition import Compound
+from smallshapes.functions import penetration
+
+POLY_SIZES = [10, 100, 1000]
+
+#: Largest size of pairs of concave polygons.
+CONCAVE_PAIR_SIZE = 100
+
+
+def convex(n, dx=0.0):
+    return ConvexPoly.from_array(circle_coords(n) + (dx, 0))
+
+
+def concave(n, dx=0.0):
+    return Compound(Poly.from_array(star_coords(n) + (dx, 0)))
+
+
+def pairs():
+    fixed = [
+        ('circle-circle', Circle(1, (0, 0)), Circle(1, (1.5, 0))),
+        ('aabb-aabb', AABB(-1, 1, -1, 1), AABB(0.5, 2.5, -1, 1)),
+        ('aabb-circle', AABB(-1, 1, -1, 1), Circle(1, (1.5, 0))),
+        ('rectangle-triangle', Rectangle(-1, 1, -1, 1),
+         Triangle((0.5, -1), (2.5, -1), (1.5, 1))),
+    ]
+    params = [pytest.param(A, B, id=name) for name, A, B in fixed]
+    for n in POLY_SIZES:
+        params.extend([
+            pytest.param(convex(n), Circle(1, (1.5, 0)),
+                         id='convex-circle-%d' % n),
+            pytest.param(convex(n), AABB(0.5, 2.5, -1, 1),
+                         id='convex-aabb-%d' % n),
+            pytest.param(convex(n), convex(n, 1.5),
+                         id='convex-convex-%d' % n),
+        ])
+    return params
+
+
+def compound_pairs():
+    # Compound objects cannot be moved, so the separated partner is created
+    # 10 units to the right.
+    params = []
+    for n in POLY_SIZES:
+        A = concave(n)
+        partners = [
+            ('circle', lambda dx: Circle(0.5, (0.9 + dx, 0))),
+            ('aabb', lambda dx: AABB(0.5 + dx, 2.5 + dx, -1, 1)),
+            ('convex', lambda dx: convex(n, 1.5 + dx)),
+        ]
+        if n <= CONCAVE_PAIR_SIZE:
+            partners.append(('concave', lambda dx: concave(n, 1.2 + dx)))
+        for name, partner in partners:
+            for dx, kind in [(0, 'overlap'), (10, 'separated')]:
+                params.append(pytest.param(
+                    A, partner(dx), dx == 0,
+                    id='concave-%s-%d-%s' % (name, n, kind)))
+    return params
+
+
+def segment_pairs():
+    S = Segment((0.5, -1), (0.5, 1))
+    fixed = [
+        ('segment-circle', Circle(1, (1.2, 0))),
+        ('segment-aabb', AABB(0, 2, -0.5, 0.5)),
+        ('segment-segment', Segment((-1, 0), (1, 0.2))),
+    ]
+    params = [pytest.param(S, B, id=name) for name, B in fixed]
+    for n in POLY_SIZES:
+        params.append(pytest.param(S, convex(n, 1.2),
+                                   id='segment-convex-%d' % n))
+    return params
+
+
+@pytest.mark.benchmark(group='sat')
+@pytest.mark.parametrize('A, B', pairs())
+def test_sat_overlap(benchmark, A, B):
+    assert benchmark(sat, A, B) is not None
+
+
+@pytest.mark.benchmark(group='sat-separated')
+@pytest.mark.parametrize('A, B', pairs())
+def test_sat_separated(benchmark, A, B):
+    B = B.move_vec((10, 0))
+    assert benchmark(sat, A, B) is None
+
+
+@pytest.mark.benchmark(group='sat-compound')
+@pytest.mark.parametrize('A, B, overlap', compound_pairs())
+def test_sat_compound(benchmark, A, B, overlap):
+    assert (benchmark(sat, A, B) is not None) == overlap
+
+
+@pytest.mark.benchmark(group='penetration-segment')
+@pytest.mark.parametrize('A, B', segment_pairs())
+def test_segment_penetration(benchmark, A, B):
+    assert benchmark(penetration, A, B) is not None
@@ -0,0 +1,75 @@
+"""
+Construction and basic methods of each shape class.
+"""
+
+import pytest
+
+from benchmark_utils import FIXED_SHAPES, SIZES, VERTEX_SHAPES, run, \
+    shape_factories, vertex_coords
+
+pytest.importorskip('pytest_benchmark')
+
+from smallshapes import AABB, Circle, ConvexPoly, Poly, Rectangle, \
+    RegularPoly, RegularPolyAny, Triangle, mAABB, mCircle, mConvexPoly, \
+    mPoly, mRectangle, mRegularPoly, mTriangle
+
+SOLIDS = [Circle, mCircle, AABB, mAABB, Rectangle, mRectangle, Triangle,
+          mTriangle, Poly, mPoly, ConvexPoly, mConvexPoly, RegularPoly,
+          mRegularPoly]
+
+
+def constructors():
+    params = [pytest.param(cls, args, id=cls.__name__)
+              for cls, args in FIXED_SHAPES]
+    for cls in VERTEX_SHAPES:
+        for n in SIZES:
+            if issubclass(cls, RegularPolyAny):
+                args = (n, 1.0)
+            else:
+                args = tuple(map(tuple, vertex_coords(cls, n).tolist()))
+            params.append(pytest.param(cls, args,
+                                       id='%s-%d' % (cls.__name__, n)))
+    return params
+
+
+@pytest.mark.benchmark(group='construction')
+@pytest.mark.parametrize('cls, args', constructors())
+def test_construction(benchmark, cls, args):
+    benchmark(cls, *args)
+
+
+@pytest.mark.benchmark(group='from_array')
+@pytest.mark.parametrize('cls', VERTEX_SHAPES, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize('n', SIZES)
+def test_from_array(benchmark, cls, n):
+    benchmark(cls.from_array, vertex_coords(cls, n))
+
+
+@pytest.mark.benchmark(group='move_vec')
+@pytest.mark.parametrize('factory', shape_factories())
+def test_move_vec(benchmark, factory):
+    run(benchmark, factory, lambda shape: shape.move_vec((1, 2)))
+
+
+@pytest.mark.benchmark(group='aabb')
+@pytest.mark.parametrize('factory', shape_factories())
+def test_aabb(benchmark, factory):
+    run(benchmark, factory, lambda shape: shape.aabb)
+
+
+@pytest.mark.benchmark(group='pos')
+@pytest.mark.parametrize('factory', shape_factories())
+def test_pos(benchmark, factory):
+    run(benchmark, factory, lambda shape: shape.pos)
+
+
+@pytest.mark.benchmark(group='area')
+@pytest.mark.parametrize('factory', shape_factories(SOLIDS))
+def test_area(benchmark, factory):
+    run(benchmark, factory, lambda shape: shape.area())
+
+
+@pytest.mark.benchmark(group='contains_point')
+@pytest.mark.parametrize('factory', shape_factories(SOLIDS))
+def test_contains_point(benchmark, factory):
+    run(benchmark, factory, lambda shape: shape.contains_point((0.1, 0.2)))
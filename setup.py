@@ -75,12 +75,14 @@ setup(
     packages=find_packages('src'),
     install_requires=[
         'smallvectors>=0.6',
+        'numpy',
     ],
     extras_require={
         'dev': [
             'invoke',
             'manuel',
             'pytest',
+            'pytest-benchmark',
             'python-boilerplate>=0.4.5',
         ],
     },
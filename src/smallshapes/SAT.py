@@ -2,12 +2,17 @@
 Implementa o separating axis theorem (sat) para detecção de colisão entre as
 formas de colisão básicas.
 '''
+import weakref
+from collections import namedtuple
+
+import numpy as np
 from generic import generic
 from smallvectors import Vec
-from smallshapes import Circle, AABB
+from smallshapes import Circle, AABB, CircleAny, AABBAny, ConvexPolyAny
+from smallshapes.aabb import direction_x as e1, direction_y as e2
+from smallshapes.decomposition import Compound
 
-e1 = Vec(1, 0)
-e2 = Vec(0, 1)
+Manifold = namedtuple('Manifold', ['normal', 'depth', 'points'])
 
 
 @generic
@@ -15,7 +20,7 @@ def shadow(A, normal):
     return A.shadow(normal)
 
 
-@shadow.register(AABB, object)
+@shadow.register(AABBAny, object)
 def shadow_aabb(A, normal):
     if normal is e1:
         return A.xmin, A.xmax
@@ -39,29 +44,47 @@ def normals(A, B):
         return GENERIC_DIRECTIONS
 
 
-@normals.register(Circle, Circle)
+@normals.register(CircleAny, CircleAny)
 def normals_circle(A, B):
     return [(B.pos - A.pos).normalize()]
 
 
-@normals.register(AABB, AABB)
+@normals.register(AABBAny, AABBAny)
 def normals_aabb(A, B):
     return [e1, e2]
 
 
-@normals.register(AABB, Circle)
+@normals.register(AABBAny, CircleAny)
 def normals_aabb_circle(A, B):
+    return [_closest_vertex_direction(A.vertices, B.pos), e1, e2]
+
+
+@normals.register(CircleAny, AABBAny)
+def normals_circle_aabb(A, B):
+    return normals_aabb_circle(B, A)
+
+
+@normals.register(ConvexPolyAny, CircleAny)
+def normals_poly_circle(A, B):
+    return A.normals() + [_closest_vertex_direction(A, B.pos)]
+
+
+@normals.register(CircleAny, ConvexPolyAny)
+def normals_circle_poly(A, B):
+    return normals_poly_circle(B, A)
+
+
+def _closest_vertex_direction(vertices, pos):
     # Encontra o vértice mais próximo do centro
     D = float('inf')
     pt = Vec(0, 0)
-    for v in A.vertices:
-        delta = B.pos - v
+    for v in vertices:
+        delta = pos - v
         dnew = delta.norm()
         if dnew < D:
             D = dnew
             pt = delta
-
-    return [pt.normalize(), e1, e2]
+    return pt.normalize()
 
 
 # ...
@@ -105,23 +128,522 @@ def sat(A, B):
     >>> box2 = AABB(0, 5, 0, 5)
     >>> sat(box1, box2)
     Vec(-1.0, 0.0)
+
+    Polígonos côncavos devem ser decompostos em partes convexas com a
+    classe Compound (ver sat_compound())
     '''
 
-    nlist = normals(A, B)
+    if isinstance(A, Compound) or isinstance(B, Compound):
+        return sat_compound(A, B)
+    return _sat(A, B, normals(A, B))[0]
+
+
+def sat_compound(A, B):
+    '''Executa o SAT entre cada par de partes convexas de A e B e retorna o
+    vetor de mínima penetração de maior módulo (ou None, caso nenhum par
+    esteja em superposição).
+
+    Os argumentos podem ser objetos Compound ou formas convexas simples.
+    Apenas os pares de partes cujas AABBs se tocam são testados.
+
+    Exemplos
+    --------
+
+    >>> from smallshapes import Poly
+    >>> L = Compound(Poly((0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)))
+    >>> sat_compound(L, Circle(1, (2.5, 2.5))) is None
+    True
+    >>> sat_compound(L, Circle(1, (2.5, 1.5)))
+    Vec(0.0, 0.5)
+    '''
+
+    parts_A = A.parts if isinstance(A, Compound) else (A,)
+    best, depth = None, -1.0
+    for a in parts_A:
+        box = a.rect_coords
+        if isinstance(B, Compound):
+            parts_B = B.candidates(box)
+        else:
+            xmin, xmax, ymin, ymax = box
+            bxmin, bxmax, bymin, bymax = B.rect_coords
+            overlap = (xmin <= bxmax and bxmin <= xmax and
+                       ymin <= bymax and bymin <= ymax)
+            parts_B = (B,) if overlap else ()
+        for b in parts_B:
+            vec = _sat(a, b, normals(a, b))[0]
+            if vec is not None and vec.norm() > depth:
+                best, depth = vec, vec.norm()
+    return best
+
+
+def _sat(A, B, nlist):
+    '''Executa o SAT nas direções dadas e retorna um par com o vetor de
+    mínima penetração e o eixo separador.
+
+    Um dos dois elementos é sempre None: o eixo separador só é retornado se
+    não houver superposição.'''
 
     D = float('inf')
     for n in nlist:
         a1, a2 = shadow(A, n)
         b1, b2 = shadow(B, n)
-        S = min(a2, b2) - max(a1, b1)
+        S = min(a2 - b1, b2 - a1)
         if S < 0:
-            return None
+            return None, n
         elif S < D:
             D = S
             if (a1 + a2) > (b1 + b2):
                 n *= -1
             d = n.normalize()
-    return d * D
+    return d * D, None
+
+
+def sat_manifold(A, B):
+    '''Retorna a variedade de contato (normal, profundidade e pontos de
+    contato) entre A e B ou None, caso não haja superposição.
+
+    A normal é unitária e aponta de A para B, como no vetor retornado por
+    sat(). A profundidade corresponde à menor superposição entre as sombras
+    e os pontos de contato (no máximo dois) são calculados na mesma passada,
+    sem a necessidade de uma segunda etapa de teste.
+
+    Exemplos
+    --------
+
+    >>> c1 = Circle(3, (0, 0))
+    >>> c2 = Circle(3, (3, 4))
+    >>> m = sat_manifold(c1, c2)
+    >>> m.normal, m.depth
+    (Vec(0.6000000000000001, 0.8), 1.0)
+
+    Objetos poligonais podem ter dois pontos de contato
+
+    >>> box1 = AABB(4, 9, 1, 6)
+    >>> box2 = AABB(0, 5, 0, 5)
+    >>> sat_manifold(box1, box2).points
+    [Vec(5.0, 5.0), Vec(5.0, 1.0)]
+    '''
+
+    nlist = normals(A, B)
+    if not nlist:
+        t1, t2 = type(A).__name__, type(B).__name__
+        raise TypeError('no separating directions for %s vs %s' % (t1, t2))
+
+    depth = float('inf')
+    for n in nlist:
+        a1, a2 = shadow(A, n)
+        b1, b2 = shadow(B, n)
+        S = min(a2 - b1, b2 - a1)
+        if S < 0:
+            return None
+        elif S < depth:
+            depth = S
+            if (a1 + a2) > (b1 + b2):
+                n *= -1
+            best = n
+
+    normal = best.normalize()
+    return Manifold(normal, depth, contact_points(A, B, normal, depth))
+
+
+def sat_many(pairs):
+    '''Executa o SAT em uma sequência de pares (A, B) e retorna um array
+    mascarado (N, 2) com os vetores de mínima penetração.
+
+    As posições correspondentes aos pares sem superposição estão mascaradas.
+    Os pares são agrupados por combinação de tipos (círculo-círculo,
+    AABB-AABB, AABB-círculo e polígono-polígono) e as sombras de cada grupo
+    são calculadas de forma vetorizada. Os demais pares usam sat().
+
+    Exemplos
+    --------
+
+    >>> c1, c2 = Circle(3, (0, 0)), Circle(3, (3, 4))
+    >>> box1, box2 = AABB(4, 9, 1, 6), AABB(0, 5, 0, 5)
+    >>> result = sat_many([(c1, c2), (box1, box2), (c1, box1)])
+    >>> result.mask[:, 0]
+    array([False, False,  True])
+    >>> float(result.data[1, 0])
+    -1.0
+    '''
+
+    pairs = list(pairs)
+    size = len(pairs)
+    data = np.zeros((size, 2))
+    mask = np.zeros(size, dtype=bool)
+    groups = {}
+    for i, (A, B) in enumerate(pairs):
+        key = (_sat_many_kind(A), _sat_many_kind(B))
+        groups.setdefault(key, []).append(i)
+
+    for (kind_a, kind_b), idx in groups.items():
+        As = [pairs[i][0] for i in idx]
+        Bs = [pairs[i][1] for i in idx]
+        if kind_a == kind_b == 'circle':
+            axes, shadows = _many_circle_circle(As, Bs)
+        elif kind_a == kind_b == 'aabb':
+            axes, shadows = _many_aabb_aabb(As, Bs)
+        elif (kind_a, kind_b) == ('aabb', 'circle'):
+            axes, shadows = _many_aabb_circle(As, Bs)
+        elif (kind_a, kind_b) == ('circle', 'aabb'):
+            axes, shadows = _many_aabb_circle(Bs, As)
+            shadows = [(b1, b2, a1, a2) for (a1, a2, b1, b2) in shadows]
+        elif kind_a == kind_b == 'poly':
+            axes, shadows = _many_poly_poly(As, Bs)
+        else:
+            for i, A, B in zip(idx, As, Bs):
+                result = sat(A, B)
+                if result is None:
+                    mask[i] = True
+                else:
+                    data[i] = tuple(result)
+            continue
+
+        vecs, separated = _sat_many_kernel(axes, shadows)
+        data[idx] = vecs
+        mask[idx] = separated
+
+    return np.ma.array(data, mask=np.column_stack([mask, mask]))
+
+
+def _sat_many_kind(A):
+    if isinstance(A, CircleAny):
+        return 'circle'
+    elif isinstance(A, AABBAny):
+        return 'aabb'
+    elif isinstance(A, ConvexPolyAny):
+        return 'poly'
+    return None
+
+
+def _sat_many_kernel(axes, shadows):
+    '''Versão vetorizada do laço de _sat().
+
+    Recebe uma lista de direções (arrays (N, 2)) e as respectivas sombras
+    (a1, a2, b1, b2). Direções com valores NaN são ignoradas.'''
+
+    size = len(axes[0])
+    D = np.full(size, np.inf)
+    direction = np.zeros((size, 2))
+    separated = np.zeros(size, dtype=bool)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for n, (a1, a2, b1, b2) in zip(axes, shadows):
+            S = np.minimum(a2 - b1, b2 - a1)
+            separated |= S < 0
+            better = S < D
+            D = np.where(better, S, D)
+            sign = np.where((a1 + a2) > (b1 + b2), -1.0, 1.0)
+            d = n * (sign / np.hypot(n[:, 0], n[:, 1]))[:, None]
+            direction = np.where(better[:, None], d, direction)
+    return direction * D[:, None], separated
+
+
+def _circle_columns(Cs):
+    return np.array([(C._x, C._y, C._radius) for C in Cs], dtype=float).T
+
+
+def _aabb_columns(As):
+    return np.array([(A.xmin, A.xmax, A.ymin, A.ymax) for A in As],
+                    dtype=float).T
+
+
+def _project_circle(x, y, r, n):
+    p0 = x * n[:, 0] + y * n[:, 1]
+    return p0 - r, p0 + r
+
+
+def _project_aabb(xmin, xmax, ymin, ymax, n):
+    nx, ny = n[:, 0], n[:, 1]
+    center = (xmin + xmax) * nx + (ymin + ymax) * ny
+    radius = np.abs(nx) * (xmax - xmin) + np.abs(ny) * (ymax - ymin)
+    return (center - radius) / 2, (center + radius) / 2
+
+
+def _many_circle_circle(As, Bs):
+    ax, ay, ar = _circle_columns(As)
+    bx, by, br = _circle_columns(Bs)
+    n = np.column_stack([bx - ax, by - ay])
+    n /= np.hypot(n[:, 0], n[:, 1])[:, None]
+    a1, a2 = _project_circle(ax, ay, ar, n)
+    b1, b2 = _project_circle(bx, by, br, n)
+    return [n], [(a1, a2, b1, b2)]
+
+
+def _many_aabb_aabb(As, Bs):
+    axmin, axmax, aymin, aymax = _aabb_columns(As)
+    bxmin, bxmax, bymin, bymax = _aabb_columns(Bs)
+    size = len(As)
+    ex = np.tile([1.0, 0.0], (size, 1))
+    ey = np.tile([0.0, 1.0], (size, 1))
+    return [ex, ey], [(axmin, axmax, bxmin, bxmax),
+                      (aymin, aymax, bymin, bymax)]
+
+
+def _many_aabb_circle(As, Bs):
+    xmin, xmax, ymin, ymax = box = _aabb_columns(As)
+    cx, cy, r = _circle_columns(Bs)
+
+    # Direção a partir do vértice mais próximo do centro do círculo. Os
+    # vértices seguem a mesma ordem de AABB.vertices.
+    vx = np.column_stack([xmin, xmax, xmax, xmin])
+    vy = np.column_stack([ymin, ymin, ymax, ymax])
+    dx, dy = cx[:, None] - vx, cy[:, None] - vy
+    k = np.argmin(np.hypot(dx, dy), axis=1)
+    rows = np.arange(len(k))
+    n = np.column_stack([dx[rows, k], dy[rows, k]])
+    n /= np.hypot(n[:, 0], n[:, 1])[:, None]
+
+    size = len(As)
+    ex = np.tile([1.0, 0.0], (size, 1))
+    ey = np.tile([0.0, 1.0], (size, 1))
+    axes = [n, ex, ey]
+    shadows = []
+    for axis in axes:
+        a1, a2 = _project_aabb(*box, axis)
+        b1, b2 = _project_circle(cx, cy, r, axis)
+        shadows.append((a1, a2, b1, b2))
+    shadows[1] = (xmin, xmax) + shadows[1][2:]
+    shadows[2] = (ymin, ymax) + shadows[2][2:]
+    return axes, shadows
+
+
+def _padded_vertices(polys):
+    '''Retorna um array (N, V, 2) com os vértices de cada polígono. Polígonos
+    com menos vértices repetem o último vértice até completar V.'''
+
+    size = max(len(P) for P in polys)
+    out = np.empty((len(polys), size, 2))
+    for i, P in enumerate(polys):
+        pts = np.array(P._data, dtype=float).reshape(-1, 2)
+        out[i, :len(pts)] = pts
+        out[i, len(pts):] = pts[-1]
+    return out
+
+
+def _poly_normals(V):
+    '''Normais externas unitárias de cada aresta. Arestas de tamanho nulo
+    (inclusive as criadas por _padded_vertices) resultam em NaN.'''
+
+    x, y = V[..., 0], V[..., 1]
+    xn, yn = np.roll(x, -1, axis=1), np.roll(y, -1, axis=1)
+    area = (x * yn - xn * y).sum(axis=1)
+    sign = np.where(area >= 0, 1.0, -1.0)[:, None]
+    ex, ey = xn - x, yn - y
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norm = sign * np.hypot(ex, ey)
+        norm[norm == 0] = np.nan
+        return np.stack([ey / norm, -ex / norm], axis=-1)
+
+
+def _many_poly_poly(As, Bs):
+    VA, VB = _padded_vertices(As), _padded_vertices(Bs)
+    normals = np.concatenate([_poly_normals(VA), _poly_normals(VB)], axis=1)
+    proj_a = np.einsum('nkd,nvd->nkv', normals, VA)
+    proj_b = np.einsum('nkd,nvd->nkv', normals, VB)
+    a1, a2 = proj_a.min(axis=2), proj_a.max(axis=2)
+    b1, b2 = proj_b.min(axis=2), proj_b.max(axis=2)
+    axes = [normals[:, k] for k in range(normals.shape[1])]
+    shadows = [(a1[:, k], a2[:, k], b1[:, k], b2[:, k])
+               for k in range(normals.shape[1])]
+    return axes, shadows
+
+
+class SATCache:
+    '''Cache de coerência temporal para o SAT.
+
+    Guarda, para cada par de objetos, o último eixo que os separou. Em
+    simulações, este eixo quase sempre continua separando o par no quadro
+    seguinte e o teste completo sobre todas as direções de normals(A, B) pode
+    ser evitado.
+
+    Os pares são identificados pela identidade dos objetos e o cache mantém
+    apenas referências fracas: as entradas são removidas automaticamente
+    quando um dos objetos é destruído.
+
+    Exemplos
+    --------
+
+    >>> cache = SATCache()
+    >>> c1, c2 = Circle(1, (0, 0)), Circle(1, (3, 0))
+    >>> cache.sat(c1, c2) is None
+    True
+    >>> cache.sat(c1, c2) is None
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    '''
+
+    def __init__(self):
+        self._axes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._axes)
+
+    @property
+    def hit_rate(self):
+        '''Fração dos testes resolvidos apenas com o eixo guardado.'''
+
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        '''Remove todos os eixos guardados e zera os contadores.'''
+
+        self._axes.clear()
+        self.hits = self.misses = 0
+
+    def sat(self, A, B):
+        '''Equivalente a sat(A, B), mas testa primeiro o último eixo que
+        separou o par.'''
+
+        key = (id(A), id(B)) if id(A) < id(B) else (id(B), id(A))
+        entry = self._axes.get(key)
+        if entry is not None:
+            n = entry[0]
+            a1, a2 = shadow(A, n)
+            b1, b2 = shadow(B, n)
+            if a2 < b1 or b2 < a1:
+                self.hits += 1
+                return None
+
+        self.misses += 1
+        result, axis = _sat(A, B, normals(A, B))
+        if axis is not None:
+            if entry is None:
+                discard = self._discard_callback(key)
+                entry = [axis, weakref.ref(A, discard), weakref.ref(B, discard)]
+                self._axes[key] = entry
+            else:
+                entry[0] = axis
+        elif entry is not None:
+            del self._axes[key]
+        return result
+
+    def _discard_callback(self, key):
+        cache = weakref.ref(self)
+
+        def discard(ref):
+            obj = cache()
+            if obj is not None:
+                obj._axes.pop(key, None)
+
+        return discard
+
+
+###############################################################################
+#                       Pontos de contato
+###############################################################################
+@generic
+def contact_points(A, B, normal, depth):
+    '''Retorna a lista de pontos de contato entre duas figuras poligonais
+    convexas em superposição na direção normal dada.
+
+    Utiliza o método da face de referência: escolhe a aresta de um dos
+    polígonos mais alinhada com a normal e recorta a aresta incidente do
+    outro polígono nos limites da aresta de referência.'''
+
+    nx, ny = normal
+    PA = _ccw_vertices(A)
+    PB = _ccw_vertices(B)
+    ia, align_a = _best_face(PA, nx, ny)
+    ib, align_b = _best_face(PB, -nx, -ny)
+    if align_b > align_a + 1e-9:
+        ref, ref_idx, inc = PB, ib, PA
+    else:
+        ref, ref_idx, inc = PA, ia, PB
+
+    # Aresta de referência e sua normal externa
+    (x1, y1), (x2, y2) = ref[ref_idx], ref[(ref_idx + 1) % len(ref)]
+    mx, my = _edge_normal(x1, y1, x2, y2)
+    tx, ty = -my, mx
+
+    # Aresta incidente: a mais anti-paralela à normal de referência
+    j, _ = _best_face(inc, -mx, -my)
+    q1, q2 = inc[j], inc[(j + 1) % len(inc)]
+
+    # Recorta nos planos laterais da aresta de referência
+    points = _clip_segment([q1, q2], -tx, -ty, -(tx * x1 + ty * y1))
+    points = _clip_segment(points, tx, ty, tx * x2 + ty * y2)
+
+    ref_offset = mx * x1 + my * y1
+    out = [Vec(x, y) for (x, y) in points if mx * x + my * y <= ref_offset]
+    if not out:
+        x, y = min(inc, key=lambda p: mx * p[0] + my * p[1])
+        out = [Vec(x, y)]
+    return out
+
+
+@contact_points.register(CircleAny, CircleAny, object, object)
+def contact_points_circle(A, B, normal, depth):
+    return [A.pos + normal * (A.radius - depth / 2)]
+
+
+@contact_points.register(CircleAny, object, object, object)
+def contact_points_circle_other(A, B, normal, depth):
+    return [A.pos + normal * A.radius]
+
+
+@contact_points.register(object, CircleAny, object, object)
+def contact_points_other_circle(A, B, normal, depth):
+    return [B.pos - normal * B.radius]
+
+
+def _ccw_vertices(A):
+    '''Lista de vértices (x, y) em ordem anti-horária.'''
+
+    pts = [tuple(v) for v in A.vertices]
+    area = 0
+    for (x0, y0), (x1, y1) in zip(pts, pts[1:] + pts[:1]):
+        area += x0 * y1 - x1 * y0
+    if area < 0:
+        pts.reverse()
+    return pts
+
+
+def _edge_normal(x1, y1, x2, y2):
+    '''Normal externa unitária da aresta de um polígono anti-horário.'''
+
+    dx, dy = x2 - x1, y2 - y1
+    norm = (dx * dx + dy * dy) ** 0.5
+    return dy / norm, -dx / norm
+
+
+def _best_face(pts, nx, ny):
+    '''Retorna o índice da aresta cuja normal é mais alinhada com (nx, ny)
+    e o respectivo produto escalar.'''
+
+    best, best_idx = -float('inf'), 0
+    size = len(pts)
+    for i in range(size):
+        (x1, y1), (x2, y2) = pts[i], pts[(i + 1) % size]
+        if x1 == x2 and y1 == y2:
+            continue
+        mx, my = _edge_normal(x1, y1, x2, y2)
+        align = mx * nx + my * ny
+        if align > best:
+            best, best_idx = align, i
+    return best_idx, best
+
+
+def _clip_segment(points, nx, ny, offset):
+    '''Mantém a parte do segmento que satisfaz dot(n, p) <= offset.'''
+
+    if len(points) < 2:
+        return [p for p in points if nx * p[0] + ny * p[1] <= offset]
+    (x1, y1), (x2, y2) = points
+    d1 = nx * x1 + ny * y1 - offset
+    d2 = nx * x2 + ny * y2 - offset
+    out = []
+    if d1 <= 0:
+        out.append((x1, y1))
+    if d2 <= 0:
+        out.append((x2, y2))
+    if d1 * d2 < 0:
+        t = d1 / (d1 - d2)
+        out.append((x1 + t * (x2 - x1), y1 + t * (y2 - y1)))
+    return out
 
 
 if __name__ == '__main__':
@@ -2,7 +2,9 @@ from .__meta__ import __author__, __version__
 from .core import *
 from .aabb import AABBAny, AABB, mAABB
 from .aabb import aabb_coords, aabb_center, aabb_pshape, aabb_rect, aabb_shape
+from .aabb_array import AABBArray
 from .circle import CircleAny, Circle, mCircle
+from .circle_array import CircleArray
 from .segment import SegmentAny, Segment, mSegment
 from .path_utils import area, center_of_mass, ROG_sqr, clip, convex_hull
 from .path import PathAny, Path, mPath
@@ -34,3 +36,6 @@ MathFunctionsMixin._rectangle = Rectangle
 MathFunctionsMixin._mrectangle = mRectangle
 MathFunctionsMixin._triangle = Triangle
 MathFunctionsMixin._mtriangle = mTriangle
+
+# Register the implementations of the generic functions
+import smallshapes.pairwise
@@ -1,4 +1,4 @@
-from smallshapes import Convex
+from smallshapes import Convex, MassProperties
 from smallvectors import dot, Vec
 from smallvectors.core.mutability import Mutable, Immutable
 
@@ -117,6 +117,14 @@ class AABBAny(Convex):
         A, B = self.rect_shape
         return (A * A + B * B) / 12
 
+    def mass_properties(self, density=1.0):
+        xmin, xmax, ymin, ymax = self.rect_coords
+        A, B = xmax - xmin, ymax - ymin
+        mass = A * B * density
+        return MassProperties(mass, A * B,
+                              self._vec((xmin + xmax) / 2, (ymin + ymax) / 2),
+                              mass * (A * A + B * B) / 12)
+
     def SAT_directions(self, n):
         return [direction_x, direction_y]
 
@@ -124,6 +132,21 @@ class AABBAny(Convex):
         points = [dot(n, p) for p in self.vertices]
         return min(points), max(points)
 
+    def normals(self):
+        return [direction_x, direction_y]
+
+    def support(self, direction):
+        x, y = direction
+        return self._vec(self.xmax if x >= 0 else self.xmin,
+                         self.ymax if y >= 0 else self.ymin)
+
+    def shadow(self, n):
+        nx, ny = n
+        center = ((self.xmin + self.xmax) * nx + (self.ymin + self.ymax) * ny)
+        radius = (abs(nx) * (self.xmax - self.xmin) +
+                  abs(ny) * (self.ymax - self.ymin))
+        return (center - radius) / 2, (center + radius) / 2
+
     def move_vec(self, vec):
         dx, dy = vec
         new = self.from_coords(self.xmin, self.xmax, self.ymin, self.ymax)
@@ -139,7 +162,7 @@ class AABBAny(Convex):
     def rescale(self, scale):
         new = self.from_coords(self.xmin, self.xmax, self.ymin, self.ymax)
         x, y = self.pos
-        dx, dy = self.shape
+        dx, dy = self.rect_shape
         dx *= scale / 2
         dy *= scale / 2
         new.xmin, new.xmax = x - dx, x + dx
@@ -151,6 +174,12 @@ class AABBAny(Convex):
         return ((self.xmin <= x <= self.xmax)
                 and (self.ymin <= y <= self.ymax))
 
+    def distance_point(self, point):
+        x, y = point
+        dx = max(self.xmin - x, 0, x - self.xmax)
+        dy = max(self.ymin - y, 0, y - self.ymax)
+        return self._sqrt(dx * dx + dy * dy)
+
     def contains_aabb(self, other):
         return (
             self.xmin <= other.xmin and self.ymin <= other.ymin and
@@ -0,0 +1,268 @@
+import numpy as np
+
+from smallshapes.aabb import AABB, AABBAny
+
+
+class AABBArray:
+    """
+    A collection of AABBs stored in a single contiguous (N, 4) float64 buffer.
+
+    Columns follow the same ``xmin, xmax, ymin, ymax`` order used by
+    :meth:`AABBAny.__flatiter__`. Element access creates AABB objects on
+    demand, while all geometric methods operate on the whole buffer at once.
+
+    Example:
+        >>> boxes = AABBArray([(0, 1, 0, 1), (2, 4, 0, 2)])
+        >>> boxes[1]
+        AABB([2.0, 4.0, 0.0, 2.0])
+        >>> boxes.area()
+        array([1., 4.])
+        >>> boxes.contains_point((0.5, 0.5))
+        array([ True, False])
+    """
+
+    __slots__ = ('_data',)
+
+    @property
+    def data(self):
+        """
+        The underlying (N, 4) buffer.
+        """
+
+        return self._data
+
+    @property
+    def xmin(self):
+        return self._data[:, 0]
+
+    @property
+    def xmax(self):
+        return self._data[:, 1]
+
+    @property
+    def ymin(self):
+        return self._data[:, 2]
+
+    @property
+    def ymax(self):
+        return self._data[:, 3]
+
+    @property
+    def pos(self):
+        """
+        An (N, 2) array with the center of each box.
+        """
+
+        data = self._data
+        out = np.empty((len(data), 2))
+        out[:, 0] = (data[:, 0] + data[:, 1]) / 2
+        out[:, 1] = (data[:, 2] + data[:, 3]) / 2
+        return out
+
+    @property
+    def width(self):
+        return self._data[:, 1] - self._data[:, 0]
+
+    @property
+    def height(self):
+        return self._data[:, 3] - self._data[:, 2]
+
+    @property
+    def aabb(self):
+        """
+        The AABB that encloses all boxes in the array.
+        """
+
+        if not len(self._data):
+            raise ValueError('empty AABBArray has no bounding box')
+        data = self._data
+        return AABB.from_coords(
+            float(data[:, 0].min()), float(data[:, 1].max()),
+            float(data[:, 2].min()), float(data[:, 3].max())
+        )
+
+    @classmethod
+    def _new(cls, data):
+        new = object.__new__(cls)
+        new._data = data
+        return new
+
+    @classmethod
+    def from_coords(cls, xmin, xmax, ymin, ymax):
+        """
+        Creates a new AABBArray from sequences of xmin, xmax, ymin, ymax
+        coordinates.
+        """
+
+        return cls(np.column_stack([xmin, xmax, ymin, ymax]))
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        """
+        Creates a new AABBArray with the bounding boxes of the given shapes.
+        """
+
+        return cls([shape.rect_coords for shape in shapes])
+
+    def __init__(self, data=()):
+        if isinstance(data, AABBArray):
+            data = data._data.copy()
+        elif isinstance(data, np.ndarray):
+            data = np.array(data, dtype=float)
+        else:
+            data = np.array([tuple(x) for x in data], dtype=float)
+        if data.size == 0:
+            data = data.reshape(0, 4)
+        if data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError('expect an (N, 4) array, got %s' % (data.shape,))
+        _check_bounds(data)
+        self._data = np.ascontiguousarray(data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        from_coords = AABB.from_coords
+        for xmin, xmax, ymin, ymax in self._data.tolist():
+            yield from_coords(xmin, xmax, ymin, ymax)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return AABB.from_coords(*self._data[idx].tolist())
+        return self._new(self._data[idx])
+
+    def __setitem__(self, idx, value):
+        if isinstance(value, AABBArray):
+            value = value._data
+        elif isinstance(value, AABBAny):
+            value = value.rect_coords
+
+        # Rows are restored if the new values are not valid boxes
+        rows = idx[0] if isinstance(idx, tuple) else idx
+        old = self._data[rows].copy()
+        self._data[idx] = value
+        try:
+            _check_bounds(self._data[rows].reshape(-1, 4))
+        except ValueError:
+            self._data[rows] = old
+            raise
+
+    def __repr__(self):
+        data = ', '.join('(%r, %r, %r, %r)' % tuple(row)
+                         for row in self._data.tolist())
+        return '%s([%s])' % (type(self).__name__, data)
+
+    def __eq__(self, other):
+        if isinstance(other, AABBArray):
+            return np.array_equal(self._data, other._data)
+        return NotImplemented
+
+    def copy(self):
+        return self._new(self._data.copy())
+
+    def area(self):
+        """
+        Return an array with the area of each box.
+        """
+
+        data = self._data
+        return (data[:, 1] - data[:, 0]) * (data[:, 3] - data[:, 2])
+
+    def contains_point(self, point):
+        """
+        Return a boolean mask telling which boxes contain the given point.
+        """
+
+        x, y = point
+        data = self._data
+        return ((data[:, 0] <= x) & (x <= data[:, 1]) &
+                (data[:, 2] <= y) & (y <= data[:, 3]))
+
+    def move_vec(self, vec):
+        """
+        Return a copy displaced by the given amount.
+
+        ``vec`` can be a single vector or an (N, 2) array with a different
+        displacement for each box.
+        """
+
+        new = self.copy()
+        new.imove_vec(vec)
+        return new
+
+    def imove_vec(self, vec):
+        """
+        Displace all boxes by vec. Changes are done *INPLACE*.
+        """
+
+        vec = np.asarray(vec, dtype=float)
+        data = self._data
+        dx, dy = vec[..., 0], vec[..., 1]
+        data[:, 0] += dx
+        data[:, 1] += dx
+        data[:, 2] += dy
+        data[:, 3] += dy
+
+    def rescale(self, scale):
+        """
+        Return a copy with each box rescaled by the given factor around its
+        own center point.
+        """
+
+        data = self._data
+        scale = np.asarray(scale, dtype=float)
+        x = (data[:, 0] + data[:, 1]) / 2
+        y = (data[:, 2] + data[:, 3]) / 2
+        dx = (data[:, 1] - data[:, 0]) * (scale / 2)
+        dy = (data[:, 3] - data[:, 2]) * (scale / 2)
+        return self._new(np.column_stack([x - dx, x + dx, y - dy, y + dy]))
+
+    def overlaps_aabb(self, other):
+        """
+        Return a boolean mask telling which boxes overlap the given AABB.
+
+        Boxes that only touch at the border are considered to overlap.
+        """
+
+        xmin, xmax, ymin, ymax = other.rect_coords
+        data = self._data
+        return ((data[:, 0] <= xmax) & (xmin <= data[:, 1]) &
+                (data[:, 2] <= ymax) & (ymin <= data[:, 3]))
+
+    def overlap_pairs(self, other=None, chunk_size=1024):
+        """
+        Return a (K, 2) array of index pairs (i, j) of overlapping boxes.
+
+        If ``other`` is given, i indexes self and j indexes other. Otherwise,
+        it returns all pairs i < j of overlapping boxes inside the array.
+
+        Rows are compared in blocks of ``chunk_size`` boxes in order to bound
+        the size of the temporary boolean matrices.
+        """
+
+        A = self._data
+        B = A if other is None else other._data
+        chunks = []
+        step = chunk_size
+        for start in range(0, len(A), step):
+            a = A[start:start + step, None, :]
+            mask = ((a[..., 0] <= B[:, 1]) & (B[:, 0] <= a[..., 1]) &
+                    (a[..., 2] <= B[:, 3]) & (B[:, 2] <= a[..., 3]))
+            if other is None:
+                mask = np.triu(mask, k=start + 1)
+            i, j = np.nonzero(mask)
+            chunks.append(np.column_stack([i + start, j]))
+        if not chunks:
+            return np.empty((0, 2), dtype=int)
+        return np.concatenate(chunks)
+
+
+def _check_bounds(data):
+    """
+    Raise ValueError if some row of an (N, 4) array is not a valid box.
+    """
+
+    if (data[:, 0] > data[:, 1]).any():
+        raise ValueError('xmax < xmin')
+    if (data[:, 2] > data[:, 3]).any():
+        raise ValueError('ymax < ymin')
@@ -0,0 +1,387 @@
+"""
+Dynamic AABB tree.
+
+A bounding volume hierarchy that keeps the AABB of each shape in a balanced
+binary tree. Leaves store a "fat" AABB, i.e., the shape's AABB enlarged by a
+small margin. Small displacements of a shape that stay inside its fat AABB do
+not require changing the tree.
+"""
+
+Inf = float('inf')
+
+
+class _Node:
+    __slots__ = ('xmin', 'xmax', 'ymin', 'ymax',
+                 'parent', 'left', 'right', 'height', 'shape')
+
+    def __init__(self, xmin, xmax, ymin, ymax, shape=None):
+        self.xmin = xmin
+        self.xmax = xmax
+        self.ymin = ymin
+        self.ymax = ymax
+        self.shape = shape
+        self.parent = self.left = self.right = None
+        self.height = 0
+
+    def refit(self):
+        """
+        Recompute height and bounds from the children.
+        """
+
+        left, right = self.left, self.right
+        self.height = 1 + max(left.height, right.height)
+        self.xmin = min(left.xmin, right.xmin)
+        self.xmax = max(left.xmax, right.xmax)
+        self.ymin = min(left.ymin, right.ymin)
+        self.ymax = max(left.ymax, right.ymax)
+
+
+def _perimeter(xmin, xmax, ymin, ymax):
+    return 2 * ((xmax - xmin) + (ymax - ymin))
+
+
+def _union_perimeter(a, b):
+    return _perimeter(min(a.xmin, b.xmin), max(a.xmax, b.xmax),
+                      min(a.ymin, b.ymin), max(a.ymax, b.ymax))
+
+
+class AABBTree:
+    """
+    A dynamic bounding volume hierarchy of shapes.
+
+    Shapes are indexed by their ``aabb`` property. Insertion, removal and
+    updates run in O(log n) and the tree is kept balanced with AVL-like tree
+    rotations.
+
+    Args:
+        shapes:
+            Initial sequence of shapes.
+        margin:
+            Each leaf stores the shape's AABB enlarged by this amount in every
+            direction. Shapes can move up to this distance without being
+            reinserted in the tree.
+
+    Queries are performed against the fat AABBs, hence they return candidates
+    that should be confirmed by an exact test if necessary.
+
+    Example:
+        >>> from smallshapes import Circle
+        >>> a, b = Circle(1, (0, 0)), Circle(1, (5, 0))
+        >>> tree = AABBTree([a, b])
+        >>> list(tree.query_point((4.5, 0))) == [b]
+        True
+    """
+
+    def __init__(self, shapes=(), margin=0.1):
+        self.margin = margin
+        self._root = None
+        self._leaves = {}
+        for shape in shapes:
+            self.insert(shape)
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def __iter__(self):
+        return (leaf.shape for leaf in self._leaves.values())
+
+    def __contains__(self, shape):
+        return id(shape) in self._leaves
+
+    @property
+    def height(self):
+        """
+        Height of the tree. An empty tree or a tree with a single leaf has
+        height zero.
+        """
+
+        return self._root.height if self._root is not None else 0
+
+    def _fat_leaf(self, shape):
+        m = self.margin
+        xmin, xmax, ymin, ymax = shape.aabb.rect_coords
+        return _Node(xmin - m, xmax + m, ymin - m, ymax + m, shape)
+
+    #
+    # Public API: change tree
+    #
+    def insert(self, shape):
+        """
+        Insert shape into the tree.
+        """
+
+        key = id(shape)
+        if key in self._leaves:
+            raise ValueError('shape is already in the tree')
+        leaf = self._leaves[key] = self._fat_leaf(shape)
+        self._insert_leaf(leaf)
+
+    def remove(self, shape):
+        """
+        Remove shape from the tree.
+
+        Raises a ValueError if shape is not present.
+        """
+
+        try:
+            leaf = self._leaves.pop(id(shape))
+        except KeyError:
+            raise ValueError('shape is not in the tree')
+        self._remove_leaf(leaf)
+
+    def update(self, shape):
+        """
+        Update the position of shape in the tree after it has moved.
+
+        Return True if shape has left its fat AABB and had to be reinserted.
+        """
+
+        try:
+            leaf = self._leaves[id(shape)]
+        except KeyError:
+            raise ValueError('shape is not in the tree')
+
+        xmin, xmax, ymin, ymax = shape.aabb.rect_coords
+        if (leaf.xmin <= xmin and xmax <= leaf.xmax and
+                leaf.ymin <= ymin and ymax <= leaf.ymax):
+            return False
+
+        self._remove_leaf(leaf)
+        leaf = self._leaves[id(shape)] = self._fat_leaf(shape)
+        self._insert_leaf(leaf)
+        return True
+
+    def update_all(self):
+        """
+        Update all shapes in the tree and return the number of reinsertions.
+        """
+
+        update = self.update
+        return sum(update(leaf.shape) for leaf in list(self._leaves.values()))
+
+    #
+    # Public API: queries
+    #
+    def query_aabb(self, aabb):
+        """
+        Iterate over all shapes whose fat AABB overlaps the given AABB.
+        """
+
+        xmin, xmax, ymin, ymax = aabb.rect_coords
+        return self._query(xmin, xmax, ymin, ymax)
+
+    def query_point(self, point):
+        """
+        Iterate over all shapes whose fat AABB contains the given point.
+        """
+
+        x, y = point
+        return self._query(x, x, y, y)
+
+    def query_ray(self, origin, direction, max_fraction=1.0):
+        """
+        Iterate over all shapes whose fat AABB is hit by the ray
+        ``origin + t * direction`` for t in the interval [0, max_fraction].
+        """
+
+        x0, y0 = origin
+        dx, dy = direction
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if not _ray_hits(node, x0, y0, dx, dy, max_fraction):
+                continue
+            if node.left is None:
+                yield node.shape
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+    def pairs(self):
+        """
+        Iterate over all pairs of shapes whose fat AABBs overlap.
+        """
+
+        for leaf in self._leaves.values():
+            key = id(leaf)
+            for other in self._query_nodes(leaf.xmin, leaf.xmax,
+                                           leaf.ymin, leaf.ymax):
+                if id(other) > key:
+                    yield leaf.shape, other.shape
+
+    def _query(self, xmin, xmax, ymin, ymax):
+        for node in self._query_nodes(xmin, xmax, ymin, ymax):
+            yield node.shape
+
+    def _query_nodes(self, xmin, xmax, ymin, ymax):
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if (node.xmin > xmax or xmin > node.xmax or
+                    node.ymin > ymax or ymin > node.ymax):
+                continue
+            if node.left is None:
+                yield node
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+    #
+    # Tree operations
+    #
+    def _insert_leaf(self, leaf):
+        if self._root is None:
+            self._root = leaf
+            leaf.parent = None
+            return
+
+        # Find the best sibling descending the tree with the surface area
+        # heuristic (uses perimeters in 2D).
+        node = self._root
+        while node.left is not None:
+            perimeter = _perimeter(node.xmin, node.xmax, node.ymin, node.ymax)
+            combined = _union_perimeter(node, leaf)
+            cost = 2 * combined
+            inheritance = 2 * (combined - perimeter)
+
+            costs = []
+            for child in (node.left, node.right):
+                child_cost = _union_perimeter(child, leaf) + inheritance
+                if child.left is not None:
+                    child_cost -= _perimeter(child.xmin, child.xmax,
+                                             child.ymin, child.ymax)
+                costs.append(child_cost)
+
+            if cost < costs[0] and cost < costs[1]:
+                break
+            node = node.left if costs[0] < costs[1] else node.right
+
+        # Create a new parent holding the sibling and the new leaf
+        sibling = node
+        old_parent = sibling.parent
+        parent = _Node(0, 0, 0, 0)
+        parent.parent = old_parent
+        parent.left, parent.right = sibling, leaf
+        sibling.parent = leaf.parent = parent
+        parent.refit()
+        if old_parent is None:
+            self._root = parent
+        elif old_parent.left is sibling:
+            old_parent.left = parent
+        else:
+            old_parent.right = parent
+        self._fix_upwards(parent)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        grand_parent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+        sibling.parent = grand_parent
+        if grand_parent is None:
+            self._root = sibling
+        else:
+            if grand_parent.left is parent:
+                grand_parent.left = sibling
+            else:
+                grand_parent.right = sibling
+            self._fix_upwards(grand_parent)
+
+    def _fix_upwards(self, node):
+        while node is not None:
+            node = self._balance(node)
+            node.refit()
+            node = node.parent
+
+    def _balance(self, a):
+        """
+        Perform a left or right rotation if node A is imbalanced and return
+        the new root of the subtree.
+        """
+
+        if a.left is None or a.height < 2:
+            return a
+
+        b, c = a.left, a.right
+        balance = c.height - b.height
+        if balance > 1:
+            return self._rotate(a, c, b, 'right')
+        elif balance < -1:
+            return self._rotate(a, b, c, 'left')
+        return a
+
+    def _rotate(self, a, up, other, side):
+        # Promote "up" (a child of a) to a's position. The tallest child of
+        # "up" is kept and the other one takes its place under a.
+        f, g = up.left, up.right
+        up.left = a
+        up.parent = a.parent
+        a.parent = up
+        if up.parent is None:
+            self._root = up
+        elif up.parent.left is a:
+            up.parent.left = up
+        else:
+            up.parent.right = up
+
+        keep, give = (f, g) if f.height > g.height else (g, f)
+        up.right = keep
+        if side == 'right':
+            a.right = give
+        else:
+            a.left = give
+        give.parent = a
+        a.refit()
+        up.refit()
+        return up
+
+    def validate(self):
+        """
+        Check the internal consistency of the tree and raise an
+        AssertionError if some invariant is broken.
+        """
+
+        def check(node):
+            if node.left is None:
+                assert node.height == 0
+                assert self._leaves[id(node.shape)] is node
+                return 1
+            assert node.left.parent is node and node.right.parent is node
+            assert abs(node.left.height - node.right.height) <= 1
+            assert node.height == 1 + max(node.left.height, node.right.height)
+            for child in (node.left, node.right):
+                assert node.xmin <= child.xmin and child.xmax <= node.xmax
+                assert node.ymin <= child.ymin and child.ymax <= node.ymax
+            return check(node.left) + check(node.right)
+
+        if self._root is None:
+            assert not self._leaves
+        else:
+            assert self._root.parent is None
+            assert check(self._root) == len(self._leaves)
+
+
+def _ray_hits(node, x0, y0, dx, dy, tmax):
+    """
+    Slab test between a ray and the bounding box of a node.
+    """
+
+    tmin = 0.0
+    for p, d, lo, hi in ((x0, dx, node.xmin, node.xmax),
+                         (y0, dy, node.ymin, node.ymax)):
+        if d == 0:
+            if p < lo or p > hi:
+                return False
+        else:
+            t1 = (lo - p) / d
+            t2 = (hi - p) / d
+            if t1 > t2:
+                t1, t2 = t2, t1
+            tmin = max(tmin, t1)
+            tmax = min(tmax, t2)
+            if tmin > tmax:
+                return False
+    return True
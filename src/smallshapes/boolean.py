@@ -0,0 +1,353 @@
+"""
+Boolean operations between simple polygons.
+
+The engine follows a split and classify strategy:
+
+1. Edge intersections between both operands are found with a plane sweep
+   (see :func:`smallshapes.sweep.box_pairs`).
+2. Edges are split at the intersection points.
+3. Each piece is classified as inside, outside or shared with the other
+   operand. Only the pieces that belong to the boundary of the result are
+   kept.
+4. The selected pieces are linked back into closed loops.
+
+Operands can be polygons or regions, i.e., lists of polygons in which outer
+boundaries are counter-clockwise and holes are clockwise (the format returned
+by all functions in this module). Operands must not self-intersect.
+"""
+
+from math import atan2
+
+import numpy as np
+
+from smallshapes import AABBAny, Poly, PolyAny
+from smallshapes.strtree import _str_order
+from smallshapes.sweep import box_pairs, segment_boxes, segment_intersection
+
+
+def union(A, B):
+    """
+    Return the union of A and B as a list of polygons.
+
+    Holes are returned as clockwise polygons.
+
+    Example:
+        >>> A = Poly((0, 0), (2, 0), (2, 2), (0, 2))
+        >>> B = Poly((1, 1), (3, 1), (3, 3), (1, 3))
+        >>> [poly.area() for poly in union(A, B)]
+        [7.0]
+    """
+
+    return _to_polys(_boolean(_as_loops(A), _as_loops(B), 'union'))
+
+
+def intersection(A, B):
+    """
+    Return the intersection of A and B as a list of polygons.
+
+    Example:
+        >>> A = Poly((0, 0), (2, 0), (2, 2), (0, 2))
+        >>> B = Poly((1, 1), (3, 1), (3, 3), (1, 3))
+        >>> intersection(A, B)
+        [Poly(Vec(2.0, 1.0), Vec(2.0, 2.0), Vec(1.0, 2.0), Vec(1.0, 1.0))]
+    """
+
+    return _to_polys(_boolean(_as_loops(A), _as_loops(B), 'intersection'))
+
+
+def difference(A, B):
+    """
+    Return the region of A that is not in B as a list of polygons.
+
+    Example:
+        >>> A = Poly((0, 0), (4, 0), (4, 4), (0, 4))
+        >>> B = Poly((1, 1), (3, 1), (3, 3), (1, 3))
+        >>> [poly.area() for poly in difference(A, B)]
+        [16.0, -4.0]
+    """
+
+    return _to_polys(_boolean(_as_loops(A), _as_loops(B), 'difference'))
+
+
+def xor(A, B):
+    """
+    Return the symmetric difference between A and B as a list of polygons.
+    """
+
+    return _to_polys(_boolean(_as_loops(A), _as_loops(B), 'xor'))
+
+
+def union_all(polys):
+    """
+    Return the union of a sequence of polygons (or regions).
+
+    Polygons are merged in a cascade: they are first sorted in spatially
+    coherent order and neighbors are merged pairwise until a single region is
+    left. Each merge only involves polygons that are close to each other.
+    """
+
+    regions = [_as_loops(p) for p in polys]
+    regions = [r for r in regions if r]
+    if not regions:
+        return []
+
+    boxes = np.array([_bounds(r) for r in regions], dtype=float)
+    regions = [regions[i] for i in _str_order(boxes, 4).tolist()]
+    while len(regions) > 1:
+        merged = [_boolean(regions[i], regions[i + 1], 'union')
+                  for i in range(0, len(regions) - 1, 2)]
+        if len(regions) % 2:
+            merged.append(regions[-1])
+        regions = merged
+    return _to_polys(regions[0])
+
+
+#
+# Input and output conversions
+#
+def _as_loops(obj):
+    """
+    Convert polygon or region to a list of loops of (x, y) tuples.
+
+    Single polygons are oriented counter-clockwise.
+    """
+
+    if isinstance(obj, PolyAny):
+        loop = _clean_loop([tuple(pt) for pt in obj.array.tolist()])
+        if len(loop) < 3:
+            return []
+        if _loop_area(loop) < 0:
+            loop.reverse()
+        return [loop]
+    elif isinstance(obj, AABBAny):
+        xmin, xmax, ymin, ymax = obj.rect_coords
+        return [[(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]]
+
+    loops = []
+    for poly in obj:
+        loop = _clean_loop([tuple(pt) for pt in poly.array.tolist()])
+        if len(loop) >= 3:
+            loops.append(loop)
+    return loops
+
+
+def _to_polys(loops):
+    return [Poly(*loop) for loop in loops]
+
+
+def _clean_loop(loop):
+    # Remove repeated consecutive points
+    out = []
+    for pt in loop:
+        if not out or out[-1] != pt:
+            out.append(pt)
+    while len(out) > 1 and out[0] == out[-1]:
+        out.pop()
+    return out
+
+
+def _loop_area(loop):
+    x0, y0 = loop[-1]
+    total = 0.0
+    for x1, y1 in loop:
+        total += x0 * y1 - x1 * y0
+        x0, y0 = x1, y1
+    return total / 2
+
+
+def _bounds(loops):
+    xs = [x for loop in loops for x, _ in loop]
+    ys = [y for loop in loops for _, y in loop]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def _edges(loops):
+    out = []
+    for loop in loops:
+        x0, y0 = loop[-1]
+        for x1, y1 in loop:
+            out.append((x0, y0, x1, y1))
+            x0, y0 = x1, y1
+    return out
+
+
+#
+# The boolean engine
+#
+def _boolean(loops_a, loops_b, op):
+    """
+    Execute boolean operation between two regions and return a list of
+    loops.
+    """
+
+    if not loops_a or not loops_b:
+        return {'union': loops_a + loops_b, 'intersection': [],
+                'difference': loops_a, 'xor': loops_a + loops_b}[op]
+
+    # Operands with disjoint bounding boxes
+    axmin, axmax, aymin, aymax = _bounds(loops_a)
+    bxmin, bxmax, bymin, bymax = _bounds(loops_b)
+    if axmax < bxmin or bxmax < axmin or aymax < bymin or bymax < aymin:
+        return {'union': loops_a + loops_b, 'intersection': [],
+                'difference': loops_a, 'xor': loops_a + loops_b}[op]
+
+    edges_a, edges_b = _edges(loops_a), _edges(loops_b)
+    pieces_a, pieces_b = _split_edges(edges_a, edges_b)
+    keys_a, keys_b = set(pieces_a), set(pieces_b)
+    locate_a, locate_b = _Locator(edges_a), _Locator(edges_b)
+
+    # Select pieces of each operand: rules map each classification to the
+    # direction in which the piece is used (1, -1) or to 0 if it is dropped.
+    rules_a, rules_b = _RULES[op]
+    selected = []
+    for pieces, other_keys, locate, rules, first in (
+            (pieces_a, keys_b, locate_b, rules_a, True),
+            (pieces_b, keys_a, locate_a, rules_b, False)):
+        for p, q in pieces:
+            if (p, q) in other_keys:
+                # Shared edges are taken only once, from the first operand
+                kind = 'same' if first else None
+            elif (q, p) in other_keys:
+                kind = 'opposite' if first else None
+            else:
+                x = (p[0] + q[0]) / 2
+                y = (p[1] + q[1]) / 2
+                kind = 'inside' if locate.contains(x, y) else 'outside'
+            direction = rules.get(kind, 0)
+            if direction == 1:
+                selected.append((p, q))
+            elif direction == -1:
+                selected.append((q, p))
+
+    return [loop for loop in _link(selected) if len(loop) >= 3]
+
+
+_RULES = {
+    'union': ({'outside': 1, 'same': 1}, {'outside': 1}),
+    'intersection': ({'inside': 1, 'same': 1}, {'inside': 1}),
+    'difference': ({'outside': 1, 'opposite': 1}, {'inside': -1}),
+    'xor': ({'outside': 1, 'inside': -1}, {'outside': 1, 'inside': -1}),
+}
+
+
+def _split_edges(edges_a, edges_b):
+    """
+    Split all edges at their mutual intersections and return the list of
+    pieces (p, q) of each operand.
+    """
+
+    edges = edges_a + edges_b
+    size_a = len(edges_a)
+    groups = [0] * size_a + [1] * len(edges_b)
+    splits = [[] for _ in edges]
+    for i, j in box_pairs(segment_boxes(edges), groups):
+        split_i, split_j = segment_intersection(edges[i], edges[j])
+        splits[i].extend(split_i)
+        splits[j].extend(split_j)
+
+    pieces = []
+    for (x0, y0, x1, y1), points in zip(edges, splits):
+        start, end = (x0, y0), (x1, y1)
+        if points:
+            dx, dy = x1 - x0, y1 - y0
+            points = sorted(set(points),
+                            key=lambda p: (p[0] - x0) * dx + (p[1] - y0) * dy)
+            chain = [start] + points + [end]
+            pieces.append(list(zip(chain, chain[1:])))
+        else:
+            pieces.append([(start, end)])
+    flat_a = [p for chunk in pieces[:size_a] for p in chunk]
+    flat_b = [p for chunk in pieces[size_a:] for p in chunk]
+    return flat_a, flat_b
+
+
+class _Locator:
+    """
+    Even-odd point location in a region.
+
+    Edges are bucketed into horizontal slabs so that each query only tests
+    the edges that cross the slab of the point.
+    """
+
+    def __init__(self, edges):
+        ys = [y for e in edges for y in (e[1], e[3])]
+        self.ymin, ymax = min(ys), max(ys)
+        self.size = max(1, int(len(edges) ** 0.5))
+        self.height = (ymax - self.ymin) / self.size or 1.0
+        self.slabs = [[] for _ in range(self.size)]
+        for edge in edges:
+            _, y0, _, y1 = edge
+            i0, i1 = self._slab(min(y0, y1)), self._slab(max(y0, y1))
+            for i in range(i0, i1 + 1):
+                self.slabs[i].append(edge)
+
+    def _slab(self, y):
+        i = int((y - self.ymin) / self.height)
+        return min(max(i, 0), self.size - 1)
+
+    def contains(self, x, y):
+        # Crossing number test with an horizontal ray pointing right
+        inside = False
+        for x0, y0, x1, y1 in self.slabs[self._slab(y)]:
+            if (y0 > y) != (y1 > y):
+                if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                    inside = not inside
+        return inside
+
+
+def _link(edges):
+    """
+    Link directed edges (p, q) into closed loops.
+
+    When several edges leave the same point, the loop follows the leftmost
+    turn. Loops that touch at a vertex are kept separated. Raises a
+    ValueError if the edges contain an open chain, since dropping it would
+    silently lose part of the result.
+    """
+
+    outgoing = {}
+    for idx, (p, q) in enumerate(edges):
+        outgoing.setdefault(p, []).append(idx)
+    used = [False] * len(edges)
+
+    loops = []
+    for first in range(len(edges)):
+        if used[first]:
+            continue
+        used[first] = True
+        start, cur = edges[first]
+        prev = start
+        loop = [start]
+        while cur != start:
+            candidates = [i for i in outgoing.get(cur, ()) if not used[i]]
+            if not candidates:
+                raise ValueError('edges do not form closed loops: the chain '
+                                 'starting at %r stops at %r' % (start, cur))
+            idx = max(candidates, key=lambda i: _turn(prev, cur, edges[i][1]))
+            used[idx] = True
+            loop.append(cur)
+            prev, cur = cur, edges[idx][1]
+        loops.append(_simplify(loop))
+    return loops
+
+
+def _turn(p, q, r):
+    # Signed angle of the turn p -> q -> r.
+    ux, uy = q[0] - p[0], q[1] - p[1]
+    vx, vy = r[0] - q[0], r[1] - q[1]
+    cross = ux * vy - uy * vx
+    dot = ux * vx + uy * vy
+    return atan2(cross, dot)
+
+
+def _simplify(loop):
+    # Remove vertices in the middle of straight lines.
+    out = []
+    size = len(loop)
+    for i, q in enumerate(loop):
+        p, r = loop[i - 1], loop[(i + 1) % size]
+        cross = (q[0] - p[0]) * (r[1] - q[1]) - (q[1] - p[1]) * (r[0] - q[0])
+        dot = (q[0] - p[0]) * (r[0] - q[0]) + (q[1] - p[1]) * (r[1] - q[1])
+        if cross != 0 or dot < 0:
+            out.append(q)
+    return out
@@ -0,0 +1,271 @@
+"""
+Continuous collision detection (CCD).
+
+Swept tests compute the first instant in which two shapes moving with
+constant velocities touch each other. Time is normalized so that the
+displacement of each shape during a simulation step is equal to its velocity
+and the step corresponds to the interval [0, 1]. Fast objects can be tested
+against thin walls without subdividing the step.
+
+Each test reduces to a ray cast: the relative motion of B with respect to A
+is a ray from a reference point of B against the Minkowski sum of A and B.
+"""
+
+from math import sqrt
+
+from generic import generic
+from smallvectors import Vec
+
+from smallshapes import AABBAny, CircleAny, SegmentAny
+
+
+@generic
+def time_of_impact(A, velA, B, velB):
+    """
+    Return a tuple (t, normal) with the time of first contact between A and B
+    and the contact normal or None if shapes do not touch in the interval
+    [0, 1].
+
+    Shapes move with constant velocities velA and velB. The normal is a unit
+    vector pointing from A to B (the same convention of
+    :func:`smallshapes.SAT.sat`). Shapes that already overlap at t = 0 return
+    a contact time of zero.
+
+    Implemented for circle-circle, circle-AABB, AABB-AABB and circle-segment
+    pairs in any order.
+
+    Example:
+        >>> from smallshapes import Circle, AABB
+        >>> ball, wall = Circle(1, (0, 0)), AABB(10, 10.5, -5, 5)
+        >>> time_of_impact(ball, (20, 0), wall, (0, 0))
+        (0.45, Vec(1.0, 0.0))
+    """
+
+    raise NotImplementedError(
+        'time of impact is not implemented for %s and %s' %
+        (type(A).__name__, type(B).__name__))
+
+
+@time_of_impact.register(CircleAny, object, CircleAny, object)
+def toi_circle_circle(A, velA, B, velB):
+    (px, py), (vx, vy) = _relative_motion(A, velA, B, velB)
+    return _result(_sweep_circle(px, py, vx, vy, A._x, A._y,
+                                 A._radius + B._radius))
+
+
+@time_of_impact.register(AABBAny, object, AABBAny, object)
+def toi_aabb_aabb(A, velA, B, velB):
+    (px, py), (vx, vy) = _relative_motion(A, velA, B, velB)
+    w, h = B.rect_shape
+    xmin, xmax, ymin, ymax = A.rect_coords
+    return _result(_sweep_box(px, py, vx, vy, xmin - w / 2, xmax + w / 2,
+                              ymin - h / 2, ymax + h / 2))
+
+
+@time_of_impact.register(AABBAny, object, CircleAny, object)
+def toi_aabb_circle(A, velA, B, velB):
+    (px, py), (vx, vy) = _relative_motion(A, velA, B, velB)
+    return _result(_sweep_rounded_box(px, py, vx, vy, B._radius,
+                                      *A.rect_coords))
+
+
+@time_of_impact.register(SegmentAny, object, CircleAny, object)
+def toi_segment_circle(A, velA, B, velB):
+    (px, py), (vx, vy) = _relative_motion(A, velA, B, velB)
+    x0, y0 = A.start
+    x1, y1 = A.end
+    return _result(_sweep_capsule(px, py, vx, vy, x0, y0, x1, y1, B._radius))
+
+
+@time_of_impact.register(CircleAny, object, AABBAny, object)
+def toi_circle_aabb(A, velA, B, velB):
+    return _flipped(toi_aabb_circle(B, velB, A, velA))
+
+
+@time_of_impact.register(CircleAny, object, SegmentAny, object)
+def toi_circle_segment(A, velA, B, velB):
+    return _flipped(toi_segment_circle(B, velB, A, velA))
+
+
+#
+# Utility functions
+#
+def _relative_motion(A, velA, B, velB):
+    # Position of B and its velocity relative to A.
+    ax, ay = velA
+    bx, by = velB
+    x, y = B.pos
+    return (x, y), (bx - ax, by - ay)
+
+
+def _result(hit):
+    if hit is None:
+        return None
+    t, nx, ny = hit
+    return t, Vec(nx, ny)
+
+
+def _flipped(result):
+    if result is None:
+        return None
+    t, normal = result
+    return t, -normal
+
+
+def _sweep_circle(px, py, vx, vy, cx, cy, r):
+    """
+    Sweep point p with velocity v against a circle of radius r at c.
+
+    Return (t, nx, ny) or None.
+    """
+
+    dx, dy = px - cx, py - cy
+    c = dx * dx + dy * dy - r * r
+    if c <= 0:
+        dist = sqrt(dx * dx + dy * dy)
+        if dist == 0:
+            return (0.0,) + _against(vx, vy, 1.0, 0.0)
+        return 0.0, dx / dist, dy / dist
+
+    t = _ray_circle(dx, dy, vx, vy, r)
+    if t is None:
+        return None
+    return t, (dx + vx * t) / r, (dy + vy * t) / r
+
+
+def _ray_circle(dx, dy, vx, vy, r):
+    # First root of |d + v t| = r in [0, 1] for a point d outside the circle.
+    a = vx * vx + vy * vy
+    b = dx * vx + dy * vy
+    c = dx * dx + dy * dy - r * r
+    if a == 0 or b >= 0:
+        return None
+    delta = b * b - a * c
+    if delta < 0:
+        return None
+    t = (-b - sqrt(delta)) / a
+    return t if t <= 1 else None
+
+
+def _sweep_box(px, py, vx, vy, xmin, xmax, ymin, ymax):
+    """
+    Sweep point p with velocity v against an axis aligned box.
+
+    Return (t, nx, ny) or None. The normal is the outward normal of the face
+    that is hit first.
+    """
+
+    if xmin <= px <= xmax and ymin <= py <= ymax:
+        # Already inside: choose the face with the smallest penetration
+        faces = [(px - xmin, -1.0, 0.0), (xmax - px, 1.0, 0.0),
+                 (py - ymin, 0.0, -1.0), (ymax - py, 0.0, 1.0)]
+        return (0.0,) + min(faces)[1:]
+    return _ray_box(px, py, vx, vy, xmin, xmax, ymin, ymax)
+
+
+def _ray_box(px, py, vx, vy, xmin, xmax, ymin, ymax):
+    # Slab test for a point outside the box.
+    t_enter, t_exit = 0.0, 1.0
+    normal = None
+    for p, v, lo, hi, axis in ((px, vx, xmin, xmax, 0),
+                               (py, vy, ymin, ymax, 1)):
+        if v == 0:
+            if p < lo or p > hi:
+                return None
+            continue
+        t1, t2 = (lo - p) / v, (hi - p) / v
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter or normal is None and t1 == t_enter:
+            t_enter = t1
+            normal = (axis, -1.0 if v > 0 else 1.0)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return None
+
+    if normal is None:
+        return None
+    axis, sign = normal
+    return (t_enter, sign, 0.0) if axis == 0 else (t_enter, 0.0, sign)
+
+
+def _sweep_rounded_box(px, py, vx, vy, r, xmin, xmax, ymin, ymax):
+    """
+    Sweep point p with velocity v against an axis aligned box with rounded
+    corners of radius r (i.e., the Minkowski sum of a box and a circle).
+    """
+
+    # Point of the box closest to p
+    qx = min(max(px, xmin), xmax)
+    qy = min(max(py, ymin), ymax)
+    dx, dy = px - qx, py - qy
+    if dx * dx + dy * dy <= r * r:
+        if dx or dy:
+            dist = sqrt(dx * dx + dy * dy)
+            return 0.0, dx / dist, dy / dist
+        return _sweep_box(px, py, vx, vy, xmin, xmax, ymin, ymax)
+
+    # The rounded box is the union of two crossed boxes and four circles in
+    # the corners. The first hit of the union is the first hit among its
+    # parts.
+    hits = [
+        _ray_box(px, py, vx, vy, xmin - r, xmax + r, ymin, ymax),
+        _ray_box(px, py, vx, vy, xmin, xmax, ymin - r, ymax + r),
+    ]
+    for cx in (xmin, xmax):
+        for cy in (ymin, ymax):
+            t = _ray_circle(px - cx, py - cy, vx, vy, r)
+            if t is not None:
+                hits.append((t, (px + vx * t - cx) / r,
+                             (py + vy * t - cy) / r))
+    hits = [hit for hit in hits if hit is not None]
+    return min(hits) if hits else None
+
+
+def _sweep_capsule(px, py, vx, vy, x0, y0, x1, y1, r):
+    """
+    Sweep point p with velocity v against the capsule of radius r around the
+    segment from (x0, y0) to (x1, y1).
+    """
+
+    ux, uy = x1 - x0, y1 - y0
+    length = sqrt(ux * ux + uy * uy)
+    if length == 0:
+        return _sweep_circle(px, py, vx, vy, x0, y0, r)
+    ux, uy = ux / length, uy / length
+    nx, ny = -uy, ux
+
+    # Work in the frame of the segment: s is the coordinate along the segment
+    # and h is the coordinate along its normal.
+    s = (px - x0) * ux + (py - y0) * uy
+    h = (px - x0) * nx + (py - y0) * ny
+    vs = vx * ux + vy * uy
+    vh = vx * nx + vy * ny
+
+    closest = min(max(s, 0.0), length)
+    ds = s - closest
+    if ds * ds + h * h <= r * r:
+        dist = sqrt(ds * ds + h * h)
+        if dist == 0:
+            hs, hh = _against(vs, vh, 0.0, 1.0)
+        else:
+            hs, hh = ds / dist, h / dist
+        return 0.0, hs * ux + hh * nx, hs * uy + hh * ny
+
+    hits = [_ray_box(s, h, vs, vh, 0.0, length, -r, r)]
+    for end in (0.0, length):
+        t = _ray_circle(s - end, h, vs, vh, r)
+        if t is not None:
+            hits.append((t, (s + vs * t - end) / r, (h + vh * t) / r))
+    hits = [hit for hit in hits if hit is not None]
+    if not hits:
+        return None
+    t, hs, hh = min(hits)
+    return t, hs * ux + hh * nx, hs * uy + hh * ny
+
+
+def _against(vx, vy, nx, ny):
+    # Return the direction +/- n that opposes the velocity v.
+    if vx * nx + vy * ny > 0:
+        return -nx, -ny
+    return nx, ny
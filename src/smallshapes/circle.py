@@ -1,9 +1,9 @@
 from math import pi, sqrt
 
-from smallshapes import Convex, mConvex
+from smallshapes import Convex, mConvex, MassProperties
 from smallvectors.core.mutability import Immutable
 from smallshapes.functions import simplify_number
-from smallvectors import dot, Vec
+from smallvectors import Vec
 
 SQRT_HALF = 1 / sqrt(2)
 
@@ -107,25 +107,61 @@ class CircleAny(Convex):
     def ROG(self):
         return self._radius * SQRT_HALF
 
+    def mass_properties(self, density=1.0):
+        r2 = self._radius * self._radius
+        mass = pi * r2 * density
+        return MassProperties(mass, pi * r2, self._vec(self._x, self._y),
+                              mass * r2 / 2)
+
     def SAT_directions(self, n):
         return []
 
+    def support(self, direction):
+        x, y = direction
+        scale = self._radius / sqrt(x * x + y * y)
+        return self._vec(self._x + x * scale, self._y + y * scale)
+
+    # The methods below are called in tight loops and work directly with the
+    # coordinates stored in the slots in order to avoid creating temporary
+    # vectors.
     def shadow(self, n):
-        p0 = dot(self.pos, n)
+        nx, ny = n
+        p0 = self._x * nx + self._y * ny
         r = self._radius
         return p0 - r, p0 + r
 
+    def distance_point(self, point):
+        x, y = point
+        dx, dy = x - self._x, y - self._y
+        return max(sqrt(dx * dx + dy * dy) - self._radius, 0)
+
     def distance_circle(self, other):
-        distance = self.pos.distance(other.pos)
-        sum_radius = self._radius + other.radius
-        return max(distance - sum_radius, 0)
+        dx, dy = other._x - self._x, other._y - self._y
+        distance = sqrt(dx * dx + dy * dy)
+        return max(distance - self._radius - other._radius, 0)
+
+    def overlaps_circle(self, other):
+        """
+        Return True if both circles overlap. Circles that touch at a single
+        point are considered to overlap.
+        """
+
+        dx, dy = other._x - self._x, other._y - self._y
+        r = self._radius + other._radius
+        return dx * dx + dy * dy <= r * r
 
     def contains_circle(self, other):
-        d_center = abs(other.pos - self.pos)
-        return self._radius - other._radius - d_center > 0
+        delta = self._radius - other._radius
+        if delta <= 0:
+            return False
+        dx, dy = other._x - self._x, other._y - self._y
+        return dx * dx + dy * dy < delta * delta
 
     def contains_point(self, point):
-        return self.pos.distance(point) <= self._radius
+        x, y = point
+        dx, dy = x - self._x, y - self._y
+        r = self._radius
+        return dx * dx + dy * dy <= r * r
 
 
 class Circle(CircleAny, Immutable):
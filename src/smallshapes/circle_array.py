@@ -0,0 +1,306 @@
+import numpy as np
+
+from smallshapes.aabb_array import AABBArray
+from smallshapes.circle import Circle, CircleAny
+
+
+class CircleArray:
+    """
+    A collection of circles stored in a single contiguous (N, 3) float64
+    buffer.
+
+    Columns follow the same ``radius, x, y`` order used by
+    :meth:`CircleAny.__flatiter__`. Element access creates Circle objects on
+    demand, while all geometric methods operate on the whole buffer at once.
+
+    Example:
+        >>> circles = CircleArray([(1, 0, 0), (2, 3, 0)])
+        >>> circles[1]
+        Circle(2, (3, 0))
+        >>> circles.contains_point((0.5, 0))
+        array([ True, False])
+        >>> circles.overlap_pairs().tolist()
+        [[0, 1]]
+    """
+
+    __slots__ = ('_data',)
+
+    @property
+    def data(self):
+        """
+        The underlying (N, 3) buffer.
+        """
+
+        return self._data
+
+    @property
+    def radius(self):
+        return self._data[:, 0]
+
+    @property
+    def x(self):
+        return self._data[:, 1]
+
+    @property
+    def y(self):
+        return self._data[:, 2]
+
+    @property
+    def pos(self):
+        """
+        An (N, 2) view with the center of each circle.
+        """
+
+        return self._data[:, 1:]
+
+    @property
+    def aabb(self):
+        """
+        An AABBArray with the bounding box of each circle.
+        """
+
+        r, x, y = self._data.T
+        return AABBArray._new(np.column_stack([x - r, x + r, y - r, y + r]))
+
+    @classmethod
+    def _new(cls, data):
+        new = object.__new__(cls)
+        new._data = data
+        return new
+
+    @classmethod
+    def from_coords(cls, radius, x, y):
+        """
+        Creates a new CircleArray from sequences of radius, x and y
+        coordinates.
+        """
+
+        size = max(np.size(radius), np.size(x), np.size(y))
+        data = np.empty((size, 3))
+        data[:, 0], data[:, 1], data[:, 2] = radius, x, y
+        return cls(data)
+
+    @classmethod
+    def from_shapes(cls, circles):
+        """
+        Creates a new CircleArray from a sequence of circles.
+        """
+
+        return cls([(c._radius, c._x, c._y) for c in circles])
+
+    def __init__(self, data=()):
+        if isinstance(data, CircleArray):
+            data = data._data.copy()
+        elif isinstance(data, np.ndarray):
+            data = np.array(data, dtype=float)
+        else:
+            data = np.array([_flat(x) for x in data], dtype=float)
+        if data.size == 0:
+            data = data.reshape(0, 3)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError('expect an (N, 3) array, got %s' % (data.shape,))
+        _check_radius(data)
+        self._data = np.ascontiguousarray(data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        for r, x, y in self._data.tolist():
+            yield Circle(r, (x, y))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            r, x, y = self._data[idx].tolist()
+            return Circle(r, (x, y))
+        return self._new(self._data[idx])
+
+    def __setitem__(self, idx, value):
+        if isinstance(value, CircleArray):
+            value = value._data
+        elif isinstance(value, CircleAny):
+            value = (value._radius, value._x, value._y)
+
+        # Rows are restored if the new values are not valid circles
+        rows = idx[0] if isinstance(idx, tuple) else idx
+        old = self._data[rows].copy()
+        self._data[idx] = value
+        try:
+            _check_radius(self._data[rows].reshape(-1, 3))
+        except ValueError:
+            self._data[rows] = old
+            raise
+
+    def __repr__(self):
+        data = ', '.join('(%r, %r, %r)' % tuple(row)
+                         for row in self._data.tolist())
+        return '%s([%s])' % (type(self).__name__, data)
+
+    def __eq__(self, other):
+        if isinstance(other, CircleArray):
+            return np.array_equal(self._data, other._data)
+        return NotImplemented
+
+    def copy(self):
+        return self._new(self._data.copy())
+
+    def area(self):
+        """
+        Return an array with the area of each circle.
+        """
+
+        r = self._data[:, 0]
+        return np.pi * r * r
+
+    def contains_point(self, points):
+        """
+        Return a boolean mask telling which circles contain the given point.
+
+        If an (M, 2) array of points is given, return an (N, M) mask in which
+        element (i, j) tells if circle i contains point j.
+        """
+
+        points = np.asarray(points, dtype=float)
+        r, x, y = self._data.T
+        if points.ndim == 2:
+            r, x, y = r[:, None], x[:, None], y[:, None]
+        dx = points[..., 0] - x
+        dy = points[..., 1] - y
+        return dx * dx + dy * dy <= r * r
+
+    def distance_point(self, point):
+        """
+        Return an array with the distance from each circle to the given
+        point. Points inside a circle have null distance.
+        """
+
+        x, y = point
+        data = self._data
+        d = np.hypot(x - data[:, 1], y - data[:, 2]) - data[:, 0]
+        return np.maximum(d, 0)
+
+    def distance_circle(self, other):
+        """
+        Return an array with the distance from each circle to the other
+        circle. Overlapping circles have null distance.
+
+        If other is a CircleArray with M circles, return an (N, M) matrix.
+        """
+
+        r, x, y = self._data.T
+        if isinstance(other, CircleArray):
+            r, x, y = r[:, None], x[:, None], y[:, None]
+            r2, x2, y2 = other._data.T
+        else:
+            r2, x2, y2 = other._radius, other._x, other._y
+        return np.maximum(np.hypot(x2 - x, y2 - y) - r - r2, 0)
+
+    def overlaps_circle(self, other):
+        """
+        Return a boolean mask telling which circles overlap the given circle.
+
+        Circles that only touch at the border are considered to overlap.
+        """
+
+        r, x, y = self._data.T
+        dx, dy = other._x - x, other._y - y
+        rsum = r + other._radius
+        return dx * dx + dy * dy <= rsum * rsum
+
+    def overlap_pairs(self, other=None, chunk_size=1024):
+        """
+        Return a (K, 2) array of index pairs (i, j) of overlapping circles.
+
+        If ``other`` is given, i indexes self and j indexes other. Otherwise,
+        it returns all pairs i < j of overlapping circles inside the array.
+
+        Candidates are found with a sort and sweep along the x axis: each
+        circle is only compared with the circles whose x-range overlaps its
+        own. Circles are processed in blocks of ``chunk_size`` in order to
+        bound the size of temporary arrays.
+        """
+
+        A = self._data
+        B = A if other is None else other._data
+        if not len(A) or not len(B):
+            return np.empty((0, 2), dtype=int)
+
+        order = np.argsort(B[:, 1] - B[:, 0], kind='stable')
+        sorted_B = B[order]
+        xmin_B = sorted_B[:, 1] - sorted_B[:, 0]
+        if other is None:
+            # Sweep over the sorted array: compare with the following circles
+            A = sorted_B
+            lo_all = np.arange(1, len(B) + 1)
+        else:
+            rmax = B[:, 0].max()
+            lo_all = np.searchsorted(xmin_B, A[:, 1] - A[:, 0] - 2 * rmax)
+        hi_all = np.searchsorted(xmin_B, A[:, 1] + A[:, 0], side='right')
+
+        chunks = []
+        for start in range(0, len(A), chunk_size):
+            lo = lo_all[start:start + chunk_size]
+            counts = np.maximum(hi_all[start:start + chunk_size] - lo, 0)
+            i = np.repeat(np.arange(start, start + len(lo)), counts)
+            offsets = np.arange(counts.sum()) - np.repeat(
+                np.cumsum(counts) - counts, counts)
+            j = np.repeat(lo, counts) + offsets
+            a, b = A[i], sorted_B[j]
+            dx, dy = a[:, 1] - b[:, 1], a[:, 2] - b[:, 2]
+            rsum = a[:, 0] + b[:, 0]
+            hit = dx * dx + dy * dy <= rsum * rsum
+            chunks.append(np.column_stack([i[hit], j[hit]]))
+
+        pairs = np.concatenate(chunks)
+        if other is None:
+            pairs = np.sort(order[pairs], axis=1)
+        else:
+            pairs[:, 1] = order[pairs[:, 1]]
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def move_vec(self, vec):
+        """
+        Return a copy displaced by the given amount.
+
+        ``vec`` can be a single vector or an (N, 2) array with a different
+        displacement for each circle.
+        """
+
+        new = self.copy()
+        new.imove_vec(vec)
+        return new
+
+    def imove_vec(self, vec):
+        """
+        Displace all circles by vec. Changes are done *INPLACE*.
+        """
+
+        self._data[:, 1:] += np.asarray(vec, dtype=float)
+
+    def rescale(self, scale):
+        """
+        Return a copy with the radius of each circle multiplied by the given
+        factor.
+        """
+
+        new = self.copy()
+        new._data[:, 0] *= scale
+        return new
+
+
+def _flat(obj):
+    if isinstance(obj, CircleAny):
+        return obj._radius, obj._x, obj._y
+    if len(obj) == 2:
+        r, (x, y) = obj
+        return r, x, y
+    return tuple(obj)
+
+
+def _check_radius(data):
+    """
+    Raise ValueError if some row of an (N, 3) array has a negative radius.
+    """
+
+    if (data[:, 0] < 0).any():
+        raise ValueError('negative radius')
@@ -1,5 +1,6 @@
-from smallshapes import PathAny, Path, mPath, center_of_mass
-from smallshapes import center_of_mass
+from smallshapes import PathAny, Path, mPath
+from smallshapes.path_utils import _flat_moments
+from smallshapes.utils import cached
 
 
 class CircuitAny(PathAny):
@@ -10,8 +11,25 @@ class CircuitAny(PathAny):
     __slots__ = ()
 
     @property
+    @cached
     def pos(self):
-        return center_of_mass(self)
+        _, x, y, _ = self._moments()
+        return self._vec(x, y)
+
+    @cached
+    def _moments(self):
+        """
+        Return the (area, x_cm, y_cm, ROG2) tuple computed by
+        :func:`smallshapes.path_utils.poly_moments`.
+        """
+
+        return _flat_moments(self._data)
+
+    def _edges(self):
+        data = self._data
+        yield from super()._edges()
+        yield (float(data[-2]), float(data[-1]),
+               float(data[0]), float(data[1]))
 
 
 class Circuit(CircuitAny, Path):
@@ -31,4 +49,4 @@ class mCircuit(CircuitAny, mPath):
 
     __slots__ = ()
 
-    pos = mPath.pos
\ No newline at end of file
+    pos = CircuitAny.pos.setter(mPath.pos.fset)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Polygon clipping engine.
+
+Implements the Sutherland-Hodgman algorithm over raw (N, 2) coordinate
+arrays. Each clipping half-plane is applied to all vertices at once and many
+subject polygons can be clipped against the same convex polygon in a single
+batch. Subjects whose AABB do not touch the clip polygon are rejected and
+subjects that are completely inside it are accepted without clipping.
+"""
+
+import numpy as np
+
+from smallshapes import AABBAny, PathAny
+
+
+def clip_coords(subject, clip):
+    """
+    Clip the subject polygon by the convex clip polygon and return an (M, 2)
+    array with the vertices of the result.
+
+    Both arguments can be shapes, sequences of points or (N, 2) arrays. The
+    result is an empty array if polygons do not overlap.
+
+    Example:
+        >>> square = [(0, 0), (2, 0), (2, 2), (0, 2)]
+        >>> clip_coords(square, [(1, 1), (3, 1), (3, 3), (1, 3)]).tolist()
+        [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0]]
+    """
+
+    return clip_many([subject], clip)[0]
+
+
+def clip_many(subjects, clip):
+    """
+    Clip a sequence of subject polygons by the same convex clip polygon.
+
+    Return a list of (M, 2) arrays, one for each subject. Polygons that do not
+    overlap the clip polygon are returned as empty arrays.
+
+    Example:
+        >>> from smallshapes import AABB
+        >>> viewport = AABB(0, 10, 0, 10)
+        >>> tri1 = [(1, 1), (2, 1), (1, 2)]
+        >>> tri2 = [(20, 20), (21, 20), (20, 21)]
+        >>> [len(x) for x in clip_many([tri1, tri2], viewport)]
+        [3, 0]
+    """
+
+    polys = [_as_coords(x) for x in subjects]
+    if not polys:
+        return []
+    counts = np.array([len(x) for x in polys])
+    points = np.concatenate(polys) if counts.sum() else np.empty((0, 2))
+    edges = _clip_edges(_as_coords(clip))
+    size = len(polys)
+
+    # Early rejection and acceptance using the AABB of each subject. A subject
+    # is accepted if all corners of its AABB are inside the clip polygon.
+    nonempty = counts > 0
+    keep = np.zeros(size, dtype=bool)
+    accept = np.zeros(size, dtype=bool)
+    if nonempty.any():
+        starts = (np.cumsum(counts) - counts)[nonempty]
+        xmin = np.minimum.reduceat(points[:, 0], starts)
+        xmax = np.maximum.reduceat(points[:, 0], starts)
+        ymin = np.minimum.reduceat(points[:, 1], starts)
+        ymax = np.maximum.reduceat(points[:, 1], starts)
+        cxmin, cymin = edges[:, :2].min(axis=0)
+        cxmax, cymax = edges[:, :2].max(axis=0)
+        keep[nonempty] = ((xmin <= cxmax) & (cxmin <= xmax) &
+                          (ymin <= cymax) & (cymin <= ymax))
+        corners = np.stack([np.column_stack([xmin, ymin]),
+                            np.column_stack([xmax, ymin]),
+                            np.column_stack([xmax, ymax]),
+                            np.column_stack([xmin, ymax])], axis=1)
+        inside = np.ones(len(starts), dtype=bool)
+        for x0, y0, tx, ty in edges:
+            d = tx * (corners[..., 1] - y0) - ty * (corners[..., 0] - x0)
+            inside &= (d >= 0).all(axis=1)
+        accept[nonempty] = inside
+
+    out = [None] * size
+    for i in np.flatnonzero(accept).tolist():
+        out[i] = polys[i].copy()
+    for i in np.flatnonzero(~keep).tolist():
+        out[i] = np.empty((0, 2))
+
+    work = np.flatnonzero(keep & ~accept)
+    if len(work):
+        ids = np.repeat(np.arange(len(work)), counts[work])
+        pts = np.concatenate([polys[i] for i in work.tolist()])
+        pts, counts_out = _clip_batch(pts, ids, len(work), edges)
+        parts = np.split(pts, np.cumsum(counts_out)[:-1])
+        for i, part in zip(work.tolist(), parts):
+            out[i] = part
+    return out
+
+
+def _as_coords(obj):
+    """
+    Return an (N, 2) float array with the vertices of obj.
+    """
+
+    if isinstance(obj, PathAny):
+        return obj.array
+    elif isinstance(obj, AABBAny):
+        xmin, xmax, ymin, ymax = obj.rect_coords
+        return np.array([[xmin, ymin], [xmax, ymin],
+                         [xmax, ymax], [xmin, ymax]], dtype=float)
+    return np.asarray(obj, dtype=float).reshape(-1, 2)
+
+
+def _clip_edges(clip):
+    """
+    Return an (M, 4) array with rows (x0, y0, tx, ty) for each edge of the
+    clip polygon, where (x0, y0) is the start point and (tx, ty) the direction
+    of the edge. Edges are oriented counter-clockwise.
+    """
+
+    x, y = clip[:, 0], clip[:, 1]
+    if (x * np.roll(y, -1) - np.roll(x, -1) * y).sum() < 0:
+        clip = clip[::-1]
+    start = np.roll(clip, 1, axis=0)
+    return np.column_stack([start, clip - start])
+
+
+def _clip_batch(pts, ids, size, edges):
+    """
+    Sutherland-Hodgman kernel.
+
+    Clip the concatenated vertices of several polygons (ids gives the polygon
+    of each vertex) by every half-plane in edges. Return the clipped vertices
+    and the number of vertices of each polygon.
+    """
+
+    counts = np.bincount(ids, minlength=size)
+    for x0, y0, tx, ty in edges:
+        if not len(pts):
+            break
+
+        # Index of the previous vertex in the same polygon
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        prev = np.arange(len(pts)) - 1
+        nonempty = counts > 0
+        prev[starts[nonempty]] = ends[nonempty] - 1
+
+        # Signed distance (scaled) from each vertex to the edge. Points with
+        # d >= 0 are inside.
+        d = tx * (pts[:, 1] - y0) - ty * (pts[:, 0] - x0)
+        d_prev = d[prev]
+        cur_in = d >= 0
+        cross = cur_in != (d_prev >= 0)
+
+        # Each vertex emits the intersection with the edge (if the segment
+        # from the previous vertex crosses it) followed by the vertex itself
+        # (if it is inside).
+        candidates = np.empty((len(pts), 2, 2))
+        p_prev = pts[prev]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = d_prev / (d_prev - d)
+            candidates[:, 0] = p_prev + t[:, None] * (pts - p_prev)
+        candidates[:, 1] = pts
+        mask = np.column_stack([cross, cur_in])
+        pts = candidates[mask]
+        ids = np.repeat(ids, mask.sum(axis=1))
+        counts = np.bincount(ids, minlength=size)
+    return pts, counts
@@ -1,5 +1,5 @@
 from .base import SmallshapesBase, MathFunctionsMixin
 from .locatable import Locatable, mLocatable
 from .shape import Shape, mShape
-from .solid import Solid, mSolid
+from .solid import Solid, mSolid, MassProperties, combine_mass_properties
 from .convex import Convex, mConvex
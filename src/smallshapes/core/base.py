@@ -1,5 +1,5 @@
 from smallvectors import Flatable, MathFunctionsMixin as _MathFunctionsMixin, \
-    Object
+    Object, Vec
 from smallvectors.core.mutability import Mutable, Immutable
 from smallvectors.core.sequentiable import Sequentiable
 
@@ -29,7 +29,7 @@ class SmallshapesBase(Flatable, Sequentiable, MathFunctionsMixin, Object,
     Base class for all geometric objects in the smallshapes package.
     """
 
-    __slots__ = ()
+    __slots__ = ('__weakref__',)
 
     @property
     def __anytype__(self):
@@ -40,15 +40,21 @@ class SmallshapesBase(Flatable, Sequentiable, MathFunctionsMixin, Object,
                 return T
         raise AttributeError
 
+    def __reduce__(self):
+        # Vectors are stored as tuples since parametric Vec types cannot be
+        # pickled by reference.
+        args = tuple(tuple(x) if isinstance(x, Vec) else x for x in self)
+        return type(self), args
+
     def __setitem__(self, key, value):
         N = len(self)
         if isinstance(key, int):
-            if key > N:
+            if key >= N or key < -N:
                 raise IndexError(key)
             elif key >= 0:
                 self.__setitem_simple__(key, value)
             elif key < 0:
-                self.__setitem_simple__(N - key, value)
+                self.__setitem_simple__(N + key, value)
         elif isinstance(key, slice):
             indexes = range(*slice)
             if indexes[-1] > len(self):
@@ -133,6 +133,17 @@ class Shape(Locatable):
         tname = type(self).__name__
         raise TypeError('%r objects cannot be rescaled' % tname)
 
+    def support(self, direction):
+        """
+        Return the point of the shape that is farthest along the given
+        direction.
+
+        Support functions are used by the GJK and EPA algorithms and are only
+        meaningful for convex shapes.
+        """
+
+        raise NotImplementedError
+
     def distance_point(self, point):
         """
         Return the distance of object to the given point. Return 0 if they
@@ -157,11 +168,23 @@ class Shape(Locatable):
         if isinstance(other, (Vec, tuple)):
             return self.distance_point(other)
         elif isinstance(other, self._circle):
-            return self.distance_circle(other)
-        else:
-            t1 = type(self).__name__
-            t2 = type(other).__name__
-            raise TypeError('invalid distance test: %s vs %s' % (t1, t2))
+            try:
+                return self.distance_circle(other)
+            except NotImplementedError:
+                pass
+
+        # Generic distance between convex shapes that define support()
+        if isinstance(other, Shape):
+            from smallshapes.gjk import gjk_distance
+
+            try:
+                return gjk_distance(self, other)
+            except NotImplementedError:
+                pass
+
+        t1 = type(self).__name__
+        t2 = type(other).__name__
+        raise TypeError('invalid distance test: %s vs %s' % (t1, t2))
 
 
 class mShape(Shape, mLocatable, Mutable):
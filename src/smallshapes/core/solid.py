@@ -1,9 +1,94 @@
 from abc import abstractmethod
+from collections import namedtuple
+from math import sqrt
 
 from smallvectors import Vec
 from smallshapes.core import Shape, mShape
 
 
+class MassProperties(namedtuple('MassProperties',
+                                ['mass', 'area', 'pos', 'inertia'])):
+    """
+    Mass properties of a solid body.
+
+    Attributes:
+        mass:
+            Total mass, i.e., area times density.
+        area:
+            Surface area (always positive).
+        pos:
+            Center of mass.
+        inertia:
+            Moment of inertia with respect to the center of mass.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_ROG_sqr(cls, area, pos, ROG_sqr, density=1.0):
+        """
+        Create object from the area, center of mass and squared radius of
+        gyration of a solid.
+        """
+
+        area = abs(area)
+        mass = area * density
+        return cls(mass, area, pos, mass * ROG_sqr)
+
+    @property
+    def ROG_sqr(self):
+        """
+        Radius of gyration squared.
+        """
+
+        return self.inertia / self.mass if self.mass else 0.0
+
+    @property
+    def ROG(self):
+        """
+        Radius of gyration.
+        """
+
+        return sqrt(self.ROG_sqr)
+
+
+def combine_mass_properties(parts, density=1.0):
+    """
+    Return the MassProperties of a composite body.
+
+    Each part can be a solid (whose properties are computed with the given
+    density) or a MassProperties instance. The moment of inertia of each part
+    is translated to the common center of mass with the parallel axis
+    theorem.
+
+    Example:
+        >>> from smallshapes import AABB
+        >>> props = combine_mass_properties([AABB(0, 1, 0, 1), AABB(1, 2, 0, 1)])
+        >>> props.pos
+        Vec(1.0, 0.5)
+        >>> round(props.inertia, 6), AABB(0, 2, 0, 1).mass_properties().inertia
+        (0.833333, 0.8333333333333334)
+    """
+
+    props = [p if isinstance(p, MassProperties) else p.mass_properties(density)
+             for p in parts]
+    if not props:
+        raise ValueError('cannot combine an empty sequence of bodies')
+
+    mass = sum(p.mass for p in props)
+    area = sum(p.area for p in props)
+    weights = [p.mass for p in props] if mass else [p.area for p in props]
+    total = sum(weights) or 1.0
+    x = sum(w * p.pos[0] for w, p in zip(weights, props)) / total
+    y = sum(w * p.pos[1] for w, p in zip(weights, props)) / total
+
+    inertia = 0.0
+    for p in props:
+        dx, dy = p.pos[0] - x, p.pos[1] - y
+        inertia += p.inertia + p.mass * (dx * dx + dy * dy)
+    return MassProperties(mass, area, Vec(x, y), inertia)
+
+
 class Solid(Shape):
     """
     Solid is a closed shape with a definite interior area.
@@ -34,6 +119,15 @@ class Solid(Shape):
 
         return self._sqrt(self.ROG_sqr())
 
+    def mass_properties(self, density=1.0):
+        """
+        Return a :class:`MassProperties` tuple with the mass, area, center of
+        mass and moment of inertia of the solid with the given density.
+        """
+
+        return MassProperties.from_ROG_sqr(self.area(), self.pos,
+                                           self.ROG_sqr(), density)
+
     def contains_point(self, point):
         """
         Tests if the given point is completely contained by object.
@@ -0,0 +1,149 @@
+"""
+Convex decomposition of simple polygons.
+
+Polygons are triangulated (see :mod:`smallshapes.triangulation`) and the
+Hertel-Mehlhorn algorithm removes every diagonal whose removal leaves a
+convex piece. The number of pieces is at most 4 times the minimum.
+
+:class:`Compound` wraps the convex pieces of a shape so that concave
+polygons can be used with :func:`smallshapes.SAT.sat`.
+"""
+
+import numpy as np
+
+from smallshapes import AABB, ConvexPoly, PolyAny
+from smallshapes.triangulation import triangulate_coords
+
+
+def convex_decomposition(points):
+    """
+    Split a simple polygon into convex pieces and return a list of
+    ConvexPoly objects.
+
+    Example:
+        >>> L = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+        >>> parts = convex_decomposition(L)
+        >>> len(parts), sum(poly.area() for poly in parts)
+        (2, 3.0)
+    """
+
+    if isinstance(points, PolyAny):
+        points = points.array
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)
+    return [ConvexPoly.from_array(coords[piece])
+            for piece in convex_decomposition_indices(coords)]
+
+
+def convex_decomposition_indices(points):
+    """
+    Like :func:`convex_decomposition`, but return a list with the indices of
+    the vertices of each piece in counter-clockwise order.
+    """
+
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)
+    pts = [tuple(p) for p in coords.tolist()]
+    pieces = dict(enumerate(triangulate_coords(coords).tolist()))
+
+    # Owner of each directed edge. Diagonals appear in both directions.
+    owner = {}
+    for k, piece in pieces.items():
+        for edge in zip(piece, piece[1:] + piece[:1]):
+            owner[edge] = k
+
+    for a, b in list(owner):
+        p, q = owner.get((a, b)), owner.get((b, a))
+        if p is None or q is None or p == q:
+            continue
+        merged = _merge(pts, pieces[p], pieces[q], a, b)
+        if merged is None:
+            continue
+        pieces[p] = merged
+        del pieces[q]
+        del owner[a, b], owner[b, a]
+        for edge in zip(merged, merged[1:] + merged[:1]):
+            owner[edge] = p
+    return list(pieces.values())
+
+
+def _merge(pts, P, Q, a, b):
+    """
+    Merge pieces P (with edge a -> b) and Q (with edge b -> a) or return None
+    if the result is not convex.
+    """
+
+    i = P.index(b)
+    j = Q.index(a)
+    P = P[i:] + P[:i]
+    Q = Q[j:] + Q[:j]
+    if (_cross(pts[P[-2]], pts[a], pts[Q[1]]) < 0 or
+            _cross(pts[Q[-2]], pts[b], pts[P[1]]) < 0):
+        return None
+    return P + Q[1:-1]
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+class Compound:
+    """
+    A shape formed by several convex parts.
+
+    Compound objects are created from a sequence of convex shapes or from a
+    polygon, which is decomposed into convex pieces.
+
+    Example:
+        >>> from smallshapes import Poly
+        >>> L = Poly((0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2))
+        >>> shape = Compound(L)
+        >>> len(shape)
+        2
+        >>> shape.rect_coords
+        (0.0, 2.0, 0.0, 2.0)
+    """
+
+    __slots__ = ('parts', '_boxes')
+
+    def __init__(self, parts):
+        if isinstance(parts, PolyAny):
+            parts = parts.convex_parts()
+        self.parts = tuple(parts)
+        if not self.parts:
+            raise ValueError('compound shape must have at least one part')
+        self._boxes = np.array([part.rect_coords for part in self.parts],
+                               dtype=float)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, list(self.parts))
+
+    def __len__(self):
+        return len(self.parts)
+
+    def __iter__(self):
+        return iter(self.parts)
+
+    @property
+    def rect_coords(self):
+        boxes = self._boxes
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].max()),
+                float(boxes[:, 2].min()), float(boxes[:, 3].max()))
+
+    @property
+    def aabb(self):
+        return AABB(*self.rect_coords)
+
+    def area(self):
+        return sum(part.area() for part in self.parts)
+
+    def candidates(self, rect_coords):
+        """
+        Return the list of parts whose AABB overlap the given
+        (xmin, xmax, ymin, ymax) rectangle.
+        """
+
+        xmin, xmax, ymin, ymax = rect_coords
+        boxes = self._boxes
+        mask = ((boxes[:, 0] <= xmax) & (xmin <= boxes[:, 1]) &
+                (boxes[:, 2] <= ymax) & (ymin <= boxes[:, 3]))
+        parts = self.parts
+        return [parts[i] for i in np.flatnonzero(mask).tolist()]
@@ -1,7 +1,46 @@
-from generic import generic
+from generic import Generic
 
 
-@generic
+class BinaryGeneric(Generic):
+    """
+    A generic function of two arguments.
+
+    Calls look up the implementation in a dictionary keyed by
+    (type(A), type(B)). The full dispatch algorithm only runs in the first
+    call for each pair of types, or not at all if the table was precompiled
+    with :meth:`precompile`.
+    """
+
+    def __call__(self, A, B):
+        try:
+            func = self._cache[type(A), type(B)]
+        except KeyError:
+            func = self.dispatch(type(A), type(B))
+        return func(A, B)
+
+    def precompile(self, types):
+        """
+        Fill the dispatch table with all pairs of the given types.
+        """
+
+        for TA in types:
+            for TB in types:
+                if (TA, TB) not in self._cache:
+                    self.dispatch(TA, TB)
+
+
+def binary_generic(func):
+    """
+    Decorator that creates a BinaryGeneric. The decorated function is the
+    fallback implementation.
+    """
+
+    result = BinaryGeneric(func.__name__)
+    result.overload(func)
+    return result
+
+
+@binary_generic
 def distance(A, B):
     """
     Return the distance of two objects.
@@ -12,28 +51,53 @@ def distance(A, B):
     raise NotImplementedError
 
 
-@generic
+@binary_generic
 def contain(A, B):
     """
     Return True if A completely contains B.
+
+    Paths and segments have no interior and can only contain other paths or
+    segments.
     """
 
     raise NotImplementedError
 
 
-@generic
+@binary_generic
 def intercept_center(A, B):
     """
     Return the center point of the intercept between A and B.
+
+    This is the center of mass of the common area. If the intercept has no
+    area (e.g., shapes only touch each other or one of them is a path), it is
+    the center of the common line segments or points. Return None if A and B
+    do not intercept.
     """
 
     raise NotImplementedError
 
 
-@generic
+@binary_generic
+def intersects(A, B):
+    """
+    Return True if A and B have at least one common point.
+
+    Solid shapes include their interior and shapes that only touch at the
+    border are considered to intersect. This is much cheaper than computing
+    the penetration vector.
+    """
+
+    raise NotImplementedError
+
+
+@binary_generic
 def penetration(A, B):
     """
     Return the penetration between A and B.
+
+    The minimum penetration vector points from A to B and its norm is the
+    penetration depth, as in :func:`smallshapes.SAT.sat`. Return None if
+    shapes do not overlap.
     """
 
     raise NotImplementedError
@@ -0,0 +1,256 @@
+"""
+Gilbert-Johnson-Keerthi (GJK) distance algorithm and the Expanding Polytope
+Algorithm (EPA).
+
+Both algorithms work on the Minkowski difference A - B of two convex shapes
+and only need a ``support(direction)`` method that returns the point of the
+shape that is farthest along the given direction. Differently from SAT, the
+cost per iteration does not depend on the number of vertices of a polygon.
+"""
+
+from smallvectors import Vec
+
+#: Maximum number of iterations of GJK and EPA.
+MAX_ITERATIONS = 64
+
+#: Relative tolerance used in the termination tests.
+TOLERANCE = 1e-10
+
+
+def _support(A, B, dx, dy):
+    """
+    Return (w, a, b) where a is the support point of A in the direction d,
+    b is the support point of B in the direction -d and w = a - b is the
+    support of the Minkowski difference.
+    """
+
+    ax, ay = A.support(Vec(dx, dy))
+    bx, by = B.support(Vec(-dx, -dy))
+    return (ax - bx, ay - by), (ax, ay), (bx, by)
+
+
+def _closest_on_segment(p, q):
+    """
+    Return the barycentric coordinate t of the point of the segment p + t(q-p)
+    closest to the origin.
+    """
+
+    px, py = p
+    dx, dy = q[0] - px, q[1] - py
+    length_sqr = dx * dx + dy * dy
+    if length_sqr == 0:
+        return 0.0
+    t = -(px * dx + py * dy) / length_sqr
+    return min(max(t, 0.0), 1.0)
+
+
+def _reduce_simplex(simplex):
+    """
+    Return the closest point of the simplex to the origin, its barycentric
+    weights and the reduced simplex. The simplex is a list of
+    (w, a, b) tuples.
+
+    Return None as the closest point if the origin is inside a triangle.
+    """
+
+    if len(simplex) == 1:
+        return simplex[0][0], [1.0], simplex
+
+    if len(simplex) == 2:
+        p, q = simplex[0][0], simplex[1][0]
+        t = _closest_on_segment(p, q)
+        if t == 0.0:
+            return p, [1.0], simplex[:1]
+        elif t == 1.0:
+            return q, [1.0], simplex[1:]
+        point = (p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1]))
+        return point, [1 - t, t], simplex
+
+    # Triangle: check if origin is inside using the signs of the areas of
+    # the sub-triangles.
+    (x0, y0), (x1, y1), (x2, y2) = (w for w, _, _ in simplex)
+    d0 = x1 * y2 - x2 * y1
+    d1 = x2 * y0 - x0 * y2
+    d2 = x0 * y1 - x1 * y0
+    if (d0 >= 0 and d1 >= 0 and d2 >= 0) or (d0 <= 0 and d1 <= 0 and d2 <= 0):
+        return None, None, simplex
+
+    # Otherwise, the closest point is on one of the edges.
+    best = None
+    for i, j in ((0, 1), (1, 2), (2, 0)):
+        point, weights, sub = _reduce_simplex([simplex[i], simplex[j]])
+        dist = point[0] * point[0] + point[1] * point[1]
+        if best is None or dist < best[0]:
+            best = (dist, point, weights, sub)
+    return best[1:]
+
+
+def gjk(A, B):
+    """
+    Run the GJK algorithm and return a tuple (distance, point_a, point_b,
+    simplex).
+
+    If the shapes overlap, distance is zero, both points are None and
+    simplex is a list of Minkowski difference points (w, a, b) that contains
+    the origin. Otherwise point_a and point_b are the closest points
+    between A and B.
+    """
+
+    # Initial direction: from B to A. The search direction is always the
+    # point of the simplex closest to the origin.
+    ax, ay = A.pos
+    bx, by = B.pos
+    dx, dy = ax - bx, ay - by
+    if dx == 0 and dy == 0:
+        dx = 1.0
+    simplex = [_support(A, B, -dx, -dy)]
+    v, weights, simplex = _reduce_simplex(simplex)
+
+    for _ in range(MAX_ITERATIONS):
+        vx, vy = v
+        v_sqr = vx * vx + vy * vy
+        if v_sqr <= TOLERANCE * TOLERANCE:
+            return 0.0, None, None, simplex
+
+        new = _support(A, B, -vx, -vy)
+        (wx, wy), _, _ = new
+        if v_sqr - (vx * wx + vy * wy) <= TOLERANCE * v_sqr:
+            break
+        if any(new[0] == old[0] for old in simplex):
+            break
+
+        simplex = simplex + [new]
+        v, weights, simplex = _reduce_simplex(simplex)
+        if v is None:
+            return 0.0, None, None, simplex
+
+    point_a = Vec(sum(l * a[0] for l, (_, a, _) in zip(weights, simplex)),
+                  sum(l * a[1] for l, (_, a, _) in zip(weights, simplex)))
+    point_b = Vec(sum(l * b[0] for l, (_, _, b) in zip(weights, simplex)),
+                  sum(l * b[1] for l, (_, _, b) in zip(weights, simplex)))
+    vx, vy = v
+    return (vx * vx + vy * vy) ** 0.5, point_a, point_b, simplex
+
+
+def gjk_distance(A, B):
+    """
+    Return the distance between two convex shapes. Return 0.0 if they
+    intercept.
+
+    Example:
+        >>> from smallshapes import AABB
+        >>> gjk_distance(AABB(0, 1, 0, 1), AABB(3, 4, 0, 1))
+        2.0
+    """
+
+    return gjk(A, B)[0]
+
+
+def gjk_closest_points(A, B):
+    """
+    Return the pair of closest points (point_a, point_b) between A and B.
+
+    Return None if shapes intercept.
+    """
+
+    distance, point_a, point_b, _ = gjk(A, B)
+    if point_a is None:
+        return None
+    return point_a, point_b
+
+
+def gjk_intersects(A, B):
+    """
+    Return True if convex shapes A and B intercept.
+    """
+
+    return gjk(A, B)[1] is None
+
+
+def epa(A, B):
+    """
+    Return the minimum penetration vector between A and B or None if they do
+    not intercept.
+
+    The result follows the same convention as :func:`smallshapes.SAT.sat`:
+    it points from A to B and its norm is the penetration depth.
+
+    Example:
+        >>> from smallshapes import AABB
+        >>> vec = epa(AABB(4, 9, 1, 6), AABB(0, 5, 0, 5))
+        >>> vec.x, vec.norm()
+        (-1.0, 1.0)
+    """
+
+    distance, _, _, simplex = gjk(A, B)
+    if distance > 0:
+        return None
+
+    polytope = _initial_polytope(A, B, [w for w, _, _ in simplex])
+    if polytope is None:
+        return Vec(0.0, 0.0)
+
+    for _ in range(MAX_ITERATIONS):
+        # Find the edge closest to the origin
+        best = None
+        size = len(polytope)
+        for i in range(size):
+            (x0, y0), (x1, y1) = polytope[i], polytope[(i + 1) % size]
+            ex, ey = x1 - x0, y1 - y0
+            norm = (ex * ex + ey * ey) ** 0.5
+            if norm == 0:
+                continue
+            nx, ny = ey / norm, -ex / norm
+            dist = nx * x0 + ny * y0
+            if best is None or dist < best[0]:
+                best = (dist, i, nx, ny)
+
+        dist, i, nx, ny = best
+        w, _, _ = _support(A, B, nx, ny)
+        support_dist = nx * w[0] + ny * w[1]
+        if support_dist - dist <= TOLERANCE * max(1.0, abs(dist)):
+            break
+        polytope.insert(i + 1, w)
+
+    return Vec(nx * dist, ny * dist)
+
+
+def _initial_polytope(A, B, points):
+    """
+    Return a counter-clockwise triangle of Minkowski difference points that
+    contains the origin, starting from the GJK simplex.
+
+    Return None if the Minkowski difference is degenerate (e.g., it has zero
+    area) and the shapes only touch each other.
+    """
+
+    if len(points) == 1:
+        w = points[0]
+        if w[0] or w[1]:
+            points = [w, _support(A, B, -w[0], -w[1])[0]]
+        else:
+            points = [_support(A, B, 1.0, 0.0)[0],
+                      _support(A, B, -1.0, 0.0)[0]]
+
+    if len(points) == 2:
+        (x0, y0), (x1, y1) = points
+        nx, ny = y0 - y1, x1 - x0
+        if nx == 0 and ny == 0:
+            return None
+        p = _support(A, B, nx, ny)[0]
+        q = _support(A, B, -nx, -ny)[0]
+        for candidate in ([points[0], points[1], p], [points[0], points[1], q]):
+            _, weights, _ = _reduce_simplex([(w, w, w) for w in candidate])
+            if weights is None:
+                points = candidate
+                break
+        else:
+            return None
+
+    (x0, y0), (x1, y1), (x2, y2) = points
+    area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+    if area == 0:
+        return None
+    elif area < 0:
+        points = points[::-1]
+    return list(points)
@@ -0,0 +1,285 @@
+"""
+Convex hull engine.
+
+Three modes are supported:
+
+* batch: :func:`hull` and :func:`hull_coords` compute the hull of an array of
+  points. Points strictly inside a polygon formed by extreme points along a
+  few fixed directions are discarded with NumPy (Akl-Toussaint heuristic)
+  and Andrew's monotone chain runs on the remaining points.
+* incremental: :class:`IncrementalHull` accepts points as they stream in.
+* merge: :func:`merge_hulls` combines existing hulls.
+
+Hulls are returned as counter-clockwise :class:`ConvexPoly` objects, starting
+from the lexicographically smallest vertex. Collinear points are removed.
+"""
+
+from math import cos, pi, sin
+
+import numpy as np
+
+from smallshapes import ConvexPoly, ConvexPolyAny
+
+#: Number of directions used to find the extreme points in the prefilter.
+PREFILTER_DIRECTIONS = 16
+
+_DIRECTIONS = np.array([(cos(2 * pi * i / PREFILTER_DIRECTIONS),
+                         sin(2 * pi * i / PREFILTER_DIRECTIONS))
+                        for i in range(PREFILTER_DIRECTIONS)])
+
+
+def hull(points):
+    """
+    Return the convex hull of the given points as a ConvexPoly.
+
+    Raises a ValueError if the hull has less than 3 vertices (i.e., if all
+    points are collinear).
+
+    Example:
+        >>> hull([(0, 0), (1, 1), (1, 0), (0, 1), (0.5, 0.5)])
+        ConvexPoly(Vec(0.0, 0.0), Vec(1.0, 0.0), Vec(1.0, 1.0), Vec(0.0, 1.0))
+    """
+
+    return _as_poly(hull_coords(points))
+
+
+def hull_coords(points):
+    """
+    Return an (M, 2) array with the vertices of the convex hull of the given
+    sequence of points or (N, 2) array.
+
+    Degenerate inputs return hulls with less than 3 vertices.
+    """
+
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(pts) > 4 * PREFILTER_DIRECTIONS:
+        pts = pts[~_strictly_inside(pts, _extreme_polygon(pts))]
+    pts = np.unique(pts, axis=0)
+    return np.array(_monotone_chain(pts.tolist()), dtype=float).reshape(-1, 2)
+
+
+def merge_hulls(*hulls):
+    """
+    Return the convex hull of the union of several convex polygons.
+
+    Arguments can be ConvexPoly objects, IncrementalHull objects or arrays of
+    vertices.
+
+    Example:
+        >>> A = hull([(0, 0), (1, 0), (0, 1)])
+        >>> B = hull([(2, 2), (3, 2), (2, 3)])
+        >>> merge_hulls(A, B)
+        ConvexPoly(Vec(0.0, 0.0), Vec(1.0, 0.0), Vec(3.0, 2.0), Vec(2.0, 3.0), Vec(0.0, 1.0))
+    """
+
+    parts = [_vertices(h) for h in hulls]
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        raise ValueError('no points to merge')
+    return hull(np.concatenate(parts))
+
+
+class IncrementalHull:
+    """
+    Convex hull that is updated as new points arrive.
+
+    Points inside the current hull are detected in O(log h) and discarded.
+    Points outside the hull replace the vertices that they can see.
+
+    Example:
+        >>> h = IncrementalHull([(0, 0), (1, 0), (0, 1)])
+        >>> h.add((0.2, 0.2))
+        False
+        >>> h.add((1, 1))
+        True
+        >>> h.hull
+        ConvexPoly(Vec(0.0, 0.0), Vec(1.0, 0.0), Vec(1.0, 1.0), Vec(0.0, 1.0))
+    """
+
+    def __init__(self, points=()):
+        self._hull = []
+        self.extend(points)
+
+    def __len__(self):
+        return len(self._hull)
+
+    def __contains__(self, point):
+        x, y = point
+        return self._locate(float(x), float(y)) >= 0
+
+    @property
+    def coords(self):
+        """
+        An (M, 2) array with the current hull vertices in counter-clockwise
+        order.
+        """
+
+        verts = self._hull
+        if not verts:
+            return np.empty((0, 2))
+        start = verts.index(min(verts))
+        return np.array(verts[start:] + verts[:start], dtype=float)
+
+    @property
+    def hull(self):
+        """
+        The current hull as a ConvexPoly.
+        """
+
+        return _as_poly(self.coords)
+
+    def add(self, point):
+        """
+        Add a single point and return True if the hull has changed.
+        """
+
+        x, y = point
+        p = (float(x), float(y))
+        verts = self._hull
+        if len(verts) < 3:
+            new = _monotone_chain(sorted(set(verts + [p])))
+            changed = new != verts
+            self._hull = new
+            return changed
+        if self._locate(*p) >= 0:
+            return False
+
+        # Edges i -> i + 1 that can be seen from p form a contiguous chain.
+        # Rotate the hull so that the chain does not wrap around.
+        n = len(verts)
+        visible = [_cross(verts[i], verts[(i + 1) % n], p) <= 0
+                   for i in range(n)]
+        k = visible.index(False)
+        verts = verts[k + 1:] + verts[:k + 1]
+        visible = visible[k + 1:] + visible[:k + 1]
+        first = visible.index(True)
+        last = n - 1 - visible[::-1].index(True)
+        self._hull = verts[:first + 1] + [p] + verts[last + 1:]
+        return True
+
+    def extend(self, points):
+        """
+        Add a sequence of points or an (N, 2) array.
+
+        Points inside the current hull are discarded in a single vectorized
+        step and the hull is rebuilt with the batch algorithm.
+        """
+
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        if not len(pts):
+            return
+        if len(self._hull) >= 3:
+            pts = pts[~_strictly_inside(pts, self._hull)]
+            if not len(pts):
+                return
+            pts = np.concatenate([np.array(self._hull), pts])
+        elif self._hull:
+            pts = np.concatenate([np.array(self._hull), pts])
+        self._hull = [tuple(p) for p in hull_coords(pts).tolist()]
+
+    def _locate(self, x, y):
+        """
+        Return 1 if point is strictly inside hull, 0 if it is on the boundary
+        and -1 if it is outside.
+        """
+
+        verts = self._hull
+        n = len(verts)
+        if n < 3:
+            return 0 if (x, y) in verts else -1
+
+        # Binary search for the wedge from vertex 0 that contains the point
+        p0 = verts[0]
+        p = (x, y)
+        if _cross(p0, verts[1], p) < 0 or _cross(p0, verts[-1], p) > 0:
+            return -1
+        lo, hi = 1, n - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _cross(p0, verts[mid], p) >= 0:
+                lo = mid
+            else:
+                hi = mid
+        side = _cross(verts[lo], verts[hi], p)
+        if side < 0:
+            return -1
+        if side == 0:
+            return 0
+        if (_cross(p0, verts[1], p) == 0 or
+                _cross(p0, verts[-1], p) == 0):
+            return 0
+        return 1
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _monotone_chain(points):
+    """
+    Andrew's monotone chain over a lexicographically sorted list of unique
+    points.
+    """
+
+    if len(points) <= 2:
+        return [tuple(p) for p in points]
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return [tuple(p) for p in lower[:-1] + upper[:-1]]
+
+
+def _extreme_polygon(pts):
+    """
+    Return the convex polygon formed by the extreme points of pts along
+    PREFILTER_DIRECTIONS directions in counter-clockwise order.
+    """
+
+    idx = np.argmax(pts @ _DIRECTIONS.T, axis=0)
+    out = []
+    for i in idx.tolist():
+        p = tuple(pts[i].tolist())
+        if not out or out[-1] != p:
+            out.append(p)
+    if len(out) > 1 and out[0] == out[-1]:
+        out.pop()
+    return out
+
+
+def _strictly_inside(pts, polygon):
+    """
+    Return a boolean mask with the points that are strictly inside the
+    counter-clockwise convex polygon.
+    """
+
+    mask = np.ones(len(pts), dtype=bool)
+    if len(polygon) < 3:
+        return ~mask
+    x, y = pts[:, 0], pts[:, 1]
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        mask &= (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0) > 0
+        x0, y0 = x1, y1
+    return mask
+
+
+def _vertices(obj):
+    if isinstance(obj, IncrementalHull):
+        return obj.coords
+    elif isinstance(obj, ConvexPolyAny):
+        return obj.array
+    return np.asarray(obj, dtype=float).reshape(-1, 2)
+
+
+def _as_poly(coords):
+    if len(coords) < 3:
+        raise ValueError('degenerate hull with %s vertices' % len(coords))
+    return ConvexPoly.from_array(coords)
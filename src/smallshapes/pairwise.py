@@ -0,0 +1,879 @@
+"""
+Implementations of the generic functions declared in
+:mod:`smallshapes.functions` for each pair of shapes.
+
+This module is imported by the package and only registers methods. Shapes
+are grouped in a few families:
+
+* circles;
+* convex point sets: AABBs, segments and convex polygons;
+* simple polygons (solid, possibly concave);
+* paths and circuits (only the line segments, no interior).
+
+Each method first compares the bounding boxes (Shape.rect_coords) and the
+bounding circles (Shape.cbb) of both shapes and only runs the exact test if
+they overlap. Concave polygons are handled by their convex parts (see
+PolyAny.convex_parts()).
+"""
+
+from itertools import combinations_with_replacement
+from math import acos, atan2, pi, sin, sqrt
+
+from smallvectors import Vec
+
+from smallshapes import AABBAny, CircleAny, ConvexPolyAny, PathAny, \
+    PolyAny, Segment, SegmentAny, Solid
+from smallshapes.functions import contain, distance, intercept_center, \
+    intersects, penetration
+from smallshapes.path_utils import _segment_distance_sqr, poly_moments
+from smallshapes.sweep import box_pairs, segment_boxes, \
+    segment_intersection, segments_intersect
+
+#: Tolerance used to decide if a point lies on the boundary of a shape
+#: (relative to the magnitude of the coordinates).
+TOLERANCE = 1e-9
+
+
+#
+# Bounding volumes
+#
+def _boxes_overlap(A, B):
+    axmin, axmax, aymin, aymax = A.rect_coords
+    bxmin, bxmax, bymin, bymax = B.rect_coords
+    return (axmin <= bxmax and bxmin <= axmax and
+            aymin <= bymax and bymin <= aymax)
+
+
+def _cbb(A):
+    if isinstance(A, CircleAny):
+        return A._x, A._y, A._radius
+    x, y = A.pos
+    return x, y, A.cbb_radius
+
+
+def _bounding_volumes_overlap(A, B):
+    if not _boxes_overlap(A, B):
+        return False
+    ax, ay, ar = _cbb(A)
+    bx, by, br = _cbb(B)
+    dx, dy, r = bx - ax, by - ay, ar + br
+    return dx * dx + dy * dy <= r * r
+
+
+#
+# Conversions
+#
+def _points(A):
+    # List of (x, y) vertices of a convex point set
+    if isinstance(A, AABBAny):
+        xmin, xmax, ymin, ymax = A.rect_coords
+        return [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]
+    elif isinstance(A, SegmentAny):
+        (x0, y0), (x1, y1) = A._start, A._end
+        return [(x0, y0), (x1, y1)]
+    data = A._tolist()
+    return list(zip(data[::2], data[1::2]))
+
+
+def _any_point(A):
+    # A point that belongs to A
+    if isinstance(A, CircleAny):
+        return A._x, A._y
+    elif isinstance(A, AABBAny):
+        return A.xmin, A.ymin
+    elif isinstance(A, SegmentAny):
+        return tuple(A._start)
+    data = A._tolist()
+    return data[0], data[1]
+
+
+def _edges_of(A):
+    # List of (x0, y0, x1, y1) line segments of A. For AABBs and segments,
+    # this is the same as A._edges() for paths.
+    if isinstance(A, (AABBAny, SegmentAny)):
+        pts = _points(A)
+        if len(pts) == 2:
+            return [pts[0] + pts[1]]
+        return [p + q for p, q in zip(pts, pts[1:] + pts[:1])]
+    return list(A._edges())
+
+
+def _convex_parts(A):
+    # Convex parts of solids. Only concave polygons are decomposed.
+    if isinstance(A, PolyAny) and not isinstance(A, ConvexPolyAny):
+        return A.convex_parts()
+    return A,
+
+
+def _convex_pieces(A):
+    # Like _convex_parts(), but paths are decomposed into segments
+    if isinstance(A, PathAny) and not isinstance(A, PolyAny):
+        return [Segment((x0, y0), (x1, y1))
+                for x0, y0, x1, y1 in A._edges()]
+    return _convex_parts(A)
+
+
+def _orientation_sign(pts):
+    # Sign of the signed area of the polygon: +1 for counter-clockwise
+    x0, y0 = pts[-1]
+    area = 0.0
+    for x1, y1 in pts:
+        area += x0 * y1 - x1 * y0
+        x0, y0 = x1, y1
+    return -1 if area < 0 else 1
+
+
+#
+# Kernels
+#
+def _convex_sets_intersect(P, Q):
+    """
+    Separating axis test between two convex point sets given as lists of
+    (x, y) tuples. Sets with two points are line segments.
+
+    Returns on the first separating axis.
+    """
+
+    for pts in (P, Q):
+        axes = []
+        x0, y0 = pts[-1]
+        for x1, y1 in pts:
+            axes.append((y1 - y0, x0 - x1))
+            x0, y0 = x1, y1
+        if len(pts) == 2:
+            (x0, y0), (x1, y1) = pts
+            axes.append((x1 - x0, y1 - y0))
+
+        for nx, ny in axes:
+            if not (nx or ny):
+                continue
+            a = [x * nx + y * ny for x, y in P]
+            b = [x * nx + y * ny for x, y in Q]
+            if max(a) < min(b) or max(b) < min(a):
+                return False
+    return True
+
+
+def _circle_points_intersect(x, y, r, pts):
+    """
+    Test if circle intersects the convex point set.
+    """
+
+    r2 = r * r
+    if len(pts) == 2:
+        (x0, y0), (x1, y1) = pts
+        return _segment_distance_sqr(x, y, x0, y0, x1, y1) <= r2
+
+    positive = negative = False
+    x0, y0 = pts[-1]
+    for x1, y1 in pts:
+        if _segment_distance_sqr(x, y, x0, y0, x1, y1) <= r2:
+            return True
+        cross = (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0)
+        if cross > 0:
+            positive = True
+        elif cross < 0:
+            negative = True
+        x0, y0 = x1, y1
+
+    # The center is inside if it is in the same side of all edges
+    return not (positive and negative)
+
+
+def _convex_covers(pts, x, y):
+    """
+    Test if point is inside the closed convex polygon.
+    """
+
+    positive = negative = False
+    x0, y0 = pts[-1]
+    for x1, y1 in pts:
+        cross = (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0)
+        if cross > 0:
+            positive = True
+        elif cross < 0:
+            negative = True
+        x0, y0 = x1, y1
+    return not (positive and negative)
+
+
+def _near_edges(edges, x, y):
+    """
+    Test if point lies on any of the given line segments up to TOLERANCE.
+    """
+
+    tol = TOLERANCE * (1.0 + abs(x) + abs(y))
+    tol *= tol
+    return any(_segment_distance_sqr(x, y, *edge) <= tol for edge in edges)
+
+
+def _edge_sets_intersect(edges_a, edges_b):
+    """
+    Test if any segment in edges_a intersects any segment of edges_b.
+    """
+
+    edges = edges_a + edges_b
+    groups = [0] * len(edges_a) + [1] * len(edges_b)
+    for i, j in box_pairs(segment_boxes(edges), groups):
+        if segments_intersect(edges[i], edges[j]):
+            return True
+    return False
+
+
+def _edge_intersects(edge, B):
+    """
+    Test if the (x0, y0, x1, y1) segment intersects a circle or a convex
+    point set.
+    """
+
+    x0, y0, x1, y1 = edge
+    if isinstance(B, CircleAny):
+        r = B._radius
+        return _segment_distance_sqr(B._x, B._y, x0, y0, x1, y1) <= r * r
+
+    xmin, xmax, ymin, ymax = B.rect_coords
+    if (max(x0, x1) < xmin or xmax < min(x0, x1) or
+            max(y0, y1) < ymin or ymax < min(y0, y1)):
+        return False
+    return _convex_sets_intersect([(x0, y0), (x1, y1)], _points(B))
+
+
+def _edges_distance(edges_a, edges_b):
+    """
+    Distance between two sets of line segments that do not intersect each
+    other.
+
+    The closest points between two disjoint segments always include an
+    endpoint of one of them.
+    """
+
+    best = float('inf')
+    for edges, others in ((edges_a, edges_b), (edges_b, edges_a)):
+        for x0, y0, x1, y1 in edges:
+            for edge in others:
+                best = min(best,
+                           _segment_distance_sqr(x0, y0, *edge),
+                           _segment_distance_sqr(x1, y1, *edge))
+    return sqrt(best)
+
+
+def _edges_covered(covers, edges, boundary):
+    """
+    Test if covers(x, y) is True for all points in the given edges.
+
+    Each edge is split at the points in which it touches the line segments
+    in boundary. The predicate is only evaluated at the endpoints and at the
+    midpoint of each piece.
+    """
+
+    size = len(edges)
+    splits = [[] for _ in edges]
+    items = edges + boundary
+    groups = [0] * size + [1] * len(boundary)
+    for i, j in box_pairs(segment_boxes(items), groups):
+        if i > j:
+            i, j = j, i
+        splits[i].extend(segment_intersection(items[i], items[j])[0])
+
+    for (x0, y0, x1, y1), points in zip(edges, splits):
+        dx, dy = x1 - x0, y1 - y0
+        length_sqr = dx * dx + dy * dy
+        params = {0.0, 1.0}
+        if length_sqr:
+            params.update(((x - x0) * dx + (y - y0) * dy) / length_sqr
+                          for x, y in points)
+        params = sorted(params)
+        params.extend((a + b) / 2 for a, b in zip(params, params[1:]))
+        if not all(covers(x0 + t * dx, y0 + t * dy) for t in params):
+            return False
+    return True
+
+
+def _clip_edge_circle(edge, x, y, r):
+    """
+    Return a list with the part of the edge inside the circle.
+    """
+
+    x0, y0, x1, y1 = edge
+    dx, dy = x1 - x0, y1 - y0
+    fx, fy = x0 - x, y0 - y
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    c = fx * fx + fy * fy - r * r
+    if a == 0:
+        return [edge] if c <= 0 else []
+    delta = b * b - a * c
+    if delta < 0:
+        return []
+    delta = sqrt(delta)
+    t0, t1 = max((-b - delta) / a, 0.0), min((-b + delta) / a, 1.0)
+    if t0 > t1:
+        return []
+    return [(x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy)]
+
+
+def _clip_edge_convex(edge, pts):
+    """
+    Return a list with the part of the edge inside the convex polygon
+    (Cyrus-Beck algorithm).
+    """
+
+    x0, y0, x1, y1 = edge
+    dx, dy = x1 - x0, y1 - y0
+    sign = _orientation_sign(pts)
+    t0, t1 = 0.0, 1.0
+    ax, ay = pts[-1]
+    for bx, by in pts:
+        ex, ey = bx - ax, by - ay
+        value = sign * (ex * (y0 - ay) - ey * (x0 - ax))
+        rate = sign * (ex * dy - ey * dx)
+        if rate == 0:
+            if value < 0:
+                return []
+        elif rate > 0:
+            t0 = max(t0, -value / rate)
+        else:
+            t1 = min(t1, -value / rate)
+        if t0 > t1:
+            return []
+        ax, ay = bx, by
+    return [(x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy)]
+
+
+def _clip_edge(edge, B):
+    """
+    Return a list with the parts of the edge inside the solid B.
+    """
+
+    if isinstance(B, CircleAny):
+        return _clip_edge_circle(edge, B._x, B._y, B._radius)
+    pieces = []
+    for part in _convex_parts(B):
+        pieces.extend(_clip_edge_convex(edge, _points(part)))
+    return pieces
+
+
+def _edge_overlap(a, b):
+    """
+    Return the common part of segments a and b as a (x0, y0, x1, y1) tuple
+    or None if they do not intersect. Segments that cross each other have a
+    single common point.
+    """
+
+    if not segments_intersect(a, b):
+        return None
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    dx, dy = ax1 - ax0, ay1 - ay0
+    ex, ey = bx1 - bx0, by1 - by0
+    cross = dx * ey - dy * ex
+    if cross:
+        t = ((bx0 - ax0) * ey - (by0 - ay0) * ex) / cross
+        x, y = ax0 + t * dx, ay0 + t * dy
+        return x, y, x, y
+
+    # Collinear segments: project b into a
+    length_sqr = dx * dx + dy * dy
+    if not length_sqr:
+        return ax0, ay0, ax0, ay0
+    s0 = ((bx0 - ax0) * dx + (by0 - ay0) * dy) / length_sqr
+    s1 = ((bx1 - ax0) * dx + (by1 - ay0) * dy) / length_sqr
+    t0, t1 = max(min(s0, s1), 0.0), min(max(s0, s1), 1.0)
+    return ax0 + t0 * dx, ay0 + t0 * dy, ax0 + t1 * dx, ay0 + t1 * dy
+
+
+def _edge_set_overlaps(edges_a, edges_b):
+    """
+    Return a list with the common parts of segments in edges_a and edges_b.
+    """
+
+    edges = edges_a + edges_b
+    groups = [0] * len(edges_a) + [1] * len(edges_b)
+    pieces = []
+    for i, j in box_pairs(segment_boxes(edges), groups):
+        piece = _edge_overlap(edges[i], edges[j])
+        if piece is not None:
+            pieces.append(piece)
+    return pieces
+
+
+def _pieces_center(pieces):
+    """
+    Center of mass of a list of line segments, weighted by their lengths.
+
+    If all segments are degenerate, return the average point.
+    """
+
+    if not pieces:
+        return None
+    total = sx = sy = 0.0
+    for x0, y0, x1, y1 in pieces:
+        length = sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+        total += length
+        sx += length * (x0 + x1)
+        sy += length * (y0 + y1)
+    if total:
+        return Vec(sx / (2 * total), sy / (2 * total))
+    n = 2 * len(pieces)
+    return Vec(sum(p[0] + p[2] for p in pieces) / n,
+               sum(p[1] + p[3] for p in pieces) / n)
+
+
+def _lens(A, B):
+    """
+    Return the tuple (area, x, y) with the area and center of mass of the
+    intersection of two circles.
+    """
+
+    x1, y1, r1 = A._x, A._y, A._radius
+    x2, y2, r2 = B._x, B._y, B._radius
+    dx, dy = x2 - x1, y2 - y1
+    d = sqrt(dx * dx + dy * dy)
+    if d <= abs(r1 - r2):
+        x, y, r = (x1, y1, r1) if r1 <= r2 else (x2, y2, r2)
+        return pi * r * r, x, y
+
+    # Each circle contributes with the circular segment beyond the common
+    # chord. Segment centroids are measured from the center of A along the
+    # line joining both centers.
+    a = (d * d + r1 * r1 - r2 * r2) / (2 * d)
+    theta1 = acos(max(-1.0, min(1.0, a / r1)))
+    theta2 = acos(max(-1.0, min(1.0, (d - a) / r2)))
+    area1 = r1 * r1 * (2 * theta1 - sin(2 * theta1)) / 2
+    area2 = r2 * r2 * (2 * theta2 - sin(2 * theta2)) / 2
+    area = area1 + area2
+    if area <= 0:
+        return 0.0, x1 + dx * r1 / d, y1 + dy * r1 / d
+    moment = (2 * r1 ** 3 * sin(theta1) ** 3 / 3 +
+              area2 * d - 2 * r2 ** 3 * sin(theta2) ** 3 / 3)
+    s = moment / (area * d)
+    return area, x1 + s * dx, y1 + s * dy
+
+
+def _circle_polygon_moments(x, y, r, pts):
+    """
+    Return the tuple (area, x, y) with the area and center of mass of the
+    intersection of a circle with a simple polygon.
+
+    The polygon is decomposed in the triangles formed by the center of the
+    circle with each edge. Edges are split at the circle boundary: pieces
+    inside the circle contribute with a triangle and pieces outside with a
+    circular sector.
+    """
+
+    if not r:
+        return 0.0, x, y
+    r2 = r * r
+    area = mx = my = 0.0
+    ax, ay = pts[-1][0] - x, pts[-1][1] - y
+    for bx, by in pts:
+        bx, by = bx - x, by - y
+        split = [(ax, ay)]
+        dx, dy = bx - ax, by - ay
+        a = dx * dx + dy * dy
+        b = ax * dx + ay * dy
+        delta = b * b - a * (ax * ax + ay * ay - r2)
+        if a and delta > 0:
+            delta = sqrt(delta)
+            for t in ((-b - delta) / a, (-b + delta) / a):
+                if 0 < t < 1:
+                    split.append((ax + t * dx, ay + t * dy))
+        split.append((bx, by))
+
+        for (px, py), (qx, qy) in zip(split, split[1:]):
+            cross = px * qy - qx * py
+            mid_x, mid_y = (px + qx) / 2, (py + qy) / 2
+            if mid_x * mid_x + mid_y * mid_y <= r2:
+                w = cross / 2
+                area += w
+                mx += w * (px + qx) / 3
+                my += w * (py + qy) / 3
+            else:
+                # Sector: the centroid lies in the bisector of p and q
+                phi = atan2(cross, px * qx + py * qy)
+                p_norm = sqrt(px * px + py * py)
+                q_norm = sqrt(qx * qx + qy * qy)
+                ux, uy = px / p_norm + qx / q_norm, py / p_norm + qy / q_norm
+                norm = sqrt(ux * ux + uy * uy)
+                area += r2 * phi / 2
+                if norm:
+                    m = 2 * r * r2 * sin(phi / 2) / (3 * norm)
+                    mx += m * ux
+                    my += m * uy
+        ax, ay = bx, by
+
+    if not area:
+        return 0.0, x, y
+    return abs(area), x + mx / area, y + my / area
+
+
+def _polygons_moments(A, B):
+    """
+    Return the tuple (area, x, y) with the area and center of mass of the
+    intersection of two polygonal solids.
+
+    A is clipped by each convex part of B.
+    """
+
+    from smallshapes.clipping import clip_coords
+
+    total = sx = sy = 0.0
+    for part in _convex_parts(B):
+        coords = clip_coords(A, part)
+        if len(coords):
+            area, x, y, _ = poly_moments(coords)
+            area = abs(area)
+            total += area
+            sx += area * x
+            sy += area * y
+    if not total:
+        return 0.0, 0.0, 0.0
+    return total, sx / total, sy / total
+
+
+#
+# intersects()
+#
+def intersects_circle_circle(A, B):
+    # The exact test is as cheap as the bounding volume tests.
+    return A.overlaps_circle(B)
+
+
+def intersects_aabb_aabb(A, B):
+    return _boxes_overlap(A, B)
+
+
+def intersects_aabb_circle(A, B):
+    xmin, xmax, ymin, ymax = A.rect_coords
+    x, y, r = B._x, B._y, B._radius
+    dx = x - min(max(x, xmin), xmax)
+    dy = y - min(max(y, ymin), ymax)
+    return dx * dx + dy * dy <= r * r
+
+
+def intersects_convex_circle(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    return _circle_points_intersect(B._x, B._y, B._radius, _points(A))
+
+
+def intersects_convex_convex(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    return _convex_sets_intersect(_points(A), _points(B))
+
+
+def intersects_poly_solid(A, B):
+    # A is a simple polygon and B is a circle or a convex point set.
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    if A.contains_point(_any_point(B)):
+        return True
+    return any(_edge_intersects(edge, B) for edge in A._edges())
+
+
+def intersects_poly_poly(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    if A.contains_point(_any_point(B)) or B.contains_point(_any_point(A)):
+        return True
+    return _edge_sets_intersect(list(A._edges()), list(B._edges()))
+
+
+def intersects_path_solid(A, B):
+    # A is a path and B is a circle or a convex point set.
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    return any(_edge_intersects(edge, B) for edge in A._edges())
+
+
+def intersects_path_poly(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    if B.contains_point(_any_point(A)):
+        return True
+    return _edge_sets_intersect(list(A._edges()), list(B._edges()))
+
+
+def intersects_path_path(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return False
+    return _edge_sets_intersect(list(A._edges()), list(B._edges()))
+
+
+#
+# distance()
+#
+def distance_circle_circle(A, B):
+    return A.distance_circle(B)
+
+
+def distance_shape_circle(A, B):
+    # distance_point() is null for points inside solids.
+    return max(A.distance_point((B._x, B._y)) - B._radius, 0.0)
+
+
+def distance_edges(A, B):
+    if intersects(A, B):
+        return 0.0
+    return _edges_distance(_edges_of(A), _edges_of(B))
+
+
+#
+# contain()
+#
+def contain_circle_circle(A, B):
+    return A.contains_circle(B)
+
+
+def contain_circle_points(A, B):
+    x, y, r = A._x, A._y, A._radius
+    r2 = r * r
+    return all((px - x) ** 2 + (py - y) ** 2 <= r2 for px, py in _points(B))
+
+
+def contain_aabb_shape(A, B):
+    xmin, xmax, ymin, ymax = A.rect_coords
+    bxmin, bxmax, bymin, bymax = B.rect_coords
+    return (xmin <= bxmin and bxmax <= xmax and
+            ymin <= bymin and bymax <= ymax)
+
+
+def contain_poly_circle(A, B):
+    # A is a convex or simple polygon
+    x, y, r = B._x, B._y, B._radius
+    if not A.contains_point((x, y)):
+        return False
+    r2 = r * r
+    return all(_segment_distance_sqr(x, y, *edge) >= r2
+               for edge in A._edges())
+
+
+def contain_convex_points(A, B):
+    pts = _points(A)
+    return all(_convex_covers(pts, x, y) for x, y in _points(B))
+
+
+def contain_poly_points(A, B):
+    # Vertices of B must be inside A and edges of B can only touch the
+    # boundary of A.
+    edges = list(A._edges())
+
+    def covers(x, y):
+        return A.contains_point((x, y)) or _near_edges(edges, x, y)
+
+    return _edges_covered(covers, _edges_of(B), edges)
+
+
+def contain_path_shape(A, B):
+    # Paths can only contain shapes without interior.
+    if isinstance(B, Solid):
+        return False
+    edges = _edges_of(A)
+    return _edges_covered(lambda x, y: _near_edges(edges, x, y),
+                          _edges_of(B), edges)
+
+
+#
+# intercept_center()
+#
+def intercept_center_circle_circle(A, B):
+    if not A.overlaps_circle(B):
+        return None
+    _, x, y = _lens(A, B)
+    return Vec(x, y)
+
+
+def intercept_center_solid_circle(A, B):
+    # A is an AABB or a polygon
+    if not intersects(A, B):
+        return None
+    area, x, y = _circle_polygon_moments(B._x, B._y, B._radius, _points(A))
+    if area:
+        return Vec(x, y)
+    pieces = []
+    for edge in _edges_of(A):
+        pieces.extend(_clip_edge(edge, B))
+    return _pieces_center(pieces)
+
+
+def intercept_center_solids(A, B):
+    # A and B are AABBs or polygons
+    if not intersects(A, B):
+        return None
+    area, x, y = _polygons_moments(A, B)
+    if area:
+        return Vec(x, y)
+
+    # Shapes only touch each other at the boundary
+    pieces = []
+    for edges, other in ((_edges_of(A), B), (_edges_of(B), A)):
+        for edge in edges:
+            pieces.extend(_clip_edge(edge, other))
+    return _pieces_center(pieces)
+
+
+def intercept_center_path_solid(A, B):
+    # A is a path or a segment and B is a solid
+    if not _bounding_volumes_overlap(A, B):
+        return None
+    pieces = []
+    for edge in _edges_of(A):
+        pieces.extend(_clip_edge(edge, B))
+    return _pieces_center(pieces)
+
+
+def intercept_center_path_path(A, B):
+    if not _bounding_volumes_overlap(A, B):
+        return None
+    return _pieces_center(_edge_set_overlaps(_edges_of(A), _edges_of(B)))
+
+
+#
+# penetration()
+#
+def penetration_sat(A, B):
+    from smallshapes.SAT import sat
+
+    try:
+        return sat(A, B)
+    except ValueError:
+        # SAT cannot choose a direction if the center of a circle coincides
+        # with the center or a vertex of the other shape.
+        return penetration_epa(A, B)
+
+
+def penetration_epa(A, B):
+    from smallshapes.gjk import epa
+
+    if not _bounding_volumes_overlap(A, B):
+        return None
+    return epa(A, B)
+
+
+def penetration_parts(A, B):
+    """
+    Concave polygons are decomposed in convex parts and paths in segments.
+    Return the largest penetration vector between all pairs of parts, as in
+    :func:`smallshapes.SAT.sat_compound`.
+    """
+
+    if not _bounding_volumes_overlap(A, B):
+        return None
+    best, depth = None, -1.0
+    parts_b = _convex_pieces(B)
+    for a in _convex_pieces(A):
+        for b in parts_b:
+            if _boxes_overlap(a, b):
+                vec = penetration(a, b)
+                if vec is not None and vec.norm() > depth:
+                    best, depth = vec, vec.norm()
+    return best
+
+
+#
+# Registration
+#
+FAMILIES = CircleAny, AABBAny, SegmentAny, ConvexPolyAny, PolyAny, PathAny
+
+
+def _flipped(func):
+    def flipped(A, B):
+        return func(B, A)
+
+    flipped.__name__ = func.__name__ + '_flipped'
+    return flipped
+
+
+def _register_once(generic_func, TA, TB, func):
+    """
+    Register func for the (TA, TB) pair, unless it was already registered.
+
+    This keeps registration idempotent if this module is executed twice, e.g.,
+    when the package is also imported under a different name.
+    """
+
+    if (TA, TB) not in generic_func._registry:
+        generic_func.register(TA, TB)(func)
+
+
+def _register(generic_func, func, *pairs, flip=True):
+    """
+    Register func for all given pairs of types and the flipped version for
+    the swapped pairs.
+
+    If flip=False, the swapped pairs are registered with func itself. This is
+    used by methods that handle both argument orders.
+    """
+
+    for TA, TB in pairs:
+        _register_once(generic_func, TA, TB, func)
+        if TA is not TB:
+            _register_once(generic_func, TB, TA,
+                           _flipped(func) if flip else func)
+
+
+def _pairs(families):
+    return list(combinations_with_replacement(families, 2))
+
+
+_register(intersects, intersects_circle_circle, (CircleAny, CircleAny))
+_register(intersects, intersects_aabb_aabb, (AABBAny, AABBAny))
+_register(intersects, intersects_aabb_circle, (AABBAny, CircleAny))
+_register(intersects, intersects_convex_circle,
+          (SegmentAny, CircleAny), (ConvexPolyAny, CircleAny))
+_register(intersects, intersects_convex_convex,
+          (SegmentAny, SegmentAny), (SegmentAny, AABBAny),
+          (ConvexPolyAny, ConvexPolyAny), (ConvexPolyAny, AABBAny),
+          (ConvexPolyAny, SegmentAny))
+_register(intersects, intersects_poly_solid,
+          (PolyAny, CircleAny), (PolyAny, AABBAny), (PolyAny, SegmentAny))
+_register(intersects, intersects_poly_poly, (PolyAny, PolyAny))
+_register(intersects, intersects_path_solid,
+          (PathAny, CircleAny), (PathAny, AABBAny), (PathAny, SegmentAny))
+_register(intersects, intersects_path_poly, (PathAny, PolyAny))
+_register(intersects, intersects_path_path, (PathAny, PathAny))
+
+_register(distance, distance_circle_circle, (CircleAny, CircleAny))
+_register(distance, distance_shape_circle,
+          *[(T, CircleAny) for T in FAMILIES[1:]])
+_register(distance, distance_edges, *_pairs(FAMILIES[1:]))
+
+# contain() is not symmetric: the container is always the first argument
+_register(contain, contain_circle_circle, (CircleAny, CircleAny))
+for _T in FAMILIES[1:]:
+    _register_once(contain, CircleAny, _T, contain_circle_points)
+    _register_once(contain, ConvexPolyAny, _T, contain_convex_points)
+    _register_once(contain, PolyAny, _T, contain_poly_points)
+for _T in FAMILIES:
+    _register_once(contain, AABBAny, _T, contain_aabb_shape)
+    _register_once(contain, SegmentAny, _T, contain_path_shape)
+    _register_once(contain, PathAny, _T, contain_path_shape)
+_register_once(contain, ConvexPolyAny, CircleAny, contain_poly_circle)
+_register_once(contain, PolyAny, CircleAny, contain_poly_circle)
+
+_register(intercept_center, intercept_center_circle_circle,
+          (CircleAny, CircleAny))
+_register(intercept_center, intercept_center_solid_circle,
+          (AABBAny, CircleAny), (ConvexPolyAny, CircleAny),
+          (PolyAny, CircleAny))
+_register(intercept_center, intercept_center_solids,
+          *_pairs((AABBAny, ConvexPolyAny, PolyAny)))
+_register(intercept_center, intercept_center_path_solid,
+          *[(T, S) for T in (SegmentAny, PathAny)
+            for S in (CircleAny, AABBAny, ConvexPolyAny, PolyAny)])
+_register(intercept_center, intercept_center_path_path,
+          *_pairs((SegmentAny, PathAny)))
+
+# The penetration vector changes sign if arguments are swapped. Methods are
+# registered for both orders instead of using flipped versions.
+_register(penetration, penetration_sat,
+          *_pairs((CircleAny, AABBAny, ConvexPolyAny)), flip=False)
+_register(penetration, penetration_epa,
+          *[(SegmentAny, T)
+            for T in (CircleAny, AABBAny, SegmentAny, ConvexPolyAny)],
+          flip=False)
+_register(penetration, penetration_parts,
+          *[(T, S) for T in (PolyAny, PathAny) for S in FAMILIES
+            if not (T is PathAny and S is PolyAny)], flip=False)
+del _T
@@ -1,16 +1,74 @@
+import numpy as np
+
 from smallshapes import Shape, mShape
+from smallshapes.path_utils import _segment_distance_sqr
+from smallshapes.utils import cached
 from smallvectors import Vec, Immutable
 
+ndarray = np.ndarray
+
 
 class PathAny(Shape):
     """
     Base class for Path and mPath.
+
+    Vertices are stored as a flat list of coordinates. Objects created with
+    :meth:`from_array` (or from an (N, 2) NumPy array) use a contiguous
+    float64 buffer instead and run bulk operations in vectorized form.
+
+    Derived quantities such as pos, the bounding box and cbb_radius are
+    computed once and cached.
     """
 
-    __slots__ = ('_data',)
+    __slots__ = ('_data', '_cache')
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Create a new object from an (N, 2) array of coordinates.
+
+        Vertices are copied into a contiguous float64 NumPy buffer. This is
+        the preferred storage for objects with thousands of vertices.
+
+        Example:
+            >>> import numpy as np
+            >>> path = Path.from_array(np.array([[0, 0], [1, 1], [2, 0]]))
+            >>> path.xmax
+            2.0
+        """
+
+        return _from_data(cls, _as_buffer(array))
 
     @property
+    def array(self):
+        """
+        An (N, 2) array with the coordinates of each vertex.
+
+        Array backed objects return a view of their internal buffer, which
+        is read-only for immutable objects. Otherwise, a new array is
+        created. Writing directly to the buffer of a mutable object does not
+        reset its cached properties.
+        """
+
+        data = self._data
+        if isinstance(data, ndarray):
+            if isinstance(self, Immutable):
+                data.flags.writeable = False
+            return data.reshape(-1, 2)
+        return np.array(data, dtype=float).reshape(-1, 2)
+
+    @property
+    @cached
     def pos(self):
+        data = self._data
+        if isinstance(data, ndarray):
+            pts = data.reshape(-1, 2)
+            prev = np.roll(pts, 1, axis=0)
+            L = np.hypot(*(pts - prev).T)
+            x, y = (((pts + prev) * L[:, None]).sum(axis=0) /
+                    (2 * L.sum())).tolist()
+            return Vec(x, y)
+
         pt0 = self[-1]
         M, S = 0, Vec(0, 0)
 
@@ -23,37 +81,52 @@ class PathAny(Shape):
 
     @property
     def xmin(self):
-        return min(self._data[::2])
+        return self._bounds()[0]
 
     @property
     def xmax(self):
-        return max(self._data[::2])
+        return self._bounds()[1]
 
     @property
     def ymin(self):
-        return min(self._data[1::2])
+        return self._bounds()[2]
 
     @property
     def ymax(self):
-        return max(self._data[1::2])
+        return self._bounds()[3]
+
+    @property
+    def rect_coords(self):
+        return self._bounds()
 
     @property
     def vertices(self):
         vec = self._vec
-        return [vec(x, y) for x, y in zip(self._data[::2], self._data[1::2])]
+        data = self._data
+        if isinstance(data, ndarray):
+            return [vec(x, y) for x, y in data.reshape(-1, 2).tolist()]
+        return [vec(x, y) for x, y in zip(data[::2], data[1::2])]
 
     @property
+    @cached
     def cbb_radius(self):
-        pos = self.pos
-        return max((v - pos).norm() for v in self.vertices)
+        x, y = self.pos
+        data = self._data
+        if isinstance(data, ndarray):
+            return float(np.hypot(data[::2] - x, data[1::2] - y).max())
+        return self._sqrt(max((xi - x) ** 2 + (yi - y) ** 2
+                              for xi, yi in zip(data[::2], data[1::2])))
 
     def __init__(self, *data):
         if len(data) == 1:
             data = data[0]
-        self._data = [x + 0.0 for vec in data for x in vec]
+        if isinstance(data, ndarray):
+            self._data = _as_buffer(data)
+        else:
+            self._data = [x + 0.0 for vec in data for x in vec]
 
     def __iter__(self):
-        numbers = iter(self._data)
+        numbers = iter(self._tolist())
         vec = Vec
         for x in numbers:
             yield vec(x, next(numbers))
@@ -68,24 +141,77 @@ class PathAny(Shape):
         elif idx < 0:
             idx = N + idx
         i = 2 * idx
-        return Vec(self._data[i], self._data[i + 1])
+        return Vec(float(self._data[i]), float(self._data[i + 1]))
 
     def __flatiter__(self):
-        return iter(self._data)
+        return iter(self._tolist())
 
     def __flatlen__(self):
         return len(self._data)
 
     def __flatgetitem__(self, idx):
-        return self._data[idx]
+        return float(self._data[idx])
+
+    def __reduce__(self):
+        args = (type(self), self._data.copy())
+        state = _slots_state(self)
+        if state:
+            return _from_data, args, (None, state)
+        return _from_data, args
+
+    @cached
+    def _bounds(self):
+        """
+        Return the tuple (xmin, xmax, ymin, ymax).
+        """
+
+        data = self._data
+        x, y = data[::2], data[1::2]
+        if isinstance(data, ndarray):
+            return (float(x.min()), float(x.max()),
+                    float(y.min()), float(y.max()))
+        return min(x), max(x), min(y), max(y)
+
+    def _tolist(self):
+        """
+        Return the flat list of coordinates.
+
+        The internal list is returned as is, without copying.
+        """
+
+        data = self._data
+        return data.tolist() if isinstance(data, ndarray) else data
+
+    def _edges(self):
+        """
+        Iterate over (x0, y0, x1, y1) for each line segment in the path.
+        """
+
+        data = self._tolist()
+        for i in range(0, len(data) - 2, 2):
+            yield data[i], data[i + 1], data[i + 2], data[i + 3]
+
+    def distance_point(self, point):
+        x, y = point
+        if len(self._data) == 2:
+            x0, y0 = self._data
+            return self._sqrt((x - x0) ** 2 + (y - y0) ** 2)
+        return self._sqrt(min(_segment_distance_sqr(x, y, *edge)
+                              for edge in self._edges()))
 
     def move_to_vec(self, value):
         return self.move_vec(value - self.pos)
 
     def move_vec(self, value):
         new = object.__new__(self.__class__)
-        data = new._data = self._data[:]
         dx, dy = value
+        if isinstance(self._data, ndarray):
+            data = new._data = self._data.copy()
+            data[::2] += dx
+            data[1::2] += dy
+            return new
+
+        data = new._data = self._data[:]
         for i in range(0, len(self._data), 2):
             data[i] += dx
             data[i + 1] += dy
@@ -161,12 +287,65 @@ class mPath(PathAny, mShape):
 
     def imove_vec(self, vec):
         x, y = vec
+        self._cache = None
+        if isinstance(self._data, ndarray):
+            self._data[::2] += x
+            self._data[1::2] += y
+            return
         self._data[::2] = [x + xi for xi in self._data[::2]]
         self._data[1::2] = [y + yi for yi in self._data[1::2]]
 
     def imove_to_vec(self, vec):
-        data = self._data
-        dx, dy = vec - self.pos
-        for i in range(0, len(self._data), 2):
-            data[i] += dx
-            data[i + 1] += dy
+        self.imove_vec(vec - self.pos)
+
+    def __setitem_simple__(self, idx, value):
+        x, y = value
+        self._cache = None
+        self._data[2 * idx] = x + 0.0
+        self._data[2 * idx + 1] = y + 0.0
+
+
+def _from_data(cls, data):
+    """
+    Recreate path object from its flat list of coordinates.
+
+    Array buffers of immutable objects are made read-only.
+    """
+
+    if isinstance(data, ndarray) and issubclass(cls, Immutable):
+        data.flags.writeable = False
+    new = object.__new__(cls)
+    new._data = data
+    return new
+
+
+def _slots_state(obj):
+    """
+    Return a dictionary with the values of the slots that subclasses add to
+    the vertex data, e.g., the angle of rectangles.
+    """
+
+    state = {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name in ('_data', '_cache') or name.startswith('__'):
+                continue
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+def _as_buffer(array):
+    """
+    Copy an (N, 2) array of coordinates into a flat contiguous float64 buffer.
+
+    The buffer owns its memory, so no other array can write to it.
+    """
+
+    array = np.asarray(array, dtype=float)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError('expect an array of shape (N, 2), got %s' %
+                         (array.shape,))
+    data = np.empty(array.size, dtype=float)
+    data.reshape(-1, 2)[:] = array
+    return data
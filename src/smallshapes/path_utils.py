@@ -1,22 +1,104 @@
+import numpy as np
 from smallvectors import Vec
 
 
-def _w_list(L):
+def _segment_distance_sqr(x, y, x0, y0, x1, y1):
+    """
+    Return the squared distance between point (x, y) and the line segment
+    from (x0, y0) to (x1, y1).
+    """
+
+    tx, ty = x1 - x0, y1 - y0
+    dx, dy = x - x0, y - y0
+    length_sqr = tx * tx + ty * ty
+    if length_sqr:
+        t = (dx * tx + dy * ty) / length_sqr
+        if t >= 1:
+            dx, dy = x - x1, y - y1
+        elif t > 0:
+            dx -= t * tx
+            dy -= t * ty
+    return dx * dx + dy * dy
+
+
+#: Polygons with at least this number of vertices use the NumPy kernels.
+ARRAY_THRESHOLD = 48
+
+
+def poly_moments(L):
+    """
+    Return a tuple (area, x_cm, y_cm, ROG2) with the area, center of mass and
+    squared radius of gyration (with respect to the center of mass) of the
+    polygon defined by the given list of points or (N, 2) array.
+
+    All quantities are derived from the shoelace weights in a single pass.
+    Polygons with zero area have their center of mass at the first point
+    and ROG2 equal to zero. Empty polygons have their center of mass at the
+    origin.
+
+    Example:
+        >>> poly_moments([(0, 0), (2, 0), (2, 2), (0, 2)])   # doctest: +ELLIPSIS
+        (4.0, 1.0, 1.0, 0.666...)
+    """
+
+    if isinstance(L, np.ndarray):
+        return _array_moments(L.reshape(-1, 2))
+    return _flat_moments([float(x) for pt in L for x in pt])
+
+
+def _flat_moments(data):
+    """
+    Compute poly_moments() from a flat sequence of coordinates.
+
+    Large polygons are dispatched to the NumPy kernel.
     """
-    Return list of weight terms W = 1/2 * (y1*x0 - y0*x1) for all points in the
-    input list.
 
-    Each term is the result of the integral $\int <y, x>.d\vec{\ell}$ over a
-    straight line segment.
+    if isinstance(data, np.ndarray) or len(data) >= 2 * ARRAY_THRESHOLD:
+        return _array_moments(np.asarray(data, dtype=float).reshape(-1, 2))
+    if not data:
+        return 0.0, 0.0, 0.0, 0.0
+
+    # Coordinates are taken relative to the first point to avoid loss of
+    # precision for polygons far from the origin.
+    x0, y0 = data[0], data[1]
+    xa, ya = data[-2] - x0, data[-1] - y0
+    A = Sx = Sy = I = 0.0
+    for i in range(0, len(data), 2):
+        xb, yb = data[i] - x0, data[i + 1] - y0
+        w = xa * yb - xb * ya
+        A += w
+        Sx += (xa + xb) * w
+        Sy += (ya + yb) * w
+        I += ((xa + xb) ** 2 - xa * xb + (ya + yb) ** 2 - ya * yb) * w
+        xa, ya = xb, yb
+    return _moments_result(A / 2, Sx / 6, Sy / 6, I / 12, x0, y0)
+
+
+def _array_moments(pts):
+    """
+    Vectorized version of poly_moments() for an (N, 2) array.
     """
 
-    N = len(L)
-    out = []
-    for i in range(N):
-        x1, y1 = L[(i + 1) % N]
-        x0, y0 = L[i]
-        out.append(0.5 * (y1 * x0 - y0 * x1))
-    return out
+    if len(pts) == 0:
+        return 0.0, 0.0, 0.0, 0.0
+    x0, y0 = pts[0].tolist()
+    x, y = pts[:, 0] - x0, pts[:, 1] - y0
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    W = x * yn - xn * y
+    sx, sy = x + xn, y + yn
+    return _moments_result(
+        W.sum() / 2, (sx * W).sum() / 6, (sy * W).sum() / 6,
+        ((sx * sx - x * xn + sy * sy - y * yn) * W).sum() / 12, x0, y0)
+
+
+def _moments_result(A, Sx, Sy, I, x0, y0):
+    # Sx, Sy and I are the first and second moments of area with respect to
+    # (x0, y0).
+    if A == 0:
+        return 0.0, x0, y0, 0.0
+    x_cm, y_cm = Sx / A, Sy / A
+    return (float(A), float(x_cm + x0), float(y_cm + y0),
+            float(I / A - x_cm * x_cm - y_cm * y_cm))
 
 
 def area(L):
@@ -31,13 +113,13 @@ def area(L):
         1.5
     """
 
-    return sum(_w_list(L))
+    return poly_moments(L)[0]
 
 
 def center_of_mass(L):
     """
     Return the center of mass vector for a solid polygon defined by the given
-    list of points.
+    list of points or (N, 2) array.
 
     Example:
         >>> pts = [(0, 0), (1, 0), (1, 1), (0, 1)]
@@ -45,22 +127,8 @@ def center_of_mass(L):
         Vec(0.5, 0.5)
     """
 
-    W = _w_list(L)
-    A = sum(W)
-    N = len(L)
-    x_cm = 0
-    y_cm = 0
-    if A == 0:
-        return Vec(*L[0])
-    for i in range(N):
-        x1, y1 = L[(i + 1) % N]
-        x0, y0 = L[i]
-        wi = W[i]
-        x_cm += (x1 + x0) * wi / 3.0
-        y_cm += (y1 + y0) * wi / 3.0
-    x_cm /= A
-    y_cm /= A
-    return Vec(x_cm, y_cm)
+    _, x, y, _ = poly_moments(L)
+    return Vec(x, y)
 
 
 def ROG_sqr(L, axis=None):
@@ -85,91 +153,47 @@ def ROG_sqr(L, axis=None):
     2.666...
     """
 
-    W = _w_list(L)
-    A = sum(W)
-    N = len(L)
-    ROG2_orig = 0
-    for i in range(N):
-        x1, y1 = L[(i + 1) % N]
-        x0, y0 = L[i]
-        ROG2_orig += ((x1 + x0) ** 2 - x1 * x0 + (y1 + y0)
-                      ** 2 - y1 * y0) * W[i] / 6
-    ROG2_orig /= A
-
-    # Parallel axis theorem to move the object away from the center of mass.
-    cm = center_of_mass(L)
-    ROG2_cm = ROG2_orig - (cm.x ** 2 + cm.y ** 2)
+    return _moments_ROG_sqr(poly_moments(L), axis)
+
+
+def _moments_ROG_sqr(moments, axis=None):
+    # Uses the parallel axis theorem to translate from the center of mass to
+    # the given axis.
+    _, x, y, ROG2 = moments
     if axis is None:
-        return ROG2_cm
-    else:
-        # Uses the parallel axis theorem again to translate back to the final
-        # axis.
-        D = (cm - axis)
-        return ROG2_cm + (D.x ** 2 + D.y ** 2)
+        return ROG2
+    dx, dy = x - axis[0], y - axis[1]
+    return ROG2 + dx * dx + dy * dy
 
 
 def clip(poly1, poly2):
     """
     Sutherland-Hodgman polygon clipping algorithm.
-    """
-
-    def inside(pt):
-        """
-        Return True if point is inside second polygon.
-        """
-        pt_rel = pt - r0
-        return T.x * pt_rel.y >= T.y * pt_rel.x
 
-    def intercept_point():
-        """
-        Return intercept between segments formed by ``r1 - r0`` and ``v1 - v0``.
-        """
+    Return the list of vertices of poly1 clipped by the convex polygon poly2.
+    Raises a ValueError if polygons do not overlap. See
+    :mod:`smallshapes.clipping` for the array based engine.
 
-        A = r0.x * r1.y - r0.y * r1.x
-        B = v0.x * v1.y - v0.y * v1.x
-        C = 1.0 / (T.x * T_.y - T.y * T_.x)
-        return Vec((-A * T_.x + B * T.x) * C, (-A * T_.y + B * T.y) * C)
-
-    out = list(poly1)
-    r0 = poly2[-1]
-
-    # Iterates over lines in poly2
-    for r1 in poly2:
-        if not out:
-            raise ValueError('no superposition detected')
-
-        T = r1 - r0
-        points, out = out, []
-        v0 = points[-1]
-        v0_inside = inside(v0)
-
-        # In each line, iterate over the points in the output polygon.
-        for v1 in points:
-            T_ = v1 - v0
-
-            # inside, outside ==> creates intermediate point
-            # both inside ==> copy to the out polygon
-            # both outside ==> abandon previous point
-            v1_inside = inside(v1)
-            if (v1_inside + v0_inside) == 1:
-                out.append(intercept_point())
-            if v1_inside:
-                out.append(v1)
+    Example:
+        >>> square = [(0, 0), (2, 0), (2, 2), (0, 2)]
+        >>> clip(square, [(1, 1), (3, 1), (3, 3), (1, 3)])
+        [Vec(1.0, 1.0), Vec(2.0, 1.0), Vec(2.0, 2.0), Vec(1.0, 2.0)]
+    """
 
-            # Update previous point
-            v0 = v1
-            v0_inside = v1_inside
+    from smallshapes.clipping import clip_coords
 
-        # Update initial point
-        r0 = r1
-    return out
+    out = clip_coords(poly1, poly2)
+    if not len(out):
+        raise ValueError('no superposition detected')
+    return [Vec(x, y) for x, y in out.tolist()]
 
 
 def convex_hull(points):
     """
     Convex hull for the list of points.
 
-    Uses Andrew's monotonic chain algorithm in O(n log n).
+    Uses Andrew's monotonic chain algorithm in O(n log n). See
+    :mod:`smallshapes.hull` for functions that return ConvexPoly objects.
 
     Example:
         >>> hull = convex_hull([(0, 0), (1, 1), (1, 0), (0, 1), (0.5, 0.5)])
@@ -177,27 +201,6 @@ def convex_hull(points):
         True
     """
 
-    # Lexicographical sort
-    points = sorted(set(map(tuple, points)))
-    points = [Vec(*pt) for pt in points]
-    if len(points) <= 1:
-        return points
-
-    # L: lower vertices
-    # Adds points to L if the result preserves an counter-clockwise direction.
-    L = []
-    for p in points:
-        while len(L) >= 2 and (L[-1] - L[-2]).cross(p - L[-2]) <= 0:
-            L.pop()
-        L.append(p)
-
-    # U: upper vertices
-    # Similar as before, but iterates in the opposite order.
-    U = []
-    for p in reversed(points):
-        while len(U) >= 2 and (U[-1] - U[-2]).cross(p - U[-2]) <= 0:
-            U.pop()
-        U.append(p)
-
-    # Remove last point since it is duplicated
-    return L[:-1] + U[:-1]
\ No newline at end of file
+    from smallshapes.hull import hull_coords
+
+    return [Vec(x, y) for x, y in hull_coords(points).tolist()]
@@ -1,5 +1,8 @@
-from smallshapes import Solid, CircuitAny, Circuit, mCircuit, ROG_sqr, area, \
-    mSolid
+from smallshapes import Solid, CircuitAny, Circuit, mCircuit, mSolid, \
+    MassProperties
+from smallshapes.path_utils import _moments_ROG_sqr
+from smallshapes.sweep import is_simple_coords, self_intersections_coords
+from smallshapes.utils import cached
 from smallvectors import Vec
 
 Vec = Vec[2, float]
@@ -13,13 +16,150 @@ class PolyAny(CircuitAny, Solid):
     __slots__ = ()
 
     def is_simple(self):
-        True
+        """
+        Return True if the polygon does not intersect itself.
+
+        Runs the Shamos-Hoey sweep with O(n log n) comparisons.
+
+        Example:
+            >>> Poly((0, 0), (2, 0), (2, 2), (0, 2)).is_simple()
+            True
+            >>> Poly((0, 0), (2, 2), (2, 0), (0, 2)).is_simple()
+            False
+        """
+
+        return is_simple_coords(self.array.tolist())
+
+    def is_convex(self):
+        """
+        Return True if the polygon is convex.
+
+        All turns between consecutive edges must have the same sign and the
+        boundary must go around the polygon a single time. Collinear
+        vertices are accepted, but edges that fold back over the previous
+        edge are not.
+
+        Example:
+            >>> Poly((0, 0), (2, 0), (2, 2), (0, 2)).is_convex()
+            True
+            >>> Poly((0, 0), (2, 0), (1, 1), (2, 2), (0, 2)).is_convex()
+            False
+        """
+
+        deltas = [(x1 - x0, y1 - y0) for x0, y0, x1, y1 in self._edges()
+                  if x0 != x1 or y0 != y1]
+        if len(deltas) < 3:
+            return False
+
+        # A convex polygon turns to the same side in every vertex and the
+        # x and y components of the edges change sign at most twice.
+        positive = negative = False
+        flips_x = flips_y = 0
+        dx0, dy0 = deltas[-1]
+        sx, sy = _sign(dx0), _sign(dy0)
+        for dx, dy in deltas:
+            cross = dx0 * dy - dy0 * dx
+            if cross == 0 and dx0 * dx + dy0 * dy < 0:
+                # The boundary folds back over the previous edge
+                return False
+            if cross > 0:
+                positive = True
+            elif cross < 0:
+                negative = True
+            if _sign(dx) and _sign(dx) != sx:
+                flips_x += sx != 0
+                sx = _sign(dx)
+            if _sign(dy) and _sign(dy) != sy:
+                flips_y += sy != 0
+                sy = _sign(dy)
+            dx0, dy0 = dx, dy
+        return (positive != negative) and flips_x <= 2 and flips_y <= 2
+
+    def self_intersections(self):
+        """
+        Return a sorted list with the points in which the sides of the
+        polygon intersect each other. The list is empty for simple polygons.
+
+        Intersections are reported by the Bentley-Ottmann sweep.
+
+        Example:
+            >>> Poly((0, 0), (2, 2), (2, 0), (0, 2)).self_intersections()
+            [Vec(1.0, 1.0)]
+        """
+
+        return [self._vec(x, y)
+                for x, y in self_intersections_coords(self.array.tolist())]
 
     def ROG_sqr(self, axis=None):
-        return ROG_sqr(self, axis)
+        return _moments_ROG_sqr(self._moments(), axis)
 
     def area(self):
-        return area(self)
+        return self._moments()[0]
+
+    def mass_properties(self, density=1.0):
+        A, x, y, ROG2 = self._moments()
+        return MassProperties.from_ROG_sqr(A, self._vec(x, y), ROG2, density)
+
+    def triangulate(self, method='monotone', triangles=False):
+        """
+        Decompose polygon into n - 2 triangles.
+
+        Return an (n - 2, 3) int32 array with the indices of the vertices of
+        each triangle in counter-clockwise order. If triangles=True, return a
+        tuple (indices, triangles) in which the second element is a list of
+        Triangle objects.
+
+        The default 'monotone' method runs in O(n log n). Use method='ear' to
+        force ear clipping. See :mod:`smallshapes.triangulation`.
+
+        Example:
+            >>> poly = Poly((0, 0), (2, 0), (2, 2), (1, 1), (0, 2))
+            >>> poly.triangulate().tolist()
+            [[1, 3, 0], [1, 2, 3], [3, 4, 0]]
+        """
+
+        from smallshapes import Triangle
+        from smallshapes.triangulation import triangulate_coords
+
+        coords = self.array
+        indices = triangulate_coords(coords, method)
+        if triangles:
+            return indices, [Triangle.from_array(coords[tri])
+                             for tri in indices]
+        return indices
+
+    @cached
+    def convex_parts(self):
+        """
+        Return a tuple of ConvexPoly objects that partition the polygon.
+
+        The result is computed once with the Hertel-Mehlhorn algorithm and
+        cached. See :mod:`smallshapes.decomposition`.
+        """
+
+        from smallshapes.decomposition import convex_decomposition
+
+        return tuple(convex_decomposition(self.array))
+
+    def contains_point(self, point):
+        # Crossing number test: count edges crossed by an horizontal ray
+        # starting at point and going to the right.
+        x, y = point
+        inside = False
+        for x0, y0, x1, y1 in self._edges():
+            if (y0 > y) != (y1 > y):
+                if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                    inside = not inside
+        return inside
+
+    def distance_point(self, point):
+        if self.contains_point(point):
+            return 0.0
+        return super().distance_point(point)
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
 
 
 class Poly(PolyAny, Circuit):
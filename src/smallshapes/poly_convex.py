@@ -1,5 +1,8 @@
+import numpy as np
+
 from smallshapes import PolyAny, Convex, mPoly, mConvex
-from smallvectors import Immutable
+from smallshapes.path import ndarray
+from smallvectors import Immutable, Vec
 from smallvectors.core.mutability import Mutable
 
 
@@ -10,8 +13,42 @@ class ConvexPolyAny(PolyAny, Convex):
 
     __slots__ = ()
 
-    def is_convex(self):
-        True
+    def normals(self):
+        """
+        Return a list of unit vectors normal to each edge pointing outwards.
+        """
+
+        sign = 1.0 if self.area() >= 0 else -1.0
+        out = []
+        for x0, y0, x1, y1 in self._edges():
+            dx, dy = x1 - x0, y1 - y0
+            norm = sign * self._sqrt(dx * dx + dy * dy)
+            if norm:
+                out.append(Vec(dy / norm, -dx / norm))
+        return out
+
+    def support(self, direction):
+        nx, ny = direction
+        data = self._data
+        if isinstance(data, ndarray):
+            x, y = data.reshape(-1, 2)[np.argmax(data[::2] * nx +
+                                                 data[1::2] * ny)].tolist()
+            return Vec(x, y)
+        best, idx = -float('inf'), 0
+        for i in range(0, len(data), 2):
+            value = nx * data[i] + ny * data[i + 1]
+            if value > best:
+                best, idx = value, i
+        return Vec(data[idx], data[idx + 1])
+
+    def shadow(self, n):
+        nx, ny = n
+        data = self._data
+        if isinstance(data, ndarray):
+            points = data[::2] * nx + data[1::2] * ny
+            return float(points.min()), float(points.max())
+        points = [nx * x + ny * y for x, y in zip(data[::2], data[1::2])]
+        return min(points), max(points)
 
 
 class ConvexPoly(ConvexPolyAny, Immutable):
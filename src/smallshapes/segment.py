@@ -1,4 +1,6 @@
 from smallshapes import Shape, mShape
+from smallshapes.path_utils import _segment_distance_sqr
+from smallshapes.utils import cached
 from smallvectors import asvector
 from smallvectors.core.mutability import Immutable
 
@@ -8,7 +10,7 @@ class SegmentAny(Shape):
     Base class for Segment and mSegment.
     """
 
-    __slots__ = ('_start', '_end')
+    __slots__ = ('_start', '_end', '_cache')
 
     @property
     def start(self):
@@ -19,24 +21,29 @@ class SegmentAny(Shape):
         return self._end
 
     @property
+    @cached
     def pos(self):
         return (self._start + self._end) / 2
 
     @property
     def xmin(self):
-        return min(self._start.x, self._end.x)
+        return self._bounds()[0]
 
     @property
     def xmax(self):
-        return max(self._start.x, self._end.x)
+        return self._bounds()[1]
 
     @property
     def ymin(self):
-        return min(self._start.y, self._end.y)
+        return self._bounds()[2]
 
     @property
     def ymax(self):
-        return max(self._start.y, self._end.y)
+        return self._bounds()[3]
+
+    @property
+    def rect_coords(self):
+        return self._bounds()
 
     @property
     def direction(self):
@@ -48,6 +55,7 @@ class SegmentAny(Shape):
                 abs(self._start.y - self._end.y))
 
     @property
+    @cached
     def cbb_radius(self):
         dx = (self._start.x - self._end.x) / 2
         dy = (self._start.y - self._end.y) / 2
@@ -57,6 +65,11 @@ class SegmentAny(Shape):
         self._start = asvector(start)
         self._end = asvector(end)
 
+    @cached
+    def _bounds(self):
+        (x0, y0), (x1, y1) = self._start, self._end
+        return min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+
     def __iter__(self):
         yield self._start
         yield self._end
@@ -85,6 +98,19 @@ class SegmentAny(Shape):
         else:
             raise IndexError(idx)
 
+    def support(self, direction):
+        x, y = direction
+        start, end = self._start, self._end
+        if x * (end.x - start.x) + y * (end.y - start.y) > 0:
+            return end
+        return start
+
+    def distance_point(self, point):
+        x, y = point
+        x0, y0 = self._start
+        x1, y1 = self._end
+        return self._sqrt(_segment_distance_sqr(x, y, x0, y0, x1, y1))
+
     def move_to_vec(self, pos):
         u, v = self
         delta = pos - (u + v) / 2
@@ -114,27 +140,38 @@ class mSegment(SegmentAny, mShape):
 
     @SegmentAny.start.setter
     def start(self, value):
-        self._start = self._asvector(value)
+        self._cache = None
+        self._start = asvector(value)
 
     @SegmentAny.end.setter
     def end(self, value):
-        self._end = self._asvector(value)
+        self._cache = None
+        self._end = asvector(value)
 
     @SegmentAny.direction.setter
     def direction(self, value):
-        self._end = self.start + self._asvector(value)
+        self._cache = None
+        self._end = self.start + asvector(value)
 
     @SegmentAny.pos.setter
     def pos(self, value):
         start, end = self
         pos = (start + end) / 2
         delta = value - pos
+        self._cache = None
         self._start += delta
         self._end += delta
 
     def imove_vec(self, vec):
+        self._cache = None
         self._start += vec
         self._end += vec
 
+    def __setitem_simple__(self, idx, value):
+        if idx == 0:
+            self.start = value
+        else:
+            self.end = value
+
     def imove_to_vec(self, vec):
         self.imove_vec(vec - self.pos)
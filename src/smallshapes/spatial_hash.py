@@ -0,0 +1,224 @@
+"""
+Uniform grid broadphase.
+
+Best suited for many objects of similar sizes, such as particles. Each shape
+is stored in every grid cell touched by its AABB.
+"""
+
+from math import floor
+
+
+class SpatialHash:
+    """
+    A spatial hash that buckets shapes in a uniform grid.
+
+    Args:
+        shapes:
+            Initial sequence of shapes.
+        cell_size:
+            Side of each square cell. If not given, it is chosen from the
+            distribution of ``cbb_radius`` of the initial shapes (see
+            :func:`suggest_cell_size`).
+
+    Shapes do not notify the hash when they move. Call :meth:`update` after
+    moving a shape or use :meth:`imove_vec` and :meth:`imove_to_vec` to move
+    it and update the buckets in a single step.
+
+    Example:
+        >>> from smallshapes import mCircle
+        >>> a, b, c = mCircle(1, (0, 0)), mCircle(1, (1, 1)), mCircle(1, (9, 9))
+        >>> grid = SpatialHash([a, b, c])
+        >>> list(grid.pairs()) == [(a, b)]
+        True
+    """
+
+    def __init__(self, shapes=(), cell_size=None):
+        shapes = list(shapes)
+        if cell_size is None:
+            cell_size = suggest_cell_size(shapes)
+        if cell_size <= 0:
+            raise ValueError('cell size must be positive')
+        self.cell_size = cell_size
+        self._cells = {}
+        self._ranges = {}
+        for shape in shapes:
+            self.insert(shape)
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __iter__(self):
+        return (shape for shape, _ in self._ranges.values())
+
+    def __contains__(self, shape):
+        return id(shape) in self._ranges
+
+    def _cell_range(self, shape):
+        size = self.cell_size
+        return (floor(shape.xmin / size), floor(shape.xmax / size),
+                floor(shape.ymin / size), floor(shape.ymax / size))
+
+    def _add_to_cells(self, shape, cell_range):
+        cells = self._cells
+        i0, i1, j0, j1 = cell_range
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                try:
+                    cells[i, j].append(shape)
+                except KeyError:
+                    cells[i, j] = [shape]
+
+    def _remove_from_cells(self, shape, cell_range):
+        cells = self._cells
+        i0, i1, j0, j1 = cell_range
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                bucket = cells[i, j]
+                for idx, obj in enumerate(bucket):
+                    if obj is shape:
+                        del bucket[idx]
+                        break
+                if not bucket:
+                    del cells[i, j]
+
+    @property
+    def cells(self):
+        """
+        Number of non-empty cells.
+        """
+
+        return len(self._cells)
+
+    def insert(self, shape):
+        """
+        Insert shape in the grid.
+        """
+
+        key = id(shape)
+        if key in self._ranges:
+            raise ValueError('shape is already in the grid')
+        cell_range = self._cell_range(shape)
+        self._ranges[key] = (shape, cell_range)
+        self._add_to_cells(shape, cell_range)
+
+    def remove(self, shape):
+        """
+        Remove shape from grid.
+
+        Raises a ValueError if shape is not present.
+        """
+
+        try:
+            _, cell_range = self._ranges.pop(id(shape))
+        except KeyError:
+            raise ValueError('shape is not in the grid')
+        self._remove_from_cells(shape, cell_range)
+
+    def update(self, shape):
+        """
+        Update the buckets of a shape after it moved.
+
+        Return True if the shape changed cells. Shapes that stay in the same
+        cells do not touch the buckets.
+        """
+
+        key = id(shape)
+        try:
+            _, old = self._ranges[key]
+        except KeyError:
+            raise ValueError('shape is not in the grid')
+
+        new = self._cell_range(shape)
+        if new == old:
+            return False
+        self._remove_from_cells(shape, old)
+        self._add_to_cells(shape, new)
+        self._ranges[key] = (shape, new)
+        return True
+
+    def imove_vec(self, shape, vec):
+        """
+        Displace shape by vec *INPLACE* and update its buckets.
+        """
+
+        shape.imove_vec(vec)
+        return self.update(shape)
+
+    def imove_to_vec(self, shape, vec):
+        """
+        Move shape to the given position *INPLACE* and update its buckets.
+        """
+
+        shape.imove_to_vec(vec)
+        return self.update(shape)
+
+    def query_point(self, point):
+        """
+        Iterate over all shapes whose AABB contains the given point.
+        """
+
+        x, y = point
+        size = self.cell_size
+        bucket = self._cells.get((floor(x / size), floor(y / size)), ())
+        for shape in bucket:
+            if shape.xmin <= x <= shape.xmax and shape.ymin <= y <= shape.ymax:
+                yield shape
+
+    def query_aabb(self, aabb):
+        """
+        Iterate over all shapes whose AABB overlaps the given AABB.
+        """
+
+        size = self.cell_size
+        xmin, xmax, ymin, ymax = aabb.rect_coords
+        cells = self._cells
+        seen = set()
+        for i in range(floor(xmin / size), floor(xmax / size) + 1):
+            for j in range(floor(ymin / size), floor(ymax / size) + 1):
+                for shape in cells.get((i, j), ()):
+                    key = id(shape)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if (shape.xmin <= xmax and xmin <= shape.xmax and
+                            shape.ymin <= ymax and ymin <= shape.ymax):
+                        yield shape
+
+    def pairs(self):
+        """
+        Iterate over all pairs of shapes that share at least one cell.
+
+        Each pair is reported only once: in the first cell shared by both
+        shapes.
+        """
+
+        ranges = self._ranges
+        for (i, j), bucket in self._cells.items():
+            size = len(bucket)
+            if size < 2:
+                continue
+            for n in range(size):
+                a = bucket[n]
+                _, (ai, _, aj, _) = ranges[id(a)]
+                for m in range(n + 1, size):
+                    b = bucket[m]
+                    _, (bi, _, bj, _) = ranges[id(b)]
+                    if max(ai, bi) == i and max(aj, bj) == j:
+                        yield a, b
+
+
+def suggest_cell_size(shapes, quantile=0.5, factor=2.0):
+    """
+    Suggest a cell size from the distribution of the ``cbb_radius`` of the
+    given shapes.
+
+    The result is ``factor`` times the given quantile of the radii. The
+    default is the median diameter, which makes similar sized objects
+    occupy at most 4 cells.
+    """
+
+    radii = sorted(shape.cbb_radius for shape in shapes)
+    if not radii:
+        return 1.0
+    idx = min(int(quantile * len(radii)), len(radii) - 1)
+    return factor * radii[idx] or 1.0
@@ -0,0 +1,205 @@
+"""
+Static R-tree packed with the Sort-Tile-Recursive (STR) algorithm.
+
+The tree is built once from a collection of shapes that never move and is
+optimized for window, point and nearest neighbor queries. Its structure is
+stored in a few flat NumPy arrays, making it compact and cheap to pickle.
+"""
+
+import heapq
+from math import ceil, sqrt
+
+import numpy as np
+
+from smallshapes.core import Solid
+
+
+class STRtree:
+    """
+    A read-only R-tree of shapes bulk loaded with STR packing.
+
+    Args:
+        shapes:
+            A sequence of shapes. Only the ``rect_coords`` attribute is used
+            to build the tree.
+        node_capacity:
+            Maximum number of children of each node.
+
+    Example:
+        >>> from smallshapes import AABB, Circle
+        >>> a, b = AABB(0, 1, 0, 1), Circle(1, (5, 5))
+        >>> tree = STRtree([a, b])
+        >>> tree.query(AABB(4, 6, 4, 6)) == [b]
+        True
+        >>> tree.nearest((2, 0)) == [a]
+        True
+    """
+
+    def __init__(self, shapes, node_capacity=16):
+        if node_capacity < 2:
+            raise ValueError('node capacity must be at least 2')
+        shapes = list(shapes)
+        coords = np.array([shape.rect_coords for shape in shapes],
+                          dtype=float).reshape(-1, 4)
+        self.node_capacity = node_capacity
+
+        # Level 0 holds the shapes bounding boxes. Each level above holds
+        # node boxes and the [start, end) range of their children in the
+        # level below.
+        order = _str_order(coords, node_capacity)
+        self._shapes = [shapes[i] for i in order]
+        self._boxes = [coords[order]]
+        self._starts = [None]
+        self._ends = [None]
+        boxes = self._boxes[0]
+        while len(boxes) > 1:
+            size = len(boxes)
+            starts = np.arange(0, size, node_capacity)
+            ends = np.minimum(starts + node_capacity, size)
+            parents = np.column_stack([
+                np.minimum.reduceat(boxes[:, 0], starts),
+                np.maximum.reduceat(boxes[:, 1], starts),
+                np.minimum.reduceat(boxes[:, 2], starts),
+                np.maximum.reduceat(boxes[:, 3], starts),
+            ])
+            order = _str_order(parents, node_capacity)
+            boxes = parents[order]
+            self._boxes.append(boxes)
+            self._starts.append(starts[order])
+            self._ends.append(ends[order])
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def __iter__(self):
+        return iter(self._shapes)
+
+    @property
+    def height(self):
+        """
+        Number of levels above the leaves.
+        """
+
+        return len(self._boxes) - 1
+
+    def _query_indices(self, xmin, xmax, ymin, ymax):
+        if not self._shapes:
+            return np.empty(0, dtype=int)
+
+        # Level-synchronous descent: all nodes in a level are tested in a
+        # single vectorized operation.
+        level = len(self._boxes) - 1
+        nodes = np.arange(len(self._boxes[level]))
+        while True:
+            boxes = self._boxes[level][nodes]
+            mask = ((boxes[:, 0] <= xmax) & (xmin <= boxes[:, 1]) &
+                    (boxes[:, 2] <= ymax) & (ymin <= boxes[:, 3]))
+            nodes = nodes[mask]
+            if level == 0 or not len(nodes):
+                return nodes
+            nodes = _expand_ranges(self._starts[level][nodes],
+                                   self._ends[level][nodes])
+            level -= 1
+
+    def query(self, window):
+        """
+        Return a list with all shapes whose AABB overlap the given window.
+
+        The window can be an AABB or any other shape.
+        """
+
+        shapes = self._shapes
+        idx = self._query_indices(*window.rect_coords)
+        return [shapes[i] for i in idx.tolist()]
+
+    def query_point(self, point):
+        """
+        Return a list with all solids that contain the given point.
+
+        The exact ``contains_point()`` test is only executed on the shapes
+        whose AABB contains the point. Shapes that are not solids are never
+        returned.
+        """
+
+        x, y = point
+        shapes = self._shapes
+        out = []
+        for i in self._query_indices(x, x, y, y).tolist():
+            shape = shapes[i]
+            if isinstance(shape, Solid) and shape.contains_point(point):
+                out.append(shape)
+        return out
+
+    def nearest(self, point, k=1):
+        """
+        Return a list with the k shapes closest to point, sorted by distance.
+
+        Distances are computed with ``Shape.distance`` and the search visits
+        nodes in order of the distance between point and the node's AABB.
+        """
+
+        if not self._shapes or k <= 0:
+            return []
+
+        x, y = point
+        shapes = self._shapes
+        top = len(self._boxes) - 1
+        heap = [(0.0, 0, top, 0)]
+        counter = 1
+        out = []
+
+        # Heap items are (distance, counter, level, index). Level -1 marks
+        # shapes whose exact distance was already computed. All other
+        # distances are lower bounds given by the AABBs.
+        while heap:
+            dist, _, level, idx = heapq.heappop(heap)
+            if level == -1:
+                out.append(shapes[idx])
+                if len(out) == k:
+                    break
+            elif level == 0:
+                dist = shapes[idx].distance(point)
+                heapq.heappush(heap, (dist, counter, -1, idx))
+                counter += 1
+            else:
+                start = self._starts[level][idx]
+                end = self._ends[level][idx]
+                boxes = self._boxes[level - 1][start:end]
+                dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 1]), 0)
+                dy = np.maximum(np.maximum(boxes[:, 2] - y, y - boxes[:, 3]), 0)
+                dists = np.sqrt(dx * dx + dy * dy)
+                for child, dist in enumerate(dists.tolist(), start):
+                    heapq.heappush(heap, (dist, counter, level - 1, child))
+                    counter += 1
+        return out
+
+
+def _str_order(boxes, capacity):
+    """
+    Return the Sort-Tile-Recursive order of the given (N, 4) array of boxes.
+
+    Boxes are sorted by the x coordinate of their centers and split in
+    ceil(sqrt(N / capacity)) vertical slices. Each slice is then sorted by y.
+    Consecutive runs of ``capacity`` boxes in the result form compact tiles.
+    """
+
+    size = len(boxes)
+    if size <= capacity:
+        return np.arange(size)
+    slices = int(ceil(sqrt(ceil(size / capacity))))
+    slice_size = slices * capacity
+    cx = boxes[:, 0] + boxes[:, 1]
+    cy = boxes[:, 2] + boxes[:, 3]
+    slice_id = np.empty(size, dtype=int)
+    slice_id[np.argsort(cx, kind='stable')] = np.arange(size) // slice_size
+    return np.lexsort((cy, slice_id))
+
+
+def _expand_ranges(starts, ends):
+    """
+    Concatenate all ranges [start, end) into a single array.
+    """
+
+    lengths = ends - starts
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
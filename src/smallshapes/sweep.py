@@ -0,0 +1,425 @@
+"""
+Plane sweep utilities shared by the polygon algorithms.
+
+The sweep line moves along the x axis. Events are kept in a priority queue
+and the active set stores the objects whose x-range contains the sweep line.
+"""
+
+import heapq
+from itertools import combinations
+
+
+def box_pairs(boxes, groups=None):
+    """
+    Iterate over all pairs (i, j) with i < j of overlapping boxes.
+
+    Args:
+        boxes:
+            A sequence of (xmin, xmax, ymin, ymax) tuples.
+        groups:
+            Optional sequence with a group label for each box. If given,
+            only pairs of boxes of different groups are reported.
+
+    The sweep runs in O(n log n + m), where m is the number of pairs whose
+    x-ranges overlap.
+
+    Example:
+        >>> boxes = [(0, 1, 0, 1), (0.5, 2, 0.5, 2), (3, 4, 0, 1)]
+        >>> list(box_pairs(boxes))
+        [(0, 1)]
+    """
+
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+    active = {}
+    queue = []
+    for i in order:
+        xmin, _, ymin, ymax = boxes[i]
+
+        # Remove boxes that end before the sweep line
+        while queue and queue[0][0] < xmin:
+            _, j = heapq.heappop(queue)
+            del active[j]
+
+        group = groups[i] if groups is not None else None
+        for j, (_, _, jmin, jmax) in active.items():
+            if jmin <= ymax and ymin <= jmax:
+                if groups is not None and groups[j] == group:
+                    continue
+                yield (j, i) if j < i else (i, j)
+
+        active[i] = boxes[i]
+        heapq.heappush(queue, (boxes[i][1], i))
+
+
+def segment_boxes(segments):
+    """
+    Return the list of bounding boxes of the given (x0, y0, x1, y1) segments.
+    """
+
+    return [(min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1))
+            for x0, y0, x1, y1 in segments]
+
+
+def orientation(ax, ay, bx, by, cx, cy):
+    """
+    Twice the signed area of the triangle abc. Positive if the points are in
+    counter-clockwise order.
+    """
+
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def segment_intersection(a, b):
+    """
+    Return the intersection points of segments a and b.
+
+    Segments are (x0, y0, x1, y1) tuples. The result is a pair of lists with
+    the points that split the interior of a and the interior of b,
+    respectively. Endpoints that touch the other segment are reported with
+    their exact coordinates and collinear overlaps are reported by the
+    endpoints of the overlap.
+    """
+
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    d1 = orientation(bx0, by0, bx1, by1, ax0, ay0)
+    d2 = orientation(bx0, by0, bx1, by1, ax1, ay1)
+    d3 = orientation(ax0, ay0, ax1, ay1, bx0, by0)
+    d4 = orientation(ax0, ay0, ax1, ay1, bx1, by1)
+    if (d1 > 0 and d2 > 0) or (d1 < 0 and d2 < 0):
+        return [], []
+    if (d3 > 0 and d4 > 0) or (d3 < 0 and d4 < 0):
+        return [], []
+
+    split_a, split_b = [], []
+    if d1 == d2 == d3 == d4 == 0:
+        # Collinear segments: split each one at the endpoints of the other
+        for p in ((bx0, by0), (bx1, by1)):
+            if _strictly_inside(a, p):
+                split_a.append(p)
+        for p in ((ax0, ay0), (ax1, ay1)):
+            if _strictly_inside(b, p):
+                split_b.append(p)
+        return split_a, split_b
+
+    if d1 == 0 or d2 == 0 or d3 == 0 or d4 == 0:
+        # An endpoint touches the other segment
+        if d1 == 0 and _strictly_inside(b, (ax0, ay0)):
+            split_b.append((ax0, ay0))
+        if d2 == 0 and _strictly_inside(b, (ax1, ay1)):
+            split_b.append((ax1, ay1))
+        if d3 == 0 and _strictly_inside(a, (bx0, by0)):
+            split_a.append((bx0, by0))
+        if d4 == 0 and _strictly_inside(a, (bx1, by1)):
+            split_a.append((bx1, by1))
+        return split_a, split_b
+
+    # Proper crossing
+    t = d1 / (d1 - d2)
+    p = (ax0 + t * (ax1 - ax0), ay0 + t * (ay1 - ay0))
+    return [p], [p]
+
+
+def segments_intersect(a, b):
+    """
+    Return True if the closed segments a and b have at least one common
+    point.
+
+    Segments are (x0, y0, x1, y1) tuples.
+
+    Example:
+        >>> segments_intersect((0, 0, 2, 2), (0, 2, 2, 0))
+        True
+        >>> segments_intersect((0, 0, 1, 0), (2, 0, 3, 0))
+        False
+    """
+
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    d1 = orientation(bx0, by0, bx1, by1, ax0, ay0)
+    d2 = orientation(bx0, by0, bx1, by1, ax1, ay1)
+    d3 = orientation(ax0, ay0, ax1, ay1, bx0, by0)
+    d4 = orientation(ax0, ay0, ax1, ay1, bx1, by1)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and \
+            ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    a0, a1, b0, b1 = (ax0, ay0), (ax1, ay1), (bx0, by0), (bx1, by1)
+    return ((d1 == 0 and _on_segment(b0, b1, a0)) or
+            (d2 == 0 and _on_segment(b0, b1, a1)) or
+            (d3 == 0 and _on_segment(a0, a1, b0)) or
+            (d4 == 0 and _on_segment(a0, a1, b1)))
+
+
+def _strictly_inside(segment, p):
+    # Test if p, assumed collinear with segment, is in its open interior.
+    x0, y0, x1, y1 = segment
+    x, y = p
+    if (x, y) == (x0, y0) or (x, y) == (x1, y1):
+        return False
+    dot = (x - x0) * (x1 - x0) + (y - y0) * (y1 - y0)
+    return 0 < dot < (x1 - x0) ** 2 + (y1 - y0) ** 2
+
+
+def is_simple_coords(points):
+    """
+    Return True if the closed polygon with the given vertices does not
+    intersect itself.
+
+    Uses the Shamos-Hoey sweep: edges are kept in a list ordered by their
+    height at the sweep line and each edge is only tested against its
+    neighbors in that list. The sweep stops at the first intersection and
+    runs in O(n log n) comparisons. The list is a plain Python list, hence
+    each insertion and removal also moves O(n) references in the worst case.
+
+    Adjacent edges may only share their common vertex. Repeated vertices and
+    edges that fold back over the previous edge make the polygon non-simple.
+
+    Example:
+        >>> is_simple_coords([(0, 0), (2, 0), (2, 2), (0, 2)])
+        True
+        >>> is_simple_coords([(0, 0), (2, 2), (2, 0), (0, 2)])
+        False
+    """
+
+    pts = [(float(x), float(y)) for x, y in points]
+    n = len(pts)
+    if n < 3:
+        return False
+    edges = []
+    for i in range(n):
+        p, q = pts[i], pts[(i + 1) % n]
+        if p == q:
+            return False
+        edges.append((p, q) if p < q else (q, p))
+
+    events = []
+    for i, (p, q) in enumerate(edges):
+        events.append((p, 0, i))
+        events.append((q, 1, i))
+    events.sort()
+
+    # Order of edges at the sweep line: height at x and slope
+    lines = []
+    for (x0, y0), (x1, y1) in edges:
+        if x0 == x1:
+            lines.append((x0, y0, None))
+        else:
+            lines.append((x0, y0, (y1 - y0) / (x1 - x0)))
+
+    def key(i, x):
+        x0, y0, slope = lines[i]
+        if slope is None:
+            return y0, float('inf')
+        return y0 + (x - x0) * slope, slope
+
+    def conflict(i, j):
+        if i is None or j is None:
+            return False
+        return _edges_conflict(pts, i, j)
+
+    def search(k, x):
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(status[mid], x) < k:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    status = []
+    for (x, y), kind, i in events:
+        if kind == 0:
+            lo = search(key(i, x), x)
+            status.insert(lo, i)
+            below = status[lo - 1] if lo > 0 else None
+            above = status[lo + 1] if lo + 1 < len(status) else None
+            if conflict(i, below) or conflict(i, above):
+                return False
+        else:
+            # Find the first edge at the same height and walk to edge i
+            pos = search((key(i, x)[0], -float('inf')), x)
+            while pos < len(status) and status[pos] != i:
+                pos += 1
+            if pos == len(status):
+                pos = status.index(i)
+            below = status[pos - 1] if pos > 0 else None
+            above = status[pos + 1] if pos + 1 < len(status) else None
+            del status[pos]
+            if conflict(below, above):
+                return False
+    return True
+
+
+def self_intersections_coords(points):
+    """
+    Return a sorted list with the points in which the edges of the closed
+    polygon with the given vertices intersect each other.
+
+    Simple polygons are detected by :func:`is_simple_coords` and return
+    early. Otherwise the intersections are reported by the Bentley-Ottmann
+    sweep, which only tests edges that become neighbors at the sweep line.
+    It runs in O((n + k) log n) comparisons for k intersections, but each
+    update of the list of active edges also moves O(n) references. Adjacent
+    edges only count if they overlap beyond their common vertex.
+
+    Example:
+        >>> self_intersections_coords([(0, 0), (2, 2), (2, 0), (0, 2)])
+        [(1.0, 1.0)]
+    """
+
+    pts = [(float(x), float(y)) for x, y in points]
+    n = len(pts)
+    if is_simple_coords(pts):
+        return []
+
+    # Edges are swept from their lowest to their highest endpoint. Zero length
+    # edges only take part in the events of their vertex.
+    segments = [pts[i] + pts[(i + 1) % n] for i in range(n)]
+    starts, ends, lines = {}, {}, []
+    for i, (x0, y0, x1, y1) in enumerate(segments):
+        p, q = sorted([(x0, y0), (x1, y1)])
+        starts.setdefault(p, set()).add(i)
+        ends.setdefault(q, set()).add(i)
+        if p == q:
+            lines.append(None)
+        elif p[0] == q[0]:
+            lines.append((p, q, float('inf')))
+        else:
+            lines.append((p, q, (q[1] - p[1]) / (q[0] - p[0])))
+
+    queue = list(set(starts) | set(ends))
+    heapq.heapify(queue)
+    scheduled = set(queue)
+    inner = {}
+
+    def height(i, x, y):
+        (x0, y0), (_, y1), slope = lines[i]
+        if slope == float('inf'):
+            return min(max(y, y0), y1)
+        return y0 + (x - x0) * slope
+
+    def search(x, y):
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if height(status[mid], x, y) < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def touches(i, p):
+        a, b, _ = lines[i]
+        return orientation(*a, *b, *p) == 0 and _on_segment(a, b, p)
+
+    def snap(q, i):
+        # Crossings with vertical or horizontal edges must not fall behind
+        # the sweep line due to rounding errors
+        (x0, y0), (x1, y1), _ = lines[i]
+        if x0 == x1:
+            q = (x0, q[1])
+        if y0 == y1:
+            q = (q[0], y0)
+        return q
+
+    def check(i, j, p):
+        # Schedule the intersections of edges i and j after the event p
+        if i > j:
+            i, j = j, i
+        split_i, split_j = segment_intersection(segments[i], segments[j])
+        for k, split in ((i, split_i), (j, split_j)):
+            for q in split:
+                q = snap(snap(q, i), j)
+                if q > p:
+                    inner.setdefault(q, set()).add(k)
+                    if q not in scheduled:
+                        scheduled.add(q)
+                        heapq.heappush(queue, q)
+
+    status = []
+    found = []
+    while queue:
+        p = heapq.heappop(queue)
+        x, y = p
+        upper = starts.get(p, set())
+        lower = ends.get(p, set())
+        crossing = inner.pop(p, set()) - upper - lower
+
+        # Active edges that pass through p are contiguous in the status. Edges
+        # that only pass within rounding errors of p are reordered but do
+        # not report p.
+        passing = set()
+        tol = 1e-9 * (abs(x) + abs(y))
+        pos = search(x, y)
+        for indexes in (range(pos - 1, -1, -1), range(pos, len(status))):
+            for k in indexes:
+                i = status[k]
+                if i in crossing or i in lower:
+                    continue
+                if touches(i, p):
+                    crossing.add(i)
+                elif abs(height(i, x, y) - y) <= tol:
+                    passing.add(i)
+                else:
+                    break
+
+        touching = upper | lower
+        if crossing and len(touching | crossing) > 1:
+            found.append(p)
+        elif any(not _adjacent(i, j, n)
+                 for i, j in combinations(sorted(touching), 2)):
+            found.append(p)
+
+        # Edges crossing at p are reinserted in the order they leave p
+        for i in lower | crossing | passing:
+            if lines[i] is not None:
+                status.remove(i)
+        new = sorted((i for i in upper | crossing | passing
+                      if lines[i] is not None),
+                     key=lambda i: (lines[i][2], i))
+        pos = search(x, y)
+        status[pos:pos] = new
+        if new:
+            for i, j in zip(new, new[1:]):
+                check(i, j, p)
+            if pos > 0:
+                check(status[pos - 1], new[0], p)
+            end = pos + len(new)
+            if end < len(status):
+                check(new[-1], status[end], p)
+        elif 0 < pos < len(status):
+            check(status[pos - 1], status[pos], p)
+    return found
+
+
+def _adjacent(i, j, n):
+    return (i - j) % n in (1, n - 1)
+
+
+def _edges_conflict(pts, i, j):
+    # Test if edges i -> i + 1 and j -> j + 1 of a closed polygon intersect
+    # anywhere besides a shared vertex of adjacent edges.
+    n = len(pts)
+    a0, a1 = pts[i], pts[(i + 1) % n]
+    b0, b1 = pts[j], pts[(j + 1) % n]
+    if _adjacent(i, j, n):
+        if n == 3:
+            # Triangles are simple unless they are degenerate
+            return orientation(*pts[0], *pts[1], *pts[2]) == 0
+        if j == (i + 1) % n:
+            p, q, r = a0, a1, b1
+        else:
+            p, q, r = b0, b1, a1
+        # Fold back: collinear edges pointing in opposite directions
+        turn = orientation(*p, *q, *r)
+        dot = (q[0] - p[0]) * (r[0] - q[0]) + (q[1] - p[1]) * (r[1] - q[1])
+        return turn == 0 and dot < 0
+
+    return segments_intersect(a0 + a1, b0 + b1)
+
+
+def _on_segment(p, q, r):
+    # Test if r, assumed collinear with p and q, is in the closed segment pq.
+    return (min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and
+            min(p[1], q[1]) <= r[1] <= max(p[1], q[1]))
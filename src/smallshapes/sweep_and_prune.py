@@ -0,0 +1,150 @@
+"""
+Sweep and prune broadphase.
+
+The broadphase sorts the shadows of each shape's AABB along one axis and only
+reports pairs whose shadows overlap in both directions. Pairs are meant to be
+passed to a narrowphase test such as :func:`smallshapes.SAT.sat`.
+"""
+
+from smallshapes.SAT import sat
+
+
+class SweepAndPrune:
+    """
+    Sweep and prune broadphase for a collection of shapes.
+
+    Shapes can be any object with an ``aabb`` property. The sorted order is
+    kept between calls to :meth:`update`, so objects that move a little each
+    frame are re-sorted with an insertion sort in nearly O(n) time.
+
+    Args:
+        shapes:
+            Initial sequence of shapes.
+        axis:
+            Sweep direction: 'x' (default) or 'y'. Choose the axis in which
+            the shapes are more spread out.
+
+    Example:
+        >>> from smallshapes import Circle
+        >>> a, b, c = Circle(1, (0, 0)), Circle(1, (1, 0)), Circle(1, (5, 0))
+        >>> sap = SweepAndPrune([a, b, c])
+        >>> list(sap.pairs()) == [(a, b)]
+        True
+        >>> sap.pruned
+        2
+    """
+
+    def __init__(self, shapes=(), axis='x'):
+        if axis not in ('x', 'y'):
+            raise ValueError('axis must be either "x" or "y"')
+        self.axis = axis
+        self.candidates = 0
+        self.pruned = 0
+        self._entries = []
+        for shape in shapes:
+            self._entries.append(self._entry(shape))
+        self._entries.sort(key=lambda x: x[0])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry[4] for entry in self._entries)
+
+    def __contains__(self, shape):
+        return any(entry[4] is shape for entry in self._entries)
+
+    def _entry(self, shape):
+        # Entries are [min, max, other_min, other_max, shape] where min and
+        # max are the limits of the shadow on the sweep axis.
+        aabb = shape.aabb
+        if self.axis == 'x':
+            (a, b), (c, d) = aabb.shadow_x(), aabb.shadow_y()
+        else:
+            (a, b), (c, d) = aabb.shadow_y(), aabb.shadow_x()
+        return [a, b, c, d, shape]
+
+    def add(self, shape):
+        """
+        Insert a new shape into the broadphase.
+        """
+
+        entry = self._entry(shape)
+        entries = self._entries
+        idx = len(entries)
+        while idx > 0 and entries[idx - 1][0] > entry[0]:
+            idx -= 1
+        entries.insert(idx, entry)
+
+    def remove(self, shape):
+        """
+        Remove shape from broadphase.
+
+        Raises ValueError if shape is not present.
+        """
+
+        for idx, entry in enumerate(self._entries):
+            if entry[4] is shape:
+                del self._entries[idx]
+                return
+        raise ValueError('shape is not in broadphase')
+
+    def update(self):
+        """
+        Refresh the AABB shadows of all shapes and restore the sort order.
+
+        Should be called after shapes move.
+        """
+
+        entries = self._entries
+        for idx, entry in enumerate(entries):
+            entries[idx] = self._entry(entry[4])
+
+        # Insertion sort: it runs in O(n) if the shapes moved only a little
+        # since the last update.
+        for i in range(1, len(entries)):
+            entry = entries[i]
+            key = entry[0]
+            j = i - 1
+            while j >= 0 and entries[j][0] > key:
+                entries[j + 1] = entries[j]
+                j -= 1
+            entries[j + 1] = entry
+
+    def pairs(self):
+        """
+        Iterate over all pairs of shapes whose AABBs overlap.
+
+        After the iteration is complete, the ``candidates`` and ``pruned``
+        attributes store respectively the number of pairs reported and the
+        number of pairs that were discarded.
+        """
+
+        entries = self._entries
+        size = len(entries)
+        candidates = 0
+        for i in range(size):
+            a_min, a_max, a_omin, a_omax, a = entries[i]
+            for j in range(i + 1, size):
+                b_min, _, b_omin, b_omax, b = entries[j]
+                if b_min > a_max:
+                    break
+                if b_omin <= a_omax and a_omin <= b_omax:
+                    candidates += 1
+                    yield a, b
+        self.candidates = candidates
+        self.pruned = size * (size - 1) // 2 - candidates
+
+    def collisions(self, test=sat):
+        """
+        Iterate over (A, B, result) for all candidate pairs for which the
+        narrowphase ``test(A, B)`` returns a value that is not None.
+
+        The default narrowphase is :func:`smallshapes.SAT.sat` and ``result``
+        is the minimum penetration vector.
+        """
+
+        for a, b in self.pairs():
+            result = test(a, b)
+            if result is not None:
+                yield a, b, result
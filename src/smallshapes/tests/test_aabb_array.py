@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from smallshapes import AABB, AABBArray
+
+
+@pytest.fixture
+def boxes():
+    return AABBArray([(0, 1, 0, 1), (0.5, 2, 0.5, 2), (3, 4, 0, 1)])
+
+
+def test_aabb_array_element_access(boxes):
+    assert len(boxes) == 3
+    assert boxes[0] == AABB(0, 1, 0, 1)
+    assert list(boxes)[2] == AABB(3, 4, 0, 1)
+    assert isinstance(boxes[1:], AABBArray)
+    assert len(boxes[1:]) == 2
+
+
+def test_aabb_array_setitem(boxes):
+    boxes[0] = AABB(1, 2, 3, 4)
+    assert boxes[0] == AABB(1, 2, 3, 4)
+
+
+def test_aabb_array_invalid_coords():
+    with pytest.raises(ValueError):
+        AABBArray([(1, 0, 0, 1)])
+
+
+def test_aabb_array_setitem_invalid_coords(boxes):
+    with pytest.raises(ValueError):
+        boxes[0] = (1, 0, 0, 1)
+    with pytest.raises(ValueError):
+        boxes[1:] = [(0, 1, 0, 1), (0, 1, 1, 0)]
+    assert boxes == AABBArray([(0, 1, 0, 1), (0.5, 2, 0.5, 2), (3, 4, 0, 1)])
+
+
+def test_aabb_array_repr():
+    boxes = AABBArray([(0.25, 1, 0, 1e-3)])
+    assert repr(boxes) == 'AABBArray([(0.25, 1.0, 0.0, 0.001)])'
+
+
+def test_aabb_array_matches_aabb_methods(boxes):
+    assert list(boxes.area()) == [box.area() for box in boxes]
+    assert list(boxes.contains_point((0.75, 0.75))) == [True, True, False]
+    moved = boxes.move_vec((1, 2))
+    assert list(moved) == [box.move_vec((1, 2)) for box in boxes]
+    scaled = boxes.rescale(2)
+    assert list(scaled) == [box.rescale(2) for box in boxes]
+
+
+def test_aabb_array_inplace_move(boxes):
+    boxes.imove_vec([(1, 0), (0, 1), (0, 0)])
+    assert boxes[0] == AABB(1, 2, 0, 1)
+    assert boxes[1] == AABB(0.5, 2, 1.5, 3)
+
+
+def test_aabb_array_bounding_box(boxes):
+    assert boxes.aabb == AABB(0, 4, 0, 2)
+
+
+def test_aabb_array_overlap_pairs(boxes):
+    assert boxes.overlap_pairs().tolist() == [[0, 1]]
+    assert list(boxes.overlaps_aabb(AABB(1.5, 3.5, 0, 1))) == [False, True, True]
+
+
+def test_aabb_array_overlap_pairs_chunks():
+    np.random.seed(0)
+    xy = np.random.uniform(0, 10, (50, 2))
+    boxes = AABBArray(np.column_stack([xy[:, 0], xy[:, 0] + 1,
+                                       xy[:, 1], xy[:, 1] + 1]))
+    expected = boxes.overlap_pairs()
+    assert boxes.overlap_pairs(chunk_size=7).tolist() == expected.tolist()
+
+    brute = [[i, j] for i, a in enumerate(boxes) for j, b in enumerate(boxes)
+             if i < j and boxes[i:i + 1].overlaps_aabb(b)[0]]
+    assert expected.tolist() == brute
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from smallshapes import AABB, Circle, mCircle
+from smallshapes.aabb_tree import AABBTree
+
+
+def fat_overlaps(a, b, margin):
+    m = margin
+    return (a.xmin - m <= b.xmax and b.xmin <= a.xmax + m and
+            a.ymin - m <= b.ymax and b.ymin <= a.ymax + m)
+
+
+@pytest.fixture
+def circles():
+    rnd = random.Random(0)
+    return [mCircle(rnd.uniform(0.2, 1), (rnd.uniform(0, 50),
+                                          rnd.uniform(0, 50)))
+            for _ in range(200)]
+
+
+@pytest.fixture
+def tree(circles):
+    tree = AABBTree(circles)
+    tree.validate()
+    return tree
+
+
+def test_tree_is_balanced(tree):
+    assert len(tree) == 200
+    assert tree.height <= 2 * 8
+
+
+def test_tree_query_point(tree, circles):
+    point = AABB(25, 25, 25, 25)
+    found = {id(c) for c in tree.query_point((25, 25))}
+    assert found == {id(c) for c in circles
+                     if fat_overlaps(c, point, tree.margin)}
+
+
+def test_tree_query_aabb(tree, circles):
+    box = AABB(10, 20, 10, 30)
+    found = {id(c) for c in tree.query_aabb(box)}
+    assert found == {id(c) for c in circles if fat_overlaps(c, box, tree.margin)}
+
+
+def test_tree_query_ray():
+    a, b, c = AABB(2, 3, -1, 1), AABB(5, 6, -1, 1), AABB(2, 3, 5, 6)
+    tree = AABBTree([a, b, c], margin=0)
+    hits = {id(x) for x in tree.query_ray((0, 0), (10, 0))}
+    assert hits == {id(a), id(b)}
+    hits = {id(x) for x in tree.query_ray((0, 0), (10, 0), max_fraction=0.4)}
+    assert hits == {id(a)}
+    hits = {id(x) for x in tree.query_ray((2.5, 10), (0, -1), max_fraction=20)}
+    assert hits == {id(a), id(c)}
+
+
+def test_tree_pairs(tree, circles):
+    found = {frozenset([id(a), id(b)]) for a, b in tree.pairs()}
+    expected = {frozenset([id(a), id(b)])
+                for i, a in enumerate(circles) for b in circles[i + 1:]
+                if fat_overlaps(a, b, 2 * tree.margin)}
+    assert found == expected
+
+
+def test_tree_remove(tree, circles):
+    for circle in circles[::2]:
+        tree.remove(circle)
+        tree.validate()
+    assert len(tree) == 100
+    assert circles[0] not in tree
+    assert circles[1] in tree
+    with pytest.raises(ValueError):
+        tree.remove(circles[0])
+
+
+def test_tree_update(tree, circles):
+    circle = circles[0]
+    circle.imove_vec((tree.margin / 2, 0))
+    assert tree.update(circle) is False
+    circle.imove_vec((10, 10))
+    assert tree.update(circle) is True
+    tree.validate()
+    assert id(circle) in {id(c) for c in tree.query_point(circle.pos)}
+
+
+def test_tree_update_all(tree, circles):
+    rnd = random.Random(1)
+    for circle in circles:
+        circle.imove_vec((rnd.uniform(-5, 5), rnd.uniform(-5, 5)))
+    assert tree.update_all() > 0
+    tree.validate()
+
+
+def test_tree_with_immutable_shapes():
+    shapes = [Circle(1, (i, 0)) for i in range(10)]
+    tree = AABBTree(shapes)
+    tree.validate()
+    with pytest.raises(ValueError):
+        tree.insert(shapes[0])
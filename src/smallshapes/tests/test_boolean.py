@@ -0,0 +1,130 @@
+import random
+from math import cos, pi, sin
+
+import pytest
+
+from smallshapes import AABB, Poly, area
+from smallshapes.boolean import difference, intersection, union, union_all, \
+    xor, _link
+from smallshapes.clipping import clip_coords
+from smallshapes.sweep import box_pairs, segment_intersection
+
+
+def star(rnd, x, y, radius, sides, convex=False):
+    angles = sorted(rnd.uniform(0, 2 * pi) for _ in range(sides))
+    radii = [radius if convex else rnd.uniform(0.3, 1) * radius
+             for _ in angles]
+    return Poly(*[(x + r * cos(t), y + r * sin(t))
+                  for r, t in zip(radii, angles)])
+
+
+def region_area(polys):
+    return sum(p.area() for p in polys)
+
+
+def test_box_pairs_matches_brute_force():
+    rnd = random.Random(0)
+    boxes = []
+    for _ in range(100):
+        x, y = rnd.uniform(0, 10), rnd.uniform(0, 10)
+        boxes.append((x, x + rnd.uniform(0, 2), y, y + rnd.uniform(0, 2)))
+    expected = {(i, j) for i in range(100) for j in range(i + 1, 100)
+                if boxes[i][0] <= boxes[j][1] and boxes[j][0] <= boxes[i][1]
+                and boxes[i][2] <= boxes[j][3] and boxes[j][2] <= boxes[i][3]}
+    assert set(box_pairs(boxes)) == expected
+
+
+def test_segment_intersection_cases():
+    assert segment_intersection((0, 0, 2, 2), (0, 2, 2, 0)) == \
+        ([(1.0, 1.0)], [(1.0, 1.0)])
+    assert segment_intersection((0, 0, 2, 0), (1, 0, 1, 1)) == \
+        ([(1, 0)], [])
+    assert segment_intersection((0, 0, 4, 0), (1, 0, 6, 0)) == \
+        ([(1, 0)], [(4, 0)])
+    assert segment_intersection((0, 0, 1, 0), (2, 0, 3, 0)) == ([], [])
+
+
+def test_squares():
+    A = Poly((0, 0), (2, 0), (2, 2), (0, 2))
+    B = Poly((1, 1), (3, 1), (3, 3), (1, 3))
+    assert region_area(union(A, B)) == 7
+    assert region_area(intersection(A, B)) == 1
+    assert region_area(difference(A, B)) == 3
+    assert region_area(xor(A, B)) == 6
+    assert len(union(A, B)[0]) == 8
+
+
+def test_hole():
+    A = Poly((0, 0), (4, 0), (4, 4), (0, 4))
+    B = Poly((1, 1), (3, 1), (3, 3), (1, 3))
+    result = difference(A, B)
+    assert sorted(p.area() for p in result) == [-4, 16]
+    assert [(len(p), p.area()) for p in union(A, B)] == [(4, 16)]
+    assert region_area(intersection(A, B)) == 4
+
+
+def test_disjoint_and_touching():
+    A = Poly((0, 0), (1, 0), (1, 1), (0, 1))
+    B = Poly((1, 0), (2, 0), (2, 1), (1, 1))
+    C = Poly((5, 5), (6, 5), (6, 6))
+    assert region_area(union(A, B)) == 2
+    assert len(union(A, B)) == 1
+    assert len(union(A, C)) == 2
+    assert intersection(A, C) == []
+    assert region_area(intersection(A, B)) == 0
+    assert region_area(difference(A, B)) == 1
+
+
+def test_clockwise_input():
+    A = Poly((0, 0), (0, 2), (2, 2), (2, 0))
+    B = AABB(1, 3, 1, 3)
+    assert region_area(union(A, B)) == 7
+
+
+def test_convex_intersection_matches_clipping():
+    rnd = random.Random(3)
+    for _ in range(50):
+        A = star(rnd, 0, 0, 2, rnd.randint(3, 8), convex=True)
+        B = star(rnd, rnd.uniform(-2, 2), rnd.uniform(-2, 2), 2,
+                 rnd.randint(3, 8), convex=True)
+        expected = clip_coords(A, B)
+        expected = area(expected) if len(expected) else 0
+        assert region_area(intersection(A, B)) == pytest.approx(expected)
+
+
+def test_area_identities_for_non_convex_polygons():
+    rnd = random.Random(4)
+    for _ in range(50):
+        A = star(rnd, 0, 0, 3, rnd.randint(5, 20))
+        B = star(rnd, rnd.uniform(-2, 2), rnd.uniform(-2, 2), 3,
+                 rnd.randint(5, 20))
+        a, b = A.area(), B.area()
+        i = region_area(intersection(A, B))
+        assert region_area(union(A, B)) == pytest.approx(a + b - i)
+        assert region_area(difference(A, B)) == pytest.approx(a - i)
+        assert region_area(difference(B, A)) == pytest.approx(b - i)
+        assert region_area(xor(A, B)) == pytest.approx(a + b - 2 * i)
+
+
+def test_link_closed_and_open_chains():
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    edges = list(zip(square, square[1:] + square[:1]))
+    assert len(_link(edges)) == 1
+    with pytest.raises(ValueError):
+        _link(edges[:-1])
+
+
+def test_union_all():
+    cells = [AABB(i, i + 1, j, j + 1) for i in range(5) for j in range(5)
+             if (i, j) != (2, 2)]
+    result = union_all(cells)
+    assert sorted(p.area() for p in result) == [-1, 25]
+
+    rnd = random.Random(5)
+    polys = [star(rnd, rnd.uniform(0, 10), rnd.uniform(0, 10), 1.5, 8)
+             for _ in range(30)]
+    merged = union_all(polys)
+    expected = []
+    for poly in polys:
+        expected = union(expected, poly) if expected else [poly]
+    assert region_area(merged) == pytest.approx(region_area(expected))
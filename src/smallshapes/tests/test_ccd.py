@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from smallshapes import AABB, Circle, Segment, mCircle
+from smallshapes.ccd import time_of_impact
+from smallshapes.SAT import sat
+from smallvectors import simeq
+
+
+def moved(shape, vel, t):
+    vx, vy = vel
+    return shape.move(vx * t, vy * t)
+
+
+def test_circle_circle():
+    result = time_of_impact(Circle(1, (0, 0)), (5, 0),
+                            Circle(1, (10, 0)), (-5, 0))
+    t, normal = result
+    assert simeq(t, 0.8)
+    assert simeq(normal, (1, 0))
+
+
+def test_circle_circle_miss():
+    assert time_of_impact(Circle(1, (0, 0)), (0, 0),
+                          Circle(1, (10, 5)), (-20, 0)) is None
+    assert time_of_impact(Circle(1, (0, 0)), (0, 0),
+                          Circle(1, (10, 0)), (-5, 0)) is None
+    assert time_of_impact(Circle(1, (0, 0)), (0, 0),
+                          Circle(1, (10, 0)), (5, 0)) is None
+
+
+def test_initial_overlap_returns_zero():
+    t, normal = time_of_impact(Circle(1, (0, 0)), (0, 0),
+                               Circle(1, (1, 0)), (5, 0))
+    assert t == 0
+    assert simeq(normal, (1, 0))
+    t, normal = time_of_impact(AABB(0, 4, 0, 4), (0, 0),
+                               AABB(3, 5, 1, 2), (0, 0))
+    assert t == 0
+    assert simeq(normal, (1, 0))
+
+
+def test_fast_circle_does_not_tunnel_through_thin_wall():
+    ball = mCircle(0.1, (0, 0))
+    wall = AABB(5, 5.01, -1, 1)
+    assert sat(moved(ball, (10, 0), 1), wall) is None
+    t, normal = time_of_impact(ball, (10, 0), wall, (0, 0))
+    assert simeq(t, 0.49)
+    assert simeq(normal, (1, 0))
+    t, normal = time_of_impact(wall, (0, 0), ball, (10, 0))
+    assert simeq(t, 0.49)
+    assert simeq(normal, (-1, 0))
+
+
+def test_circle_hits_aabb_corner():
+    box = AABB(0, 2, 0, 2)
+    ball = Circle(1, (-2, -2))
+    t, normal = time_of_impact(ball, (4, 4), box, (0, 0))
+    expected = (2 * 2 ** 0.5 - 1) / (4 * 2 ** 0.5)
+    assert simeq(t, expected)
+    assert simeq(normal, (2 ** -0.5, 2 ** -0.5))
+
+
+def test_aabb_aabb():
+    t, normal = time_of_impact(AABB(0, 1, 0, 1), (0, 0),
+                               AABB(0.5, 1.5, 3, 4), (0, -4))
+    assert simeq(t, 0.5)
+    assert simeq(normal, (0, 1))
+    assert time_of_impact(AABB(0, 1, 0, 1), (0, 0),
+                          AABB(3, 4, 3, 4), (0, -4)) is None
+
+
+def test_circle_segment():
+    seg = Segment((0, 0), (4, 0))
+    t, normal = time_of_impact(Circle(1, (2, 3)), (0, -4), seg, (0, 0))
+    assert simeq(t, 0.5)
+    assert simeq(normal, (0, -1))
+    t, normal = time_of_impact(seg, (0, 0), Circle(1, (6, 0)), (-4, 0))
+    assert simeq(t, 0.25)
+    assert simeq(normal, (1, 0))
+    assert time_of_impact(seg, (0, 0), Circle(1, (6, 3)), (-4, 0)) is None
+
+
+def test_contact_time_is_first_touch():
+    rnd = random.Random(0)
+    for _ in range(200):
+        A = Circle(rnd.uniform(0.2, 1), (rnd.uniform(-5, 5), 0))
+        B = rnd.choice([
+            AABB(*sorted([rnd.uniform(-5, 5), rnd.uniform(-5, 5)]) +
+                 sorted([rnd.uniform(-5, 5), rnd.uniform(-5, 5)])),
+            Circle(rnd.uniform(0.2, 1), (rnd.uniform(-5, 5), 3)),
+        ])
+        velA = (rnd.uniform(-10, 10), rnd.uniform(-10, 10))
+        velB = (rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+        result = time_of_impact(A, velA, B, velB)
+        if result is None or result[0] == 0:
+            continue
+        t, normal = result
+        assert 0 < t <= 1
+        before = sat(moved(A, velA, t * 0.999), moved(B, velB, t * 0.999))
+        after = sat(moved(A, velA, t * 1.001 + 1e-9),
+                    moved(B, velB, t * 1.001 + 1e-9))
+        assert before is None
+        assert after is not None
+
+
+def test_unsupported_pair():
+    with pytest.raises(NotImplementedError):
+        time_of_impact(Segment((0, 0), (1, 0)), (0, 0),
+                       Segment((0, 1), (1, 1)), (0, 0))
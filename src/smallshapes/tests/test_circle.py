@@ -1,5 +1,7 @@
+import tracemalloc
+
 from smallshapes.tests import abstract as base
-from smallshapes import Circle, mCircle
+from smallshapes import Circle, CircleAny, mCircle
 
 
 class TestCircle(base.TestMutability, base.TestSolid):
@@ -17,3 +19,50 @@ class TestCircle(base.TestMutability, base.TestSolid):
         assert repr(Circle(1, (2, 3))) == 'Circle(1, (2, 3))'
         assert repr(mCircle(1, (2, 3))) == 'mCircle(1, (2, 3))'
 
+
+class TestCircleFastPaths:
+    def test_circle_predicates(self):
+        A = Circle(2, (0, 0))
+        assert A.contains_point((1, 1))
+        assert not A.contains_point((2, 1))
+        assert A.contains_circle(Circle(1, (0.5, 0)))
+        assert not A.contains_circle(Circle(1, (1.5, 0)))
+        assert not A.contains_circle(Circle(3, (0, 0)))
+        assert A.overlaps_circle(Circle(1, (3, 0)))
+        assert not A.overlaps_circle(Circle(1, (3.1, 0)))
+        assert A.distance_circle(Circle(1, (6, 0))) == 3
+        assert A.shadow((0, 1)) == (-2, 2)
+
+    def test_hot_methods_do_not_create_vectors(self, monkeypatch):
+        A, B = Circle(2, (0, 0)), mCircle(1, (0.5, 0.5))
+        Vec = type(A.pos)
+
+        def fail(*args):
+            raise AssertionError('unexpected vector allocation')
+
+        monkeypatch.setattr(CircleAny, '_vec', fail)
+        n = Vec(0, 1)
+        assert A.contains_point((1, 1))
+        assert A.contains_point(n)
+        assert A.contains_circle(B)
+        assert A.overlaps_circle(B)
+        assert B.distance_circle(A) == 0
+        assert A.distance_point((3, 0)) == 1
+        assert A.shadow(n) == (-2, 2)
+
+    def test_circle_queries_do_not_allocate(self):
+        A, B = Circle(2, (0, 0)), mCircle(1, (0.5, 0.5))
+        queries = [A.distance_circle, A.contains_circle, A.overlaps_circle]
+        for query in queries:
+            query(B)
+
+        # Memory used by N calls must not grow with N
+        tracemalloc.start()
+        try:
+            for _ in range(1000):
+                for query in queries:
+                    query(B)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 1024
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from smallshapes import AABBArray, Circle, CircleArray
+from smallvectors import Vec
+
+
+@pytest.fixture
+def circles():
+    return CircleArray([(1, 0, 0), (1, 1.5, 0), (0.5, 5, 5)])
+
+
+def brute_force_pairs(A, B=None):
+    other = A if B is None else B
+    out = []
+    for i, a in enumerate(A):
+        for j, b in enumerate(other):
+            if B is None and j <= i:
+                continue
+            if abs(a.pos - b.pos) <= a.radius + b.radius:
+                out.append([i, j])
+    return out
+
+
+def test_circle_array_element_access(circles):
+    assert len(circles) == 3
+    assert circles[0] == Circle(1, (0, 0))
+    assert list(circles)[2] == Circle(0.5, (5, 5))
+    assert isinstance(circles[1:], CircleArray)
+    assert len(circles[1:]) == 2
+    assert circles.pos.tolist() == [[0, 0], [1.5, 0], [5, 5]]
+
+
+def test_circle_array_constructors(circles):
+    shapes = list(circles)
+    assert CircleArray(shapes) == circles
+    assert CircleArray.from_shapes(shapes) == circles
+    assert CircleArray([(c.radius, c.pos) for c in shapes]) == circles
+    assert CircleArray.from_coords(*circles.data.T) == circles
+    assert len(CircleArray()) == 0
+    with pytest.raises(ValueError):
+        CircleArray([(-1, 0, 0)])
+
+
+def test_circle_array_setitem(circles):
+    circles[0] = Circle(2, (1, 2))
+    assert circles[0] == Circle(2, (1, 2))
+
+
+def test_circle_array_setitem_negative_radius(circles):
+    with pytest.raises(ValueError):
+        circles[0] = (-1, 0, 0)
+    with pytest.raises(ValueError):
+        circles[:, 0] = -1
+    assert circles == CircleArray([(1, 0, 0), (1, 1.5, 0), (0.5, 5, 5)])
+
+
+def test_circle_array_repr():
+    circles = CircleArray([(0.25, 0, 1e-3)])
+    assert repr(circles) == 'CircleArray([(0.25, 0.0, 0.001)])'
+
+
+def test_circle_array_matches_circle_methods(circles):
+    assert np.allclose(circles.area(), [c.area() for c in circles])
+    assert list(circles.contains_point((0.75, 0))) == \
+        [c.contains_point(Vec(0.75, 0)) for c in circles]
+    other = Circle(1, (3, 0))
+    assert np.allclose(circles.distance_circle(other),
+                       [c.distance_circle(other) for c in circles])
+    assert np.allclose(circles.distance_point((3, 3)),
+                       [c.distance_point((3, 3)) for c in circles])
+    assert list(circles.overlaps_circle(other)) == [False, True, False]
+
+
+def test_circle_array_aabb(circles):
+    boxes = circles.aabb
+    assert isinstance(boxes, AABBArray)
+    assert list(boxes) == [c.aabb for c in circles]
+
+
+def test_circle_array_many_points(circles):
+    points = np.array([(0, 0), (1.5, 0.5), (5, 5.6)])
+    mask = circles.contains_point(points)
+    assert mask.shape == (3, 3)
+    expected = [[c.contains_point(Vec(*p)) for p in points.tolist()]
+                for c in circles]
+    assert mask.tolist() == expected
+    assert circles.distance_circle(circles).shape == (3, 3)
+
+
+def test_circle_array_move_and_rescale(circles):
+    moved = circles.move_vec((1, 2))
+    assert list(moved) == [c.move_vec((1, 2)) for c in circles]
+    circles.imove_vec([(1, 0), (0, 1), (0, 0)])
+    assert circles[1] == Circle(1, (1.5, 1))
+    assert circles.rescale(2).radius.tolist() == [2, 2, 1]
+
+
+def test_circle_array_overlap_pairs(circles):
+    assert circles.overlap_pairs().tolist() == [[0, 1]]
+
+
+def test_circle_array_overlap_pairs_matches_brute_force():
+    rnd = np.random.RandomState(0)
+    A = CircleArray.from_coords(rnd.uniform(0.1, 1, 80),
+                                rnd.uniform(0, 10, 80),
+                                rnd.uniform(0, 10, 80))
+    B = CircleArray.from_coords(rnd.uniform(0.1, 2, 30),
+                                rnd.uniform(0, 10, 30),
+                                rnd.uniform(0, 10, 30))
+    assert A.overlap_pairs().tolist() == brute_force_pairs(A)
+    assert A.overlap_pairs(chunk_size=7).tolist() == brute_force_pairs(A)
+    assert A.overlap_pairs(B).tolist() == brute_force_pairs(A, B)
+    assert A.overlap_pairs(CircleArray()).shape == (0, 2)
@@ -0,0 +1,82 @@
+import random
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from smallshapes import AABB, Poly, area, clip
+from smallshapes.clipping import clip_coords, clip_many
+
+
+def convex(rnd, x, y, radius, sides):
+    angles = sorted(rnd.uniform(0, 2 * pi) for _ in range(sides))
+    return [(x + radius * cos(t), y + radius * sin(t)) for t in angles]
+
+
+def reference_clip(subject, clip_poly):
+    # Straightforward Sutherland-Hodgman used as reference.
+    out = list(subject)
+    r0 = clip_poly[-1]
+    for r1 in clip_poly:
+        points, out = out, []
+        if not points:
+            break
+        tx, ty = r1[0] - r0[0], r1[1] - r0[1]
+        side = lambda p: tx * (p[1] - r0[1]) - ty * (p[0] - r0[0])
+        v0 = points[-1]
+        for v1 in points:
+            d0, d1 = side(v0), side(v1)
+            if (d0 >= 0) != (d1 >= 0):
+                t = d0 / (d0 - d1)
+                out.append((v0[0] + t * (v1[0] - v0[0]),
+                            v0[1] + t * (v1[1] - v0[1])))
+            if d1 >= 0:
+                out.append(v1)
+            v0 = v1
+        r0 = r1
+    return out
+
+
+def test_square_overlap():
+    result = clip_coords([(0, 0), (2, 0), (2, 2), (0, 2)],
+                         AABB(1, 3, 1, 3))
+    assert area(result) == 1
+
+
+def test_clockwise_clip_polygon():
+    ccw = [(1, 1), (3, 1), (3, 3), (1, 3)]
+    subject = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    assert np.allclose(clip_coords(subject, ccw),
+                       clip_coords(subject, ccw[::-1]))
+
+
+def test_rejected_and_accepted():
+    viewport = AABB(0, 10, 0, 10)
+    inside = Poly((1, 1), (2, 1), (2, 2))
+    outside = Poly((11, 11), (12, 11), (12, 12))
+    result = clip_many([inside, outside], viewport)
+    assert np.array_equal(result[0], inside.array)
+    assert result[1].shape == (0, 2)
+
+
+def test_batch_matches_reference():
+    rnd = random.Random(1)
+    clip_poly = convex(rnd, 0, 0, 5, 7)
+    subjects = [convex(rnd, rnd.uniform(-8, 8), rnd.uniform(-8, 8),
+                       rnd.uniform(0.5, 4), rnd.randint(3, 9))
+                for _ in range(200)]
+    subjects.append([])
+    results = clip_many(subjects, clip_poly)
+    assert len(results) == len(subjects)
+    for subject, result in zip(subjects, results):
+        expected = reference_clip(subject, clip_poly)
+        assert result.shape == (len(expected), 2)
+        if len(expected):
+            assert np.allclose(result, expected)
+
+
+def test_clip_function():
+    square = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    assert area(clip(square, [(1, 1), (3, 1), (3, 3), (1, 3)])) == 1
+    with pytest.raises(ValueError):
+        clip(square, [(5, 5), (6, 5), (6, 6)])
@@ -0,0 +1,94 @@
+import random
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from smallshapes import AABB, Circle, ConvexPoly, Poly, mPoly
+from smallshapes.SAT import sat, sat_compound
+from smallshapes.decomposition import Compound, convex_decomposition, \
+    convex_decomposition_indices
+
+
+def star(n, seed=0):
+    rnd = random.Random(seed)
+    angles = [2 * pi * (i + rnd.uniform(0, 0.9)) / n for i in range(n)]
+    radii = [rnd.uniform(0.2, 1) for _ in range(n)]
+    return [(r * cos(t), r * sin(t)) for r, t in zip(radii, angles)]
+
+
+def is_convex(pts):
+    pts = np.asarray(pts)
+    a = np.roll(pts, 1, axis=0) - pts
+    b = np.roll(pts, -1, axis=0) - pts
+    return (a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0] <= 1e-12).all()
+
+
+L_SHAPE = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)]
+
+
+def test_decomposition_of_star_polygons():
+    for seed in range(30):
+        pts = star(6 + seed, seed)
+        poly = Poly(*pts)
+        parts = convex_decomposition(poly)
+        assert all(is_convex(part.array) for part in parts)
+        assert np.isclose(sum(p.area() for p in parts), poly.area())
+        assert len(parts) <= len(pts) - 2
+
+
+def test_decomposition_indices_cover_all_vertices():
+    pieces = convex_decomposition_indices(L_SHAPE)
+    assert len(pieces) == 2
+    assert set().union(*pieces) == set(range(len(L_SHAPE)))
+
+
+def test_convex_polygon_has_single_part():
+    square = Poly((0, 0), (1, 0), (1, 1), (0, 1))
+    assert len(square.convex_parts()) == 1
+
+
+def test_convex_parts_are_cached():
+    poly = Poly(*L_SHAPE)
+    assert poly.convex_parts() is poly.convex_parts()
+    assert all(isinstance(p, ConvexPoly) for p in poly.convex_parts())
+
+
+def test_convex_parts_of_mutable_poly_follow_changes():
+    poly = mPoly(*L_SHAPE)
+    before = poly.convex_parts()
+    poly.imove(1, 0)
+    after = poly.convex_parts()
+    assert after is not before
+    assert after[0].xmin >= 1
+
+
+def test_compound_aabb_and_candidates():
+    shape = Compound(Poly(*L_SHAPE))
+    assert shape.rect_coords == (0, 4, 0, 4)
+    assert shape.aabb == AABB(0, 4, 0, 4)
+    assert shape.area() == 7
+    assert len(shape.candidates((2, 3, 2, 3))) == 0
+    assert len(shape.candidates((0, 4, 0, 4))) == 2
+    with pytest.raises(ValueError):
+        Compound([])
+
+
+def test_sat_compound():
+    shape = Compound(Poly(*L_SHAPE))
+
+    # Circle inside the concave region of the L, but inside its AABB
+    assert sat(shape, Circle(1, (2.5, 2.5))) is None
+    assert sat(Circle(1, (2.5, 2.5)), shape) is None
+
+    assert sat(shape, Circle(1, (2.5, 1.5))) == (0, 0.5)
+    assert sat(Circle(1, (2.5, 1.5)), shape) == (0, -0.5)
+    assert sat_compound(shape, AABB(10, 11, 10, 11)) is None
+
+
+def test_sat_compound_vs_compound():
+    A = Compound(Poly(*L_SHAPE))
+    B = Compound(Poly(*[(x + 3.5, y + 0.5) for x, y in L_SHAPE]))
+    C = Compound(Poly(*[(x + 2, y + 2) for x, y in L_SHAPE]))
+    assert sat(A, B) is not None
+    assert sat(A, C) is None
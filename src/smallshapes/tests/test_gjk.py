@@ -0,0 +1,84 @@
+import random
+from math import cos, pi, sin
+
+import pytest
+
+from smallshapes import AABB, Circle, ConvexPoly, Segment, mCircle
+from smallshapes.gjk import epa, gjk_closest_points, gjk_distance, \
+    gjk_intersects
+from smallshapes.SAT import sat
+from smallvectors import simeq
+
+
+def random_convex(rnd, x, y, radius=1.0, sides=12):
+    angles = sorted(rnd.uniform(0, 2 * pi) for _ in range(sides))
+    return ConvexPoly(*[(x + radius * cos(t), y + radius * sin(t))
+                        for t in angles])
+
+
+def poly_distance(A, B):
+    return min(min(B.distance_point(v) for v in A),
+               min(A.distance_point(v) for v in B))
+
+
+def test_support_functions():
+    assert simeq(Circle(2, (1, 1)).support((0, 1)), (1, 3))
+    assert AABB(0, 1, 0, 2).support((-1, 1)) == (0, 2)
+    assert ConvexPoly((0, 0), (2, 0), (0, 2)).support((1, 0.1)) == (2, 0)
+    assert Segment((0, 0), (1, 1)).support((-1, 0)) == (0, 0)
+
+
+def test_distance_simple_cases():
+    assert simeq(gjk_distance(Circle(1, (0, 0)), Circle(1, (5, 0))), 3)
+    assert simeq(gjk_distance(AABB(0, 1, 0, 1), AABB(2, 3, 2, 3)), 2 ** 0.5)
+    assert simeq(gjk_distance(Segment((0, 2), (2, 2)), AABB(0, 1, 0, 1)), 1)
+    assert gjk_distance(AABB(0, 2, 0, 2), Circle(1, (2, 2))) == 0
+
+
+def test_closest_points():
+    pa, pb = gjk_closest_points(AABB(0, 1, 0, 1), Circle(1, (4, 0.5)))
+    assert simeq(pa.x, 1)
+    assert simeq(pb, (3, 0.5))
+    assert gjk_closest_points(Circle(1), Circle(1, (1, 0))) is None
+
+
+def test_distance_random_polygons():
+    rnd = random.Random(10)
+    for _ in range(30):
+        A = random_convex(rnd, 0, 0)
+        B = random_convex(rnd, rnd.uniform(-4, 4), rnd.uniform(-4, 4))
+        expected = poly_distance(A, B)
+        if expected > 1e-6:
+            assert simeq(gjk_distance(A, B), expected)
+        assert gjk_intersects(A, B) == (sat(A, B) is not None)
+
+
+def test_epa_matches_sat():
+    rnd = random.Random(11)
+    pairs = [
+        (AABB(4, 9, 1, 6), AABB(0, 5, 0, 5)),
+        (Circle(3, (0, 0)), Circle(3, (3, 4))),
+        (AABB(0, 2, 0, 2), Circle(1, (2.5, 1.5))),
+    ]
+    for _ in range(20):
+        A = random_convex(rnd, 0, 0, sides=8)
+        B = random_convex(rnd, rnd.uniform(-1, 1), rnd.uniform(-1, 1),
+                          sides=8)
+        pairs.append((A, B))
+
+    for A, B in pairs:
+        expected = sat(A, B)
+        result = epa(A, B)
+        if expected is None:
+            assert result is None
+        else:
+            assert abs(result.norm() - expected.norm()) < 1e-6
+            if not isinstance(A, Circle):
+                assert simeq(result, expected)
+
+
+def test_shape_distance_uses_gjk():
+    assert simeq(AABB(0, 1, 0, 1).distance(AABB(3, 4, 0, 1)), 2)
+    assert simeq(AABB(0, 1, 0, 1).distance(mCircle(1, (4, 0.5))), 2)
+    with pytest.raises(TypeError):
+        AABB(0, 1, 0, 1).distance(object())
@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from smallshapes import ConvexPoly, convex_hull
+from smallshapes.hull import IncrementalHull, hull, hull_coords, merge_hulls
+
+
+def reference_hull(points):
+    # Plain monotone chain used as reference
+    pts = sorted(set(map(tuple, points)))
+    cross = lambda o, a, b: ((a[0] - o[0]) * (b[1] - o[1]) -
+                             (a[1] - o[1]) * (b[0] - o[0]))
+    lower, upper = [], []
+    for p in pts:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(pts):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+@pytest.fixture
+def clouds():
+    rnd = np.random.RandomState(0)
+    return [rnd.normal(size=(2000, 2)),
+            rnd.uniform(-1, 1, size=(5000, 2)),
+            rnd.randint(0, 10, size=(500, 2)).astype(float),
+            rnd.uniform(size=(7, 2))]
+
+
+def test_batch_matches_reference(clouds):
+    for pts in clouds:
+        expected = reference_hull(pts.tolist())
+        assert hull_coords(pts).tolist() == [list(p) for p in expected]
+
+
+def test_hull_returns_convex_poly():
+    result = hull([(0, 0), (2, 0), (1, 1), (2, 2), (0, 2), (1, 0)])
+    assert isinstance(result, ConvexPoly)
+    assert result.area() == 4
+    assert len(result) == 4
+
+
+def test_degenerate_inputs():
+    assert hull_coords([(0, 0), (1, 1), (2, 2)]).tolist() == \
+        [[0, 0], [2, 2]]
+    assert hull_coords([]).shape == (0, 2)
+    with pytest.raises(ValueError):
+        hull([(0, 0), (1, 1), (2, 2)])
+
+
+def test_convex_hull_function():
+    hull = convex_hull([(0, 0), (1, 1), (1, 0), (0, 1), (0.5, 0.5)])
+    assert hull == [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+
+def test_incremental_matches_batch(clouds):
+    for pts in clouds:
+        inc = IncrementalHull()
+        for p in pts.tolist():
+            inc.add(p)
+        assert inc.coords.tolist() == hull_coords(pts).tolist()
+
+
+def test_incremental_extend(clouds):
+    pts = clouds[0]
+    inc = IncrementalHull(pts[:100])
+    inc.extend(pts[100:1000])
+    for p in pts[1000:].tolist():
+        inc.add(p)
+    assert inc.coords.tolist() == hull_coords(pts).tolist()
+
+
+def test_incremental_contains():
+    inc = IncrementalHull([(0, 0), (2, 0), (2, 2), (0, 2)])
+    assert (1, 1) in inc
+    assert (2, 1) in inc
+    assert (0, 0) in inc
+    assert (3, 1) not in inc
+    assert (0, 3) not in inc
+    assert not inc.add((1, 2))
+    assert inc.add((1, 3))
+    assert len(inc) == 5
+
+
+def test_merge_hulls(clouds):
+    pts = clouds[1]
+    parts = [hull(pts[:2000]), IncrementalHull(pts[2000:4000]),
+             pts[4000:]]
+    assert merge_hulls(*parts) == hull(pts)
@@ -0,0 +1,63 @@
+from math import pi
+
+import pytest
+
+from smallshapes import AABB, Circle, ConvexPoly, MassProperties, Poly, \
+    Rectangle, combine_mass_properties
+from smallvectors import simeq
+
+
+@pytest.mark.parametrize('shape', [
+    Circle(2, (1, 1)),
+    AABB(0, 4, 1, 3),
+    Poly((0, 0), (4, 0), (4, 1), (1, 1), (1, 3), (0, 3)),
+    ConvexPoly((0, 0), (3, 0), (0, 2)),
+])
+def test_specializations_match_individual_methods(shape):
+    props = shape.mass_properties(density=2.0)
+    assert isinstance(props, MassProperties)
+    assert simeq(props.area, abs(shape.area()))
+    assert simeq(props.mass, 2 * abs(shape.area()))
+    assert simeq(props.pos, shape.pos)
+    assert simeq(props.ROG_sqr, shape.ROG_sqr())
+    assert simeq(props.inertia, props.mass * shape.ROG_sqr())
+    assert simeq(props.ROG ** 2, props.ROG_sqr)
+
+
+def test_clockwise_polygon_has_positive_mass():
+    props = Poly((0, 0), (0, 2), (2, 2), (2, 0)).mass_properties()
+    assert props.mass == props.area == 4
+
+
+def test_circle_inertia():
+    props = Circle(2, (0, 0)).mass_properties(density=3)
+    assert simeq(props.mass, 12 * pi)
+    assert simeq(props.inertia, props.mass * 2)
+
+
+def test_combine_matches_single_body():
+    parts = [AABB(0, 1, 0, 1), AABB(1, 3, 0, 1), AABB(0, 3, 1, 2)]
+    whole = AABB(0, 3, 0, 2).mass_properties(density=0.5)
+    props = combine_mass_properties(parts, density=0.5)
+    assert simeq(props.mass, whole.mass)
+    assert simeq(props.area, whole.area)
+    assert simeq(props.pos, whole.pos)
+    assert simeq(props.inertia, whole.inertia)
+
+
+def test_combine_mixed_parts():
+    circle = Circle(1, (5, 0))
+    box = AABB(-1, 1, -1, 1)
+    props = combine_mass_properties([circle.mass_properties(2), box], 1)
+    mc, mb = 2 * pi, 4
+    assert simeq(props.mass, mc + mb)
+    x = 5 * mc / (mc + mb)
+    assert simeq(props.pos, (x, 0))
+    expected = (mc * 0.5 + mc * (5 - x) ** 2 +
+                mb * 2 / 3 + mb * x ** 2)
+    assert simeq(props.inertia, expected)
+
+
+def test_combine_empty():
+    with pytest.raises(ValueError):
+        combine_mass_properties([])
@@ -0,0 +1,305 @@
+import importlib
+import random
+from math import cos, pi, sin
+
+import pytest
+
+from smallshapes import AABB, Circle, Circuit, ConvexPoly, Path, Poly, \
+    Rectangle, RegularPoly, Segment, Triangle, mAABB, mCircle, mCircuit, \
+    mConvexPoly, mPath, mPoly, mRectangle, mRegularPoly, mSegment, \
+    mTriangle
+from smallshapes.SAT import sat, sat_compound
+from smallshapes.boolean import intersection
+from smallshapes.decomposition import Compound
+from smallshapes.functions import contain, distance, intercept_center, \
+    intersects, penetration
+from smallshapes.hull import hull
+from smallshapes.path_utils import poly_moments
+
+L_SHAPE = Poly((0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4))
+
+SHAPES = [
+    Circle(1, (0, 0)), mCircle(1, (0, 0)), AABB(0.5, 2, 0.5, 2),
+    Segment((0, -2), (0, 2)), L_SHAPE, mPoly(*L_SHAPE),
+    ConvexPoly((0, 0), (1, 0), (0, 1)), Triangle((0, 0), (1, 0), (0, 1)),
+    Rectangle(0, 1, 0, 1), RegularPoly(5, 1), Path((0, 0), (1, 1), (2, 0)),
+    Circuit((0, 0), (1, 1), (2, 0)),
+]
+
+
+SHAPE_TYPES = [
+    Circle, mCircle, AABB, mAABB, Segment, mSegment, Path, mPath, Circuit,
+    mCircuit, Poly, mPoly, ConvexPoly, mConvexPoly, RegularPoly, mRegularPoly,
+    Rectangle, mRectangle, Triangle, mTriangle,
+]
+GENERICS = [contain, distance, intercept_center, intersects, penetration]
+
+
+def approx_vec(vec, expected):
+    return tuple(vec) == pytest.approx(tuple(expected), abs=1e-9)
+
+
+@pytest.mark.parametrize('func', GENERICS)
+def test_dispatch_table_has_no_ambiguities(func):
+    func.precompile(SHAPE_TYPES)
+    assert (Circle, mTriangle) in func.cache()
+
+
+@pytest.mark.parametrize('func', GENERICS)
+def test_all_pairs_are_registered(func):
+    for A in SHAPES:
+        for B in SHAPES:
+            func(A, B)
+
+
+def test_registration_is_idempotent():
+    import smallshapes.pairwise
+
+    sizes = [len(func._registry) for func in GENERICS]
+    importlib.reload(smallshapes.pairwise)
+    assert [len(func._registry) for func in GENERICS] == sizes
+    assert intersects(Circle(1, (0, 0)), Circle(1, (1, 0)))
+
+
+def test_symmetric_functions():
+    for A in SHAPES:
+        for B in SHAPES:
+            assert intersects(A, B) == intersects(B, A)
+            assert distance(A, B) == pytest.approx(distance(B, A))
+            center = intercept_center(A, B)
+            if center is None:
+                assert intercept_center(B, A) is None
+            else:
+                assert approx_vec(center, intercept_center(B, A))
+
+
+def test_circle_and_aabb():
+    assert intersects(Circle(1, (0, 0)), Circle(1, (2, 0)))
+    assert not intersects(Circle(1, (0, 0)), Circle(1, (2.1, 0)))
+    assert intersects(AABB(0, 1, 0, 1), Circle(1, (1.5, 1.5)))
+    assert not intersects(AABB(0, 1, 0, 1), Circle(0.5, (1.5, 1.5)))
+    assert intersects(AABB(0, 1, 0, 1), AABB(1, 2, 1, 2))
+
+
+def test_segments():
+    assert intersects(Segment((0, 0), (2, 2)), Segment((0, 2), (2, 0)))
+    assert not intersects(Segment((0, 0), (1, 0)), Segment((2, 0), (3, 0)))
+    assert intersects(Segment((0, 0), (2, 0)), Segment((1, 0), (3, 0)))
+    assert intersects(Segment((-1, 0.5), (2, 0.5)), AABB(0, 1, 0, 1))
+    assert not intersects(Segment((-1, 2), (2, 2)), AABB(0, 1, 0, 1))
+    assert intersects(Segment((-2, 0.9), (2, 0.9)), Circle(1, (0, 0)))
+
+
+def test_concave_polygon():
+    # Shapes inside the concave region of the L do not intersect it
+    assert not intersects(L_SHAPE, Circle(1, (2.5, 2.5)))
+    assert not intersects(L_SHAPE, AABB(2, 3, 2, 3))
+    assert not intersects(L_SHAPE, Segment((2, 2), (3, 3)))
+    assert intersects(L_SHAPE, Circle(1, (2.5, 1.5)))
+    assert intersects(L_SHAPE, Segment((0.5, 0.5), (0.6, 0.6)))
+    assert intersects(L_SHAPE, AABB(-1, 5, -1, 5))
+    assert intersects(AABB(-1, 5, -1, 5), L_SHAPE)
+
+
+def test_paths_have_no_interior():
+    path = Circuit((0, 0), (4, 0), (4, 4), (0, 4))
+    assert not intersects(path, Circle(1, (2, 2)))
+    assert not intersects(path, Path((1, 1), (2, 2)))
+    assert intersects(path, Segment((2, 2), (5, 2)))
+    assert intersects(Poly(*path.vertices), Path((1, 1), (2, 2)))
+
+
+def random_convex(rnd):
+    x, y = rnd.uniform(-3, 3), rnd.uniform(-3, 3)
+    pts = [(x + rnd.uniform(-1.5, 1.5), y + rnd.uniform(-1.5, 1.5))
+           for _ in range(6)]
+    return hull(pts)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_convex_pairs_match_sat(seed):
+    rnd = random.Random(seed)
+    for _ in range(40):
+        A = random_convex(rnd)
+        B = rnd.choice([
+            random_convex(rnd),
+            Circle(rnd.uniform(0.2, 2), (rnd.uniform(-3, 3),
+                                         rnd.uniform(-3, 3))),
+        ])
+        assert intersects(A, B) == (sat(A, B) is not None)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_concave_pairs_match_boolean_intersection(seed):
+    rnd = random.Random(seed)
+    for _ in range(40):
+        dx, dy = rnd.uniform(-5, 5), rnd.uniform(-5, 5)
+        A = L_SHAPE.move(dx, dy)
+        B = rnd.choice([L_SHAPE.move(rnd.uniform(-5, 5), rnd.uniform(-5, 5)),
+                        random_convex(rnd)])
+        expected = any(abs(p.area()) > 0 for p in intersection(A, B))
+        assert intersects(A, B) == expected
+
+
+#
+# distance()
+#
+def test_distance():
+    assert distance(Circle(1, (0, 0)), Circle(1, (3, 0))) == 1
+    assert distance(Circle(1, (0, 0)), Circle(1, (1, 0))) == 0
+    assert distance(AABB(0, 1, 0, 1), Circle(1, (4, 1))) == 2
+    assert distance(AABB(0, 1, 0, 1), AABB(2, 3, 3, 4)) == pytest.approx(
+        5 ** 0.5)
+    assert distance(L_SHAPE, Circle(1, (2.5, 2.5))) == 0.5
+    assert distance(L_SHAPE, AABB(2, 3, 2, 3)) == 1
+    assert distance(L_SHAPE, Circle(0.5, (0.5, 0.5))) == 0
+    assert distance(Segment((0, 0), (1, 0)), Path((0, 1), (2, 3))) == 1
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_convex_distance_matches_gjk(seed):
+    rnd = random.Random(seed)
+    for _ in range(30):
+        A, B = random_convex(rnd), random_convex(rnd)
+        assert distance(A, B) == pytest.approx(A.distance(B), abs=1e-9)
+
+
+#
+# contain()
+#
+def test_contain_solids():
+    assert contain(Circle(2, (0, 0)), Circle(1, (0.5, 0)))
+    assert not contain(Circle(1, (0.5, 0)), Circle(2, (0, 0)))
+    assert contain(Circle(2, (0, 0)), AABB(-1, 1, -1, 1))
+    assert not contain(Circle(1, (0, 0)), AABB(-1, 1, -1, 1))
+    assert contain(AABB(-2, 2, -2, 2), Circle(2, (0, 0)))
+    assert contain(Rectangle(-2, 2, -2, 2), Circle(2, (0, 0)))
+    assert not contain(Rectangle(-2, 2, -2, 2), Circle(2, (0.1, 0)))
+    assert contain(Triangle((0, 0), (4, 0), (0, 4)), AABB(0, 1, 0, 1))
+    assert not contain(AABB(0, 1, 0, 1), Triangle((0, 0), (4, 0), (0, 4)))
+
+
+def test_contain_concave_polygon():
+    assert contain(L_SHAPE, AABB(0.5, 3, 0.5, 0.8))
+    assert contain(L_SHAPE, Circle(0.5, (0.5, 3)))
+    assert not contain(L_SHAPE, Circle(1, (0.5, 3)))
+    assert contain(L_SHAPE, Segment((0.5, 3), (0.5, 0.5)))
+    assert contain(L_SHAPE, Path((0, 0), (4, 0), (4, 1)))
+
+    # Vertices are inside, but the segment crosses the concave region
+    assert not contain(L_SHAPE, Segment((0.5, 3), (3, 0.5)))
+    assert not contain(L_SHAPE, AABB(0.5, 2, 0.5, 2))
+
+
+def test_contain_paths():
+    path = Path((0, 0), (2, 0), (2, 2))
+    assert contain(path, Segment((0.5, 0), (1.5, 0)))
+    assert contain(path, Path((1, 0), (2, 0), (2, 1)))
+    assert not contain(path, Segment((0.5, 0), (1.5, 0.1)))
+    assert not contain(path, Circle(1, (1, 0)))
+    assert not contain(Segment((0, 0), (2, 0)), AABB(0, 1, 0, 1))
+    assert contain(AABB(0, 2, 0, 2), path)
+
+
+#
+# intercept_center()
+#
+def test_intercept_center_circles():
+    assert intercept_center(Circle(1, (0, 0)), Circle(1, (3, 0))) is None
+    assert approx_vec(intercept_center(Circle(1, (0, 0)), Circle(1, (1, 1))),
+                      (0.5, 0.5))
+    assert approx_vec(intercept_center(Circle(3, (0, 0)), Circle(1, (1, 1))),
+                      (1, 1))
+    assert approx_vec(intercept_center(Circle(1, (0, 0)), Circle(1, (2, 0))),
+                      (1, 0))
+
+
+@pytest.mark.parametrize('radius', [0.5, 1.0, 2.0])
+def test_lens_matches_polygon_approximation(radius):
+    # Circle B is approximated by a polygon with many sides: the center of
+    # the circle-polygon intersection must match the lens between circles.
+    A = Circle(1.5, (0, 0))
+    B = Circle(radius, (1.2, 0.7))
+    poly = Poly(*[(1.2 + radius * cos(t), 0.7 + radius * sin(t))
+                  for t in (2 * pi * i / 2048 for i in range(2048))])
+    expected = intercept_center(A, B)
+    assert tuple(intercept_center(poly, A)) == pytest.approx(
+        tuple(expected), abs=1e-5)
+
+
+def test_intercept_center_polygons():
+    A = AABB(0, 2, 0, 2)
+    assert approx_vec(intercept_center(A, AABB(1, 3, 1, 3)), (1.5, 1.5))
+    assert approx_vec(intercept_center(A, Rectangle(1, 3, 1, 3)), (1.5, 1.5))
+    assert approx_vec(intercept_center(L_SHAPE, AABB(-1, 5, -1, 5)),
+                      poly_moments(list(L_SHAPE))[1:3])
+
+    # Touching shapes: center of the common edge
+    assert approx_vec(intercept_center(A, AABB(2, 3, 0, 1)), (2, 0.5))
+    assert approx_vec(intercept_center(A, AABB(2, 3, 2, 3)), (2, 2))
+
+
+def test_intercept_center_paths():
+    A = AABB(0, 2, 0, 2)
+    assert approx_vec(intercept_center(A, Segment((-1, 1), (5, 1))), (1, 1))
+    assert approx_vec(intercept_center(Segment((0, 0), (2, 2)),
+                                       Segment((0, 2), (2, 0))), (1, 1))
+    assert approx_vec(intercept_center(Circle(1, (0, 0)),
+                                       Path((-3, 0), (3, 0))), (0, 0))
+    assert intercept_center(Circuit((0, 0), (4, 0), (4, 4), (0, 4)),
+                            Circle(1, (2, 2))) is None
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_intercept_center_matches_boolean_intersection(seed):
+    rnd = random.Random(seed)
+    for _ in range(30):
+        A = random_convex(rnd)
+        B = rnd.choice([L_SHAPE.move(rnd.uniform(-3, 3), rnd.uniform(-3, 3)),
+                        random_convex(rnd)])
+        polys = intersection(A, B)
+        center = intercept_center(A, B)
+        if not polys:
+            assert center is None
+            continue
+        total = sum(poly.area() for poly in polys)
+        x = sum(poly.area() * poly.pos.x for poly in polys) / total
+        y = sum(poly.area() * poly.pos.y for poly in polys) / total
+        assert approx_vec(center, (x, y))
+
+
+def test_intercept_center_circle_polygon_area():
+    # A circle completely inside a polygon
+    center = intercept_center(AABB(-5, 5, -5, 5), Circle(1, (1, 2)))
+    assert approx_vec(center, (1, 2))
+
+    # Half circle
+    center = intercept_center(AABB(0, 5, -5, 5), Circle(1, (0, 0)))
+    assert approx_vec(center, (4 / (3 * pi), 0))
+
+
+#
+# penetration()
+#
+def test_penetration():
+    A, B = Circle(3, (0, 0)), Circle(3, (3, 4))
+    assert penetration(A, B) == sat(A, B)
+    assert penetration(B, A) == sat(B, A)
+    assert penetration(A, Circle(1, (10, 0))) is None
+    assert penetration(AABB(4, 9, 1, 6), AABB(0, 5, 0, 5)) == sat(
+        AABB(4, 9, 1, 6), AABB(0, 5, 0, 5))
+
+    # Coincident centers
+    vec = penetration(Circle(1, (0, 0)), Circle(1, (0, 0)))
+    assert vec.norm() == pytest.approx(2, rel=1e-2)
+
+
+def test_penetration_concave_and_paths():
+    circle = Circle(1, (2.5, 1.5))
+    assert penetration(L_SHAPE, Circle(1, (2.5, 2.5))) is None
+    assert penetration(L_SHAPE, circle) == sat_compound(
+        Compound(L_SHAPE), circle)
+    vec = penetration(Path((0, 0), (4, 0)), Circle(1, (2, 0.5)))
+    assert approx_vec(vec, (0, 0.5))
+    assert penetration(Circle(1, (2, 0.5)), Path((0, 0), (4, 0))).y < 0
+    assert penetration(Segment((0, 0), (2, 2)), Segment((0, 2), (2, 0)))
@@ -1,8 +1,135 @@
+import pickle
+
+import numpy as np
+import pytest
+
 from smallshapes.tests import abstract as base
-from smallshapes import Path, mPath
+from smallshapes import Circuit, Path, Poly, Rectangle, mCircuit, mPath, \
+    mPoly, mRectangle
+from smallvectors import Vec, simeq
 
 
 class TestPath(base.TestMutability, base.TestShape):
     base_cls = Path
     base_args = (0, 0), (1, 1), (2, 0)
 
+
+
+class TestArrayBackend:
+    points = [(0, 0), (4, 0), (5, 3), (2, 5), (-1, 2)]
+
+    @pytest.fixture(params=[Path, mPath, Circuit, mCircuit, Poly, mPoly])
+    def pair(self, request):
+        cls = request.param
+        return cls(*self.points), cls.from_array(np.array(self.points))
+
+    def test_from_array_uses_contiguous_buffer(self, pair):
+        _, obj = pair
+        assert obj.array.shape == (5, 2)
+        assert obj.array.dtype == np.float64
+        assert obj.array.flags.c_contiguous
+
+    def test_constructor_accepts_arrays(self):
+        obj = Poly(np.array(self.points))
+        assert isinstance(obj.array.base, np.ndarray)
+        assert obj == Poly(*self.points)
+
+    def test_same_results_as_list_backend(self, pair):
+        ref, obj = pair
+        assert obj == ref
+        assert list(obj) == list(ref)
+        assert obj.vertices == ref.vertices
+        assert obj.rect_coords == ref.rect_coords
+        assert simeq(obj.pos, ref.pos)
+        assert obj[-1] == ref[-1]
+        assert simeq(obj.distance_point((10, 10)), ref.distance_point((10, 10)))
+
+    def test_move_vec(self, pair):
+        ref, obj = pair
+        new = obj.move_vec(Vec(1, 2))
+        assert isinstance(new._data, np.ndarray)
+        assert new == ref.move_vec(Vec(1, 2))
+        assert obj == ref
+
+    def test_inplace_move(self, pair):
+        ref, obj = pair
+        if not isinstance(obj, mPath):
+            return
+        obj.imove_vec(Vec(1, 2))
+        ref.imove_vec(Vec(1, 2))
+        assert obj == ref
+        obj.imove_to_vec(Vec(0, 0))
+        assert simeq(obj.pos, (0, 0))
+
+    def test_immutable_array_is_read_only(self):
+        obj = Path.from_array(self.points)
+        with pytest.raises(ValueError):
+            obj.array[0, 0] = 42
+
+    def test_immutable_buffer_is_read_only(self, pair):
+        _, obj = pair
+        if isinstance(obj, mPath):
+            obj.array.base[0] = 7
+            assert obj[0] == (7, 0)
+            return
+        for new in [obj, obj.move_vec(Vec(1, 2)), Poly(np.array(self.points)),
+                    pickle.loads(pickle.dumps(obj))]:
+            with pytest.raises(ValueError):
+                new.array.base[0] = 7
+            assert new.array.base.base is None
+
+    def test_pickle(self, pair):
+        _, obj = pair
+        new = pickle.loads(pickle.dumps(obj))
+        assert type(new) is type(obj)
+        assert isinstance(new._data, np.ndarray)
+        assert new == obj
+
+    @pytest.mark.parametrize('cls', [Rectangle, mRectangle])
+    def test_pickle_keeps_extra_slots(self, cls):
+        obj = cls(0, 2, 0, 1)
+        new = pickle.loads(pickle.dumps(obj))
+        assert type(new) is cls
+        assert new == obj
+        assert new.theta == obj.theta
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError):
+            Path.from_array(np.zeros((3, 3)))
+
+
+class TestCachedProperties:
+    points = [(0, 0), (4, 0), (4, 2), (0, 2)]
+
+    def test_immutable_values_are_cached(self):
+        obj = Poly(*self.points)
+        assert obj.pos is obj.pos
+        assert obj.cbb_radius == obj.cbb_radius
+        assert obj.area() == 8
+        assert set(obj._cache) >= {'pos', 'cbb_radius', '_moments'}
+
+    def test_displaced_copies_do_not_share_cache(self):
+        obj = Poly(*self.points)
+        assert obj.pos == (2, 1)
+        assert obj.move(1, 1).pos == (3, 2)
+
+    @pytest.mark.parametrize('cls', [mPath, mCircuit, mPoly])
+    def test_mutation_invalidates_cache(self, cls):
+        obj = cls(*self.points)
+        ref = cls(*self.points)
+        for mutate in [lambda x: x.imove_vec(Vec(1, 2)),
+                       lambda x: x.imove_to_vec(Vec(-1, 3)),
+                       lambda x: setattr(x, 'pos', Vec(5, 5)),
+                       lambda x: x.__setitem__(-1, (0, 5))]:
+            obj.pos, obj.rect_coords, obj.cbb_radius
+            mutate(obj)
+            mutate(ref)
+            fresh = cls(*ref)
+            assert simeq(obj.pos, fresh.pos)
+            assert obj.rect_coords == fresh.rect_coords
+            assert simeq(obj.cbb_radius, fresh.cbb_radius)
+
+    def test_mutable_poly_uses_area_centroid(self):
+        pts = [(0, 0), (10, 0), (10, 1), (1, 1), (1, 10), (0, 10)]
+        assert simeq(mPoly(*pts).pos, Poly(*pts).pos)
+        assert simeq(mCircuit(*pts).pos, Circuit(*pts).pos)
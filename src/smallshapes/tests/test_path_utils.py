@@ -0,0 +1,68 @@
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from smallshapes import Poly, area, center_of_mass, ROG_sqr
+from smallshapes.path_utils import ARRAY_THRESHOLD, _array_moments, \
+    _flat_moments, poly_moments
+from smallvectors import simeq
+
+
+def regular(n, radius=1.0, x=0.0, y=0.0):
+    return [(x + radius * cos(2 * pi * i / n), y + radius * sin(2 * pi * i / n))
+            for i in range(n)]
+
+
+@pytest.mark.parametrize('n', [3, 5, ARRAY_THRESHOLD - 1, ARRAY_THRESHOLD, 500])
+def test_list_and_array_kernels_agree(n):
+    pts = regular(n, 2.0, 3.0, -1.0)
+    flat = [x for pt in pts for x in pt]
+    arr = np.array(pts)
+    expected = _array_moments(arr)
+    assert np.allclose(_flat_moments(flat), expected)
+    assert np.allclose(poly_moments(pts), expected)
+    assert np.allclose(poly_moments(arr), expected)
+
+
+def test_regular_polygon_moments():
+    n, r = 1000, 2.0
+    A, x, y, ROG2 = poly_moments(np.array(regular(n, r, 5, 5)))
+    assert abs(A - pi * r * r) < 1e-3
+    assert np.allclose((x, y), (5, 5))
+    assert abs(ROG2 - r * r / 2) < 1e-3
+
+
+def test_precision_far_from_origin():
+    pts = np.array([(0, 0), (1, 0), (1, 1), (0, 1)]) + 1e8
+    A, x, y, ROG2 = poly_moments(pts)
+    assert A == 1.0
+    assert simeq(ROG2, 1 / 6)
+
+
+def test_public_functions_accept_arrays():
+    pts = np.array([(0, 0), (2, 0), (2, 2), (0, 2)], dtype=float)
+    assert area(pts) == 4.0
+    assert center_of_mass(pts) == (1, 1)
+    assert simeq(ROG_sqr(pts, axis=(0, 0)), 8 / 3)
+
+
+def test_degenerate_polygon():
+    assert poly_moments([(1, 2), (3, 4), (5, 6)]) == (0.0, 1.0, 2.0, 0.0)
+
+
+def test_empty_polygon():
+    assert poly_moments([]) == (0.0, 0.0, 0.0, 0.0)
+    assert poly_moments(np.zeros((0, 2))) == (0.0, 0.0, 0.0, 0.0)
+    assert area([]) == 0
+    assert center_of_mass([]) == (0, 0)
+    assert ROG_sqr([]) == 0
+
+
+def test_poly_uses_kernels():
+    pts = regular(200)
+    for obj in [Poly(*pts), Poly.from_array(np.array(pts))]:
+        A, x, y, ROG2 = poly_moments(pts)
+        assert simeq(obj.area(), A)
+        assert simeq(obj.pos, (x, y))
+        assert simeq(obj.ROG_sqr(), ROG2)
@@ -1,6 +1,127 @@
+import random
+from math import cos, pi, sin
+
 from smallshapes.tests import test_circuit as base
-from smallshapes import Poly
+from smallshapes import ConvexPoly, Poly
+from smallshapes.sweep import is_simple_coords, self_intersections_coords
 
 
 class TestPoly(base.TestCircuit):
-    base_cls = Poly
\ No newline at end of file
+    base_cls = Poly
+
+
+SQUARE = [(0, 0), (2, 0), (2, 2), (0, 2)]
+BOWTIE = [(0, 0), (2, 2), (2, 0), (0, 2)]
+PENTAGRAM = [(cos(4 * pi * k / 5), sin(4 * pi * k / 5)) for k in range(5)]
+
+
+def orientation(p, q, r):
+    return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+
+def on_segment(p, q, r):
+    return (orientation(p, q, r) == 0 and
+            min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and
+            min(p[1], q[1]) <= r[1] <= max(p[1], q[1]))
+
+
+def common_points(a0, a1, b0, b1):
+    # Points shared by the closed segments a0a1 and b0b1. Collinear overlaps
+    # are represented by their endpoints.
+    touching = {p for p, (q, r) in [(a0, (b0, b1)), (a1, (b0, b1)),
+                                    (b0, (a0, a1)), (b1, (a0, a1))]
+                if on_segment(q, r, p)}
+    if touching:
+        return touching
+    d1, d2 = orientation(b0, b1, a0), orientation(b0, b1, a1)
+    d3, d4 = orientation(a0, a1, b0), orientation(a0, a1, b1)
+    if d1 * d2 < 0 and d3 * d4 < 0:
+        t = d1 / (d1 - d2)
+        return {(a0[0] + t * (a1[0] - a0[0]), a0[1] + t * (a1[1] - a0[1]))}
+    return set()
+
+
+def brute_force_self_intersections(pts):
+    # Adjacent edges may share their endpoints
+    n = len(pts)
+    edges = [(pts[i], pts[(i + 1) % n]) for i in range(n)]
+    found = set()
+    for i in range(n):
+        for j in range(i + 1, n):
+            points = common_points(*edges[i], *edges[j])
+            if (j - i) % n in (1, n - 1):
+                points -= set(edges[i]) & set(edges[j])
+            found.update(points)
+    return {(round(x, 9), round(y, 9)) for x, y in found}
+
+
+def brute_force_is_simple(pts):
+    if len(pts) < 3 or len(set(pts)) < len(pts):
+        return False
+    return not brute_force_self_intersections(pts)
+
+
+def test_is_convex():
+    assert Poly(*SQUARE).is_convex() is True
+    assert Poly(*SQUARE[::-1]).is_convex() is True
+    assert Poly((0, 0), (1, 0), (2, 0), (2, 2)).is_convex() is True
+    assert Poly((0, 0), (2, 0), (1, 1), (2, 2), (0, 2)).is_convex() is False
+    assert Poly(*PENTAGRAM).is_convex() is False
+    assert Poly((0, 0), (1, 0), (2, 0)).is_convex() is False
+
+    # Boundary that folds back over itself
+    folded = Poly((2, 1), (2, 0), (2, 2), (3, 1), (0, 1))
+    assert folded.is_simple() is False
+    assert folded.is_convex() is False
+    assert ConvexPoly(*SQUARE).is_convex() is True
+
+
+def test_is_simple():
+    assert Poly(*SQUARE).is_simple() is True
+    assert Poly(*BOWTIE).is_simple() is False
+    assert Poly(*PENTAGRAM).is_simple() is False
+
+    # Repeated vertex and edges that fold back over themselves
+    assert Poly((0, 0), (2, 0), (2, 2), (2, 0), (0, 2)).is_simple() is False
+    assert Poly((0, 0), (2, 0), (2, 2), (2, 1), (0, 2)).is_simple() is False
+
+    # Vertex touching another edge
+    assert Poly((0, 0), (4, 0), (4, 4), (2, 0), (0, 4)).is_simple() is False
+
+
+def test_is_simple_matches_brute_force():
+    rnd = random.Random(0)
+    for _ in range(500):
+        n = rnd.randint(3, 12)
+        angles = [2 * pi * (i + rnd.uniform(0, 0.9)) / n for i in range(n)]
+        pts = [(float(round(5 * r * cos(t))), float(round(5 * r * sin(t))))
+               for r, t in zip([rnd.uniform(0.2, 1) for _ in angles],
+                               angles)]
+        assert is_simple_coords(pts) == brute_force_is_simple(pts)
+
+
+def test_self_intersections():
+    assert Poly(*SQUARE).self_intersections() == []
+    assert Poly(*BOWTIE).self_intersections() == [(1, 1)]
+    assert len(Poly(*PENTAGRAM).self_intersections()) == 5
+
+
+def test_self_intersections_degenerate():
+    # Repeated vertex, fold back and vertex touching another edge
+    assert Poly((0, 0), (2, 0), (2, 2), (2, 0), (0, 2)).self_intersections() \
+        == [(2, 0)]
+    assert Poly((0, 0), (2, 0), (2, 2), (2, 1), (0, 2)).self_intersections() \
+        == [(2, 1)]
+    assert Poly((0, 0), (4, 0), (4, 4), (2, 0), (0, 4)).self_intersections() \
+        == [(2, 0)]
+
+
+def test_self_intersections_matches_brute_force():
+    rnd = random.Random(0)
+    for _ in range(500):
+        n = rnd.randint(3, 12)
+        pts = [(float(rnd.randint(0, 4)), float(rnd.randint(0, 4)))
+               for _ in range(n)]
+        found = {(round(x, 9), round(y, 9))
+                 for x, y in self_intersections_coords(pts)}
+        assert found == brute_force_self_intersections(pts)
@@ -0,0 +1,150 @@
+import gc
+import random
+from math import cos, pi, sin
+
+from smallshapes import AABB, Circle, ConvexPoly, mAABB, mCircle
+from smallshapes.SAT import SATCache, sat, sat_manifold, sat_many
+from smallvectors import simeq
+
+
+def test_sat_accepts_mutable_shapes():
+    assert simeq(sat(mCircle(3, (0, 0)), Circle(3, (3, 4))), (0.6, 0.8))
+    assert simeq(sat(mAABB(4, 9, 1, 6), AABB(0, 5, 0, 5)), (-1, 0))
+
+
+def test_sat_circle_aabb_in_both_orders():
+    box, circle = AABB(0, 2, 0, 2), Circle(1, (2.5, 1))
+    assert simeq(sat(box, circle), (0.5, 0))
+    assert simeq(sat(circle, box), (-0.5, 0))
+
+
+def test_sat_polygons():
+    tri = ConvexPoly((0, 0), (2, 0), (0, 2))
+    box = AABB(1, 3, -1, 0.5)
+    assert simeq(sat(tri, box), (0, -0.5))
+    assert sat(tri, AABB(1.5, 3, 1.5, 3)) is None
+
+
+def test_manifold_circles():
+    m = sat_manifold(Circle(3, (0, 0)), Circle(3, (3, 4)))
+    assert simeq(m.depth, 1)
+    assert simeq(m.normal, (0.6, 0.8))
+    assert len(m.points) == 1
+    assert simeq(m.points[0], (1.5, 2))
+    assert sat_manifold(Circle(1, (0, 0)), Circle(1, (5, 0))) is None
+
+
+def test_manifold_circle_aabb():
+    m = sat_manifold(AABB(0, 2, 0, 2), Circle(1, (2.5, 1)))
+    assert simeq(m.normal, (1, 0))
+    assert simeq(m.depth, 0.5)
+    assert simeq(m.points[0], (1.5, 1))
+
+
+def test_manifold_boxes_have_two_points():
+    m = sat_manifold(AABB(0, 4, 0, 2), AABB(1, 2, 1.5, 3))
+    assert simeq(m.normal, (0, 1))
+    assert simeq(m.depth, 0.5)
+    assert sorted(map(tuple, m.points)) == [(1, 1.5), (2, 1.5)]
+
+
+def test_manifold_poly_on_box():
+    box = AABB(-5, 5, -1, 0)
+    tri = ConvexPoly((-1, -0.25), (1, -0.25), (0, 2))
+    m = sat_manifold(box, tri)
+    assert simeq(m.normal, (0, 1))
+    assert simeq(m.depth, 0.25)
+    assert sorted(map(tuple, m.points)) == [(-1, -0.25), (1, -0.25)]
+
+
+def test_manifold_matches_sat():
+    pairs = [
+        (AABB(0, 2, 0, 2), Circle(1, (2.5, 1.5))),
+        (ConvexPoly((0, 0), (2, 0), (0, 2)), AABB(1, 3, -1, 0.5)),
+        (Circle(1, (0, 0)), ConvexPoly((0.5, -1), (3, -1), (3, 1), (0.5, 1))),
+    ]
+    for A, B in pairs:
+        m = sat_manifold(A, B)
+        assert simeq(m.normal * m.depth, sat(A, B))
+
+
+def test_sat_depth_when_shadow_is_contained():
+    box = AABB(0, 10, 0, 1)
+    small = AABB(1, 2, 0.5, 3)
+    assert simeq(sat(box, small), (0, 0.5))
+    assert simeq(sat(small, box), (0, -0.5))
+    assert simeq(sat(AABB(0, 10, 0, 10), AABB(1, 2, 1, 2)), (-2, 0))
+
+
+def test_sat_cache_hits_and_misses():
+    cache = SATCache()
+    A, B = mCircle(1, (0, 0)), mAABB(3, 4, -1, 1)
+    assert cache.sat(A, B) is None
+    assert cache.sat(B, A) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+    # Cached axis no longer separates: falls back to full test
+    A.imove_vec((2.5, 0))
+    assert simeq(cache.sat(A, B), sat(A, B))
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 0
+
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_sat_cache_matches_sat():
+    cache = SATCache()
+    A = mAABB(0, 1, 0, 1)
+    others = [Circle(1, (3, 0.5)), AABB(0.5, 2, 0.5, 2), AABB(0, 1, 5, 6)]
+    for step in range(10):
+        A.imove_vec((0.3, 0.1))
+        for B in others:
+            result = cache.sat(A, B)
+            expected = sat(A, B)
+            assert (result is None) == (expected is None)
+            if expected is not None:
+                assert simeq(result, expected)
+    assert cache.hits > 0
+
+
+def test_sat_cache_uses_weak_references():
+    cache = SATCache()
+    A, B = Circle(1, (0, 0)), Circle(1, (5, 0))
+    cache.sat(A, B)
+    assert len(cache) == 1
+    del B
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_sat_many_matches_sat():
+    rnd = random.Random(2)
+
+    def random_shape():
+        x, y = rnd.uniform(0, 6), rnd.uniform(0, 6)
+        kind = rnd.choice(['circle', 'aabb', 'poly', 'triangle'])
+        if kind == 'circle':
+            return rnd.choice([Circle, mCircle])(rnd.uniform(0.5, 2), (x, y))
+        elif kind == 'aabb':
+            return AABB(x, x + rnd.uniform(0.5, 3), y, y + rnd.uniform(0.5, 3))
+        elif kind == 'triangle':
+            return ConvexPoly((x, y), (x + 2, y), (x, y + 2))
+        n = rnd.randint(4, 7)
+        return ConvexPoly(*[(x + 2 * cos(2 * pi * i / n),
+                             y + 2 * sin(2 * pi * i / n)) for i in range(n)])
+
+    pairs = [(random_shape(), random_shape()) for _ in range(300)]
+    result = sat_many(pairs)
+    assert result.shape == (300, 2)
+    for (A, B), vec, masked in zip(pairs, result.data, result.mask[:, 0]):
+        expected = sat(A, B)
+        assert masked == (expected is None)
+        if expected is not None:
+            assert simeq(tuple(vec), expected)
+
+
+def test_sat_many_empty_groups():
+    result = sat_many([(Circle(1, (0, 0)), Circle(1, (5, 0)))])
+    assert result.mask.all()
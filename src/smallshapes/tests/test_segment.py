@@ -6,3 +6,21 @@ class TestSegment(base.TestMutability, base.TestShape):
     base_cls = Segment
     base_args = (0, 1), (1, 2)
     aabb_args = (0, 1), (1, 2)
+
+
+def test_mutable_segment_invalidates_cache():
+    seg = mSegment((0, 0), (2, 0))
+    assert seg.pos == (1, 0) and seg.xmax == 2
+    seg.end = (4, 2)
+    assert seg.pos == (2, 1) and seg.rect_coords == (0, 4, 0, 2)
+    seg.imove_vec((1, 1))
+    assert seg.pos == (3, 2) and seg.xmin == 1
+    seg[0] = (5, 3)
+    assert seg.pos == (5, 3) and seg.cbb_radius == 0
+    seg.direction = (2, 0)
+    assert seg.pos == (6, 3)
+
+
+def test_immutable_segment_cache():
+    seg = Segment((0, 0), (2, 0))
+    assert seg.pos is seg.pos
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from smallshapes import AABB, mCircle
+from smallshapes.spatial_hash import SpatialHash, suggest_cell_size
+
+
+def overlapping_ids(shapes):
+    return {frozenset([id(a), id(b)])
+            for i, a in enumerate(shapes) for b in shapes[i + 1:]
+            if a.xmin <= b.xmax and b.xmin <= a.xmax and
+            a.ymin <= b.ymax and b.ymin <= a.ymax}
+
+
+def pair_ids(pairs):
+    ids = [frozenset([id(a), id(b)]) for a, b in pairs]
+    assert len(ids) == len(set(ids)), 'duplicate pairs'
+    return set(ids)
+
+
+@pytest.fixture
+def circles():
+    rnd = random.Random(3)
+    return [mCircle(rnd.uniform(0.9, 1.1), (rnd.uniform(-20, 20),
+                                            rnd.uniform(-20, 20)))
+            for _ in range(150)]
+
+
+def test_suggest_cell_size(circles):
+    size = suggest_cell_size(circles)
+    assert 1.8 <= size <= 2.2
+    assert SpatialHash(circles).cell_size == size
+    assert suggest_cell_size([]) == 1.0
+
+
+def test_pairs_include_all_overlaps(circles):
+    grid = SpatialHash(circles, cell_size=2.5)
+    assert pair_ids(grid.pairs()) >= overlapping_ids(circles)
+
+
+def test_queries(circles):
+    grid = SpatialHash(circles)
+    box = AABB(-5, 5, -3, 8)
+    found = {id(c) for c in grid.query_aabb(box)}
+    assert found == {id(c) for c in circles
+                     if c.xmin <= 5 and -5 <= c.xmax and
+                     c.ymin <= 8 and -3 <= c.ymax}
+    point = circles[0].pos
+    assert id(circles[0]) in {id(c) for c in grid.query_point(point)}
+
+
+def test_moving_shapes_updates_buckets(circles):
+    grid = SpatialHash(circles)
+    circle = circles[0]
+    assert grid.imove_to_vec(circle, (100, 100)) is True
+    assert [id(c) for c in grid.query_point((100, 100))] == [id(circle)]
+
+    # A small displacement inside the same cells keeps the buckets
+    assert grid.imove_vec(circle, (0.001, 0)) is False
+    assert [id(c) for c in grid.query_point((100, 100))] == [id(circle)]
+
+    rnd = random.Random(4)
+    for circle in circles:
+        circle.pos = circle.pos + (rnd.uniform(-3, 3), rnd.uniform(-3, 3))
+        grid.update(circle)
+    assert pair_ids(grid.pairs()) >= overlapping_ids(circles)
+
+
+def test_insert_and_remove(circles):
+    grid = SpatialHash(circles[:10])
+    assert len(grid) == 10
+    grid.remove(circles[0])
+    assert circles[0] not in grid
+    with pytest.raises(ValueError):
+        grid.remove(circles[0])
+    with pytest.raises(ValueError):
+        grid.insert(circles[1])
+    for circle in circles[1:10]:
+        grid.remove(circle)
+    assert grid.cells == 0
@@ -0,0 +1,70 @@
+import pickle
+import random
+
+import pytest
+
+from smallshapes import AABB, Poly, Segment
+from smallshapes.strtree import STRtree
+
+
+@pytest.fixture
+def shapes():
+    rnd = random.Random(5)
+    out = []
+    for i in range(300):
+        x, y = rnd.uniform(0, 100), rnd.uniform(0, 100)
+        if i % 3 == 0:
+            out.append(AABB(x, x + rnd.uniform(0.1, 3), y, y + 2))
+        elif i % 3 == 1:
+            out.append(Poly((x, y), (x + 2, y), (x + 1, y + 2)))
+        else:
+            out.append(Segment((x, y), (x + 3, y + 1)))
+    return out
+
+
+@pytest.fixture
+def tree(shapes):
+    return STRtree(shapes, node_capacity=8)
+
+
+def overlaps(shape, box):
+    return (shape.xmin <= box.xmax and box.xmin <= shape.xmax and
+            shape.ymin <= box.ymax and box.ymin <= shape.ymax)
+
+
+def test_tree_structure(tree):
+    assert len(tree) == 300
+    assert tree.height == 3
+
+
+def test_window_query(tree, shapes):
+    for box in [AABB(10, 30, 40, 50), AABB(0, 100, 0, 100), AABB(-5, -1, 0, 1)]:
+        found = {id(s) for s in tree.query(box)}
+        assert found == {id(s) for s in shapes if overlaps(s, box)}
+
+
+def test_point_query_uses_exact_test(tree, shapes):
+    poly = next(s for s in shapes if isinstance(s, Poly))
+    x0, y0 = poly[0]
+    assert any(s is poly for s in tree.query_point((x0 + 1, y0 + 0.5)))
+    assert all(s is not poly for s in tree.query_point((x0 + 0.1, y0 + 1.9)))
+
+
+def test_nearest(tree, shapes):
+    point = (50, 50)
+    expected = sorted(shapes, key=lambda s: s.distance(point))[:5]
+    found = tree.nearest(point, k=5)
+    assert [s.distance(point) for s in found] == \
+        [s.distance(point) for s in expected]
+
+
+def test_empty_tree():
+    tree = STRtree([])
+    assert tree.query(AABB(0, 1, 0, 1)) == []
+    assert tree.nearest((0, 0)) == []
+
+
+def test_pickle(tree):
+    new = pickle.loads(pickle.dumps(tree))
+    box = AABB(10, 30, 40, 50)
+    assert new.query(box) == tree.query(box)
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from smallshapes import AABB, Circle, mCircle
+from smallshapes.sweep_and_prune import SweepAndPrune
+
+
+def brute_force_pairs(shapes):
+    out = set()
+    for i, a in enumerate(shapes):
+        for b in shapes[i + 1:]:
+            if (a.xmin <= b.xmax and b.xmin <= a.xmax and
+                    a.ymin <= b.ymax and b.ymin <= a.ymax):
+                out.add(frozenset([id(a), id(b)]))
+    return out
+
+
+def pair_ids(pairs):
+    return {frozenset([id(a), id(b)]) for a, b in pairs}
+
+
+@pytest.fixture
+def circles():
+    rnd = random.Random(42)
+    return [mCircle(rnd.uniform(0.5, 2), (rnd.uniform(0, 30),
+                                          rnd.uniform(0, 30)))
+            for _ in range(60)]
+
+
+@pytest.mark.parametrize('axis', ['x', 'y'])
+def test_sap_matches_brute_force(circles, axis):
+    sap = SweepAndPrune(circles, axis=axis)
+    pairs = list(sap.pairs())
+    assert pair_ids(pairs) == brute_force_pairs(circles)
+    assert sap.candidates == len(pairs)
+    assert sap.pruned == 60 * 59 // 2 - len(pairs)
+
+
+def test_sap_update_after_moving(circles):
+    sap = SweepAndPrune(circles)
+    rnd = random.Random(1)
+    for circle in circles:
+        circle.imove_vec((rnd.uniform(-1, 1), rnd.uniform(-1, 1)))
+    sap.update()
+    assert pair_ids(sap.pairs()) == brute_force_pairs(circles)
+
+
+def test_sap_add_and_remove():
+    a, b = AABB(0, 1, 0, 1), AABB(0.5, 2, 0.5, 2)
+    sap = SweepAndPrune([a])
+    sap.add(b)
+    assert len(sap) == 2
+    assert list(sap.pairs()) == [(a, b)]
+    sap.remove(a)
+    assert a not in sap
+    assert list(sap.pairs()) == []
+    with pytest.raises(ValueError):
+        sap.remove(a)
+
+
+def test_sap_collisions_runs_narrowphase():
+    a, b, c = Circle(1, (0, 0)), Circle(1, (1.5, 1.5)), Circle(1, (1, 0))
+    sap = SweepAndPrune([a, b, c])
+    result = {frozenset([id(x), id(y)]) for x, y, _ in sap.collisions()}
+    assert result == {frozenset([id(a), id(c)]), frozenset([id(b), id(c)])}
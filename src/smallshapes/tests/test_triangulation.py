@@ -0,0 +1,70 @@
+import random
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from smallshapes import Poly, Triangle
+from smallshapes.triangulation import triangulate_coords
+
+
+def star(n, seed=0):
+    # Random polygon that is star-shaped with respect to the origin
+    rnd = random.Random(seed)
+    angles = [2 * pi * (i + rnd.uniform(0, 0.9)) / n for i in range(n)]
+    radii = [rnd.uniform(0.2, 1) for _ in range(n)]
+    return [(r * cos(t), r * sin(t)) for r, t in zip(radii, angles)]
+
+
+def signed_area(pts):
+    pts = np.asarray(pts, dtype=float)
+    x, y = pts[:, 0], pts[:, 1]
+    return (x * np.roll(y, -1) - np.roll(x, -1) * y).sum() / 2
+
+
+def check(pts, indices):
+    pts = np.asarray(pts, dtype=float)
+    assert indices.shape == (len(pts) - 2, 3)
+    areas = [signed_area(pts[tri]) for tri in indices]
+    assert min(areas) >= 0
+    assert np.isclose(sum(areas), abs(signed_area(pts)))
+
+
+COMB = [(0, 0), (4, 0), (4, 1), (3, 1), (3, 2), (2, 2), (2, 1), (1, 1),
+        (1, 3), (0, 3)]
+
+
+@pytest.mark.parametrize('method', ['monotone', 'ear'])
+def test_triangulate_star_polygons(method):
+    for seed in range(50):
+        pts = star(5 + seed, seed)
+        check(pts, triangulate_coords(pts, method))
+
+
+@pytest.mark.parametrize('method', ['monotone', 'ear'])
+def test_triangulate_clockwise_and_horizontal_edges(method):
+    check(COMB, triangulate_coords(COMB, method))
+    check(COMB[::-1], triangulate_coords(COMB[::-1], method))
+
+
+def test_triangulate_convex_polygon():
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    indices = triangulate_coords(square)
+    assert indices.dtype == np.int32
+    check(square, indices)
+
+
+def test_triangulate_invalid_inputs():
+    with pytest.raises(ValueError):
+        triangulate_coords([(0, 0), (1, 0)])
+    with pytest.raises(ValueError):
+        triangulate_coords(COMB, method='bad')
+
+
+def test_poly_triangulate():
+    poly = Poly(*COMB)
+    indices, triangles = poly.triangulate(triangles=True)
+    assert (indices == poly.triangulate()).all()
+    assert all(isinstance(tri, Triangle) for tri in triangles)
+    assert len(triangles) == len(poly) - 2
+    assert np.isclose(sum(tri.area() for tri in triangles), poly.area())
@@ -0,0 +1,324 @@
+"""
+Triangulation of simple polygons.
+
+Two methods are available:
+
+* 'monotone': the polygon is partitioned into y-monotone pieces with a plane
+  sweep and each piece is triangulated in linear time. Runs in O(n log n).
+* 'ear': ear clipping. Runs in O(n^2), but is very simple and robust. It is
+  also used as a fallback if the monotone method fails on degenerate inputs.
+
+Results are index buffers: (n - 2, 3) integer arrays with the indices of the
+vertices of each triangle in counter-clockwise order.
+"""
+
+from math import atan2
+
+import numpy as np
+
+METHODS = ('monotone', 'ear')
+
+
+def triangulate_coords(points, method='monotone'):
+    """
+    Triangulate the simple polygon with the given vertices and return an
+    (n - 2, 3) index buffer.
+
+    Vertices can be given in clockwise or counter-clockwise order, but the
+    output triangles are always counter-clockwise.
+
+    Example:
+        >>> triangulate_coords([(0, 0), (2, 0), (2, 2), (1, 1), (0, 2)])
+        array([[1, 3, 0],
+               [1, 2, 3],
+               [3, 4, 0]], dtype=int32)
+    """
+
+    if method not in METHODS:
+        raise ValueError('invalid method: %r' % method)
+    pts = [tuple(p) for p in np.asarray(points, dtype=float).tolist()]
+    n = len(pts)
+    if n < 3:
+        raise ValueError('polygon must have at least 3 vertices')
+
+    # Work with counter-clockwise polygons
+    order = list(range(n))
+    if _signed_area(pts) < 0:
+        order.reverse()
+    ccw = [pts[i] for i in order]
+
+    triangles = None
+    if method == 'monotone':
+        try:
+            triangles = _monotone_triangulation(ccw)
+        except (ValueError, IndexError, KeyError):
+            triangles = None
+        if triangles is not None and len(triangles) != n - 2:
+            triangles = None
+    if triangles is None:
+        triangles = _ear_clipping(ccw)
+
+    out = np.array([[order[i] for i in tri] for tri in triangles],
+                   dtype=np.int32).reshape(-1, 3)
+    return out
+
+
+def _signed_area(pts):
+    x0, y0 = pts[-1]
+    total = 0.0
+    for x1, y1 in pts:
+        total += x0 * y1 - x1 * y0
+        x0, y0 = x1, y1
+    return total / 2
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _ccw_triangle(pts, i, j, k):
+    if _cross(pts[i], pts[j], pts[k]) < 0:
+        return i, k, j
+    return i, j, k
+
+
+#
+# Ear clipping
+#
+def _ear_clipping(pts):
+    """
+    Triangulate a counter-clockwise polygon by ear clipping.
+    """
+
+    idx = list(range(len(pts)))
+    out = []
+    while len(idx) > 3:
+        n = len(idx)
+        for k in range(n):
+            i, j, l = idx[k - 1], idx[k], idx[(k + 1) % n]
+            a, b, c = pts[i], pts[j], pts[l]
+            if _cross(a, b, c) <= 0:
+                continue
+            if any(_in_triangle(pts[m], a, b, c)
+                   for m in idx if m not in (i, j, l)):
+                continue
+            out.append((i, j, l))
+            del idx[k]
+            break
+        else:
+            # No ear found (degenerate polygon): clip the most convex vertex
+            k = max(range(n), key=lambda k: _cross(pts[idx[k - 1]],
+                                                    pts[idx[k]],
+                                                    pts[idx[(k + 1) % n]]))
+            out.append(_ccw_triangle(pts, idx[k - 1], idx[k],
+                                     idx[(k + 1) % n]))
+            del idx[k]
+    out.append(tuple(idx))
+    return out
+
+
+def _in_triangle(p, a, b, c):
+    return (_cross(a, b, p) >= 0 and _cross(b, c, p) >= 0 and
+            _cross(c, a, p) >= 0)
+
+
+#
+# Monotone partition
+#
+def _monotone_triangulation(pts):
+    diagonals = _monotone_diagonals(pts)
+    triangles = []
+    for piece in _split_faces(pts, diagonals):
+        triangles.extend(_triangulate_monotone(pts, piece))
+    return triangles
+
+
+def _key(p):
+    # Sweep order: from top to bottom and from left to right on ties.
+    return p[1], -p[0]
+
+
+def _monotone_diagonals(pts):
+    """
+    Return the diagonals that partition the counter-clockwise polygon into
+    y-monotone pieces.
+    """
+
+    n = len(pts)
+    keys = [_key(p) for p in pts]
+    events = sorted(range(n), key=lambda i: keys[i], reverse=True)
+    status = []     # Edges i -> i + 1 sorted by x at the sweep line
+    helper = {}
+    kind = [_vertex_kind(pts, keys, i) for i in range(n)]
+    diagonals = []
+
+    def x_at(edge, y):
+        (x0, y0), (x1, y1) = pts[edge], pts[(edge + 1) % n]
+        if y0 == y1:
+            return max(x0, x1)
+        return x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+
+    def insert(edge, x, y):
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if x_at(status[mid], y) < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        status.insert(lo, edge)
+
+    def left_of(i):
+        # Edge directly to the left of vertex i
+        x, y = pts[i]
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if x_at(status[mid], y) <= x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return status[lo - 1]
+
+    def fix_helper(edge, i):
+        if kind[helper[edge]] == 'merge':
+            diagonals.append((i, helper[edge]))
+
+    for i in events:
+        prev = (i - 1) % n
+        x, y = pts[i]
+        k = kind[i]
+        if k == 'start':
+            insert(i, x, y)
+            helper[i] = i
+        elif k == 'end':
+            fix_helper(prev, i)
+            status.remove(prev)
+        elif k == 'split':
+            j = left_of(i)
+            diagonals.append((i, helper[j]))
+            helper[j] = i
+            insert(i, x, y)
+            helper[i] = i
+        elif k == 'merge':
+            fix_helper(prev, i)
+            status.remove(prev)
+            j = left_of(i)
+            fix_helper(j, i)
+            helper[j] = i
+        elif keys[prev] > keys[i]:
+            # Regular vertex in the left chain: interior lies to the right
+            fix_helper(prev, i)
+            status.remove(prev)
+            insert(i, x, y)
+            helper[i] = i
+        else:
+            j = left_of(i)
+            fix_helper(j, i)
+            helper[j] = i
+    return diagonals
+
+
+def _vertex_kind(pts, keys, i):
+    n = len(pts)
+    prev, nxt = (i - 1) % n, (i + 1) % n
+    convex = _cross(pts[prev], pts[i], pts[nxt]) > 0
+    if keys[prev] < keys[i] and keys[nxt] < keys[i]:
+        return 'start' if convex else 'split'
+    elif keys[prev] > keys[i] and keys[nxt] > keys[i]:
+        return 'end' if convex else 'merge'
+    return 'regular'
+
+
+def _split_faces(pts, diagonals):
+    """
+    Split polygon by the given diagonals and return the list of faces as
+    lists of vertex indices in counter-clockwise order.
+    """
+
+    n = len(pts)
+    if not diagonals:
+        return [list(range(n))]
+
+    neighbors = {i: [(i + 1) % n] for i in range(n)}
+    for i, j in diagonals:
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+
+    used = set()
+    faces = []
+    half_edges = [(i, (i + 1) % n) for i in range(n)]
+    half_edges += [e for i, j in diagonals for e in ((i, j), (j, i))]
+    for start in half_edges:
+        if start in used:
+            continue
+        face = [start[0]]
+        used.add(start)
+        u, v = start
+        while v != start[0]:
+            face.append(v)
+            w = max((w for w in neighbors[v] if (v, w) not in used and w != u),
+                    key=lambda w: _turn(pts[u], pts[v], pts[w]))
+            used.add((v, w))
+            u, v = v, w
+        faces.append(face)
+    return faces
+
+
+def _turn(p, q, r):
+    ux, uy = q[0] - p[0], q[1] - p[1]
+    vx, vy = r[0] - q[0], r[1] - q[1]
+    return atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+
+def _triangulate_monotone(pts, face):
+    """
+    Triangulate a y-monotone face given as a counter-clockwise list of
+    vertex indices.
+    """
+
+    m = len(face)
+    if m == 3:
+        return [_ccw_triangle(pts, *face)]
+
+    # Split the boundary in the left chain (from the top vertex to the bottom
+    # vertex in counter-clockwise order) and the right chain.
+    keys = [_key(pts[i]) for i in face]
+    top = max(range(m), key=lambda k: keys[k])
+    bottom = min(range(m), key=lambda k: keys[k])
+    left = set()
+    k = top
+    while k != bottom:
+        left.add(face[k])
+        k = (k + 1) % m
+    order = sorted(face, key=lambda i: _key(pts[i]), reverse=True)
+
+    out = []
+    stack = [order[0], order[1]]
+    for j in range(2, m - 1):
+        u = order[j]
+        if (u in left) != (stack[-1] in left):
+            while len(stack) > 1:
+                a = stack.pop()
+                out.append(_ccw_triangle(pts, u, a, stack[-1]))
+            stack = [order[j - 1], u]
+        else:
+            last = stack.pop()
+            while stack:
+                top_ = stack[-1]
+                if u in left:
+                    valid = _cross(pts[top_], pts[last], pts[u]) > 0
+                else:
+                    valid = _cross(pts[u], pts[last], pts[top_]) > 0
+                if not valid:
+                    break
+                out.append(_ccw_triangle(pts, u, last, top_))
+                last = stack.pop()
+            stack.append(last)
+            stack.append(u)
+
+    u = order[-1]
+    while len(stack) > 1:
+        a = stack.pop()
+        out.append(_ccw_triangle(pts, u, a, stack[-1]))
+    return out
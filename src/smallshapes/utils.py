@@ -30,3 +30,28 @@ def accept_vec_args(func, single=True):
             return func(self, vec, *args, **kwargs)
 
     return decorated_accept_vec_args
+
+
+def cached(func):
+    """
+    Decorator that caches the result of a method with no arguments.
+
+    Values are stored in a dictionary in the ``_cache`` slot of the instance,
+    which is created on first use. Mutable objects must reset the cache with
+    ``self._cache = None`` whenever they change.
+    """
+
+    name = func.__name__
+
+    @functools.wraps(func)
+    def decorated_cached(self):
+        cache = getattr(self, '_cache', None)
+        if cache is None:
+            cache = self._cache = {}
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = func(self)
+            return value
+
+    return decorated_cached